@@ -29,6 +29,8 @@ if (!$input || !isset($input['message'])) {
 $message = trim($input['message']);
 $history = $input['history'] ?? [];
 
+require_once __DIR__ . '/inference_client.php';
+
 // Global variable to track user's budget range
 $userBudgetRange = '';
 
@@ -90,16 +92,17 @@ function getMusanzeMLResponse($message) {
         strpos($message_lower, 'plan') !== false ||
         strpos($message_lower, 'help') !== false) {
         
-        // Execute Python ML API for ALL business-related queries
-        $escaped_message = escapeshellarg($message);
-        $command = "cd ../ml_models && python musanze_api.py $escaped_message 2>&1";
-        $output = shell_exec($command);
+        // Ask the warm inference service first; spawn the Python ML API only if it is down
+        $result = callInferenceService('predict', ['message' => $message]);
+        if ($result === null) {
+            $escaped_message = escapeshellarg($message);
+            $command = "cd ../ml_models && python musanze_api.py $escaped_message 2>&1";
+            $output = shell_exec($command);
+            $result = $output ? json_decode($output, true) : null;
+        }
         
-        if ($output) {
-            $result = json_decode($output, true);
-            if ($result && isset($result['response']) && $result['response'] !== null) {
-                return $result['response'];
-            }
+        if ($result && isset($result['response']) && $result['response'] !== null) {
+            return $result['response'];
         }
     }
     return null;
@@ -208,16 +211,17 @@ function any_word_in($message, $words) {
 // Python AI Response Function - Direct call to Python AI without recursion
 function getPythonAIResponse($message) {
     try {
-        // Call Python AI interface directly
-        $escaped_message = escapeshellarg($message);
-        $command = "cd " . dirname(__DIR__) . "/ml_models && python ai_chat_interface.py --message $escaped_message 2>&1";
-        $output = shell_exec($command);
+        // Call the warm inference service, falling back to the Python AI interface directly
+        $result = callInferenceService('chat', ['message' => $message]);
+        if ($result === null) {
+            $escaped_message = escapeshellarg($message);
+            $command = "cd " . dirname(__DIR__) . "/ml_models && python ai_chat_interface.py --message $escaped_message 2>&1";
+            $output = shell_exec($command);
+            $result = $output ? json_decode($output, true) : null;
+        }
         
-        if ($output) {
-            $result = json_decode($output, true);
-            if ($result && isset($result['response']) && $result['response'] !== null) {
-                return $result['response'];
-            }
+        if ($result && isset($result['response']) && $result['response'] !== null) {
+            return $result['response'];
         }
     } catch (Exception $e) {
         error_log("Python AI Error: " . $e->getMessage());
@@ -0,0 +1,91 @@
+<?php
+/**
+ * Streaming variant of the enhanced chat answer, relayed as Server-Sent Events
+ *
+ * Each event (start, delta, done) from the inference service is sent as one
+ * "data:" line the moment it arrives. Without the service, the Python script
+ * is spawned in --stream mode and its JSON lines are relayed the same way.
+ *
+ * With "mode": "progressive" the stream is two-phase instead: an "answer" event
+ * with the local answer at once, then an "upgrade" event carrying the enhanced
+ * answer for the same response_id (also fetchable from chat_upgrade.php). The
+ * fallback script is then run with --progressive, so the events keep that shape.
+ */
+header('Content-Type: text/event-stream');
+header('Cache-Control: no-cache');
+header('X-Accel-Buffering: no');
+header('Access-Control-Allow-Origin: *');
+header('Access-Control-Allow-Methods: POST, OPTIONS');
+header('Access-Control-Allow-Headers: Content-Type');
+
+// Handle preflight requests
+if ($_SERVER['REQUEST_METHOD'] === 'OPTIONS') {
+    http_response_code(200);
+    exit();
+}
+
+// Only allow POST requests
+if ($_SERVER['REQUEST_METHOD'] !== 'POST') {
+    http_response_code(405);
+    echo json_encode(['error' => 'Method not allowed']);
+    exit();
+}
+
+// Get input data
+$input = json_decode(file_get_contents('php://input'), true);
+
+if (!$input || !isset($input['message'])) {
+    http_response_code(400);
+    echo json_encode(['error' => 'Message is required']);
+    exit();
+}
+
+$message = trim($input['message']);
+$context = $input['context'] ?? [];
+if (!empty($input['intent'])) {
+    // Menu-flow intents are answered locally without waiting on OpenAI
+    $context['intent'] = $input['intent'];
+}
+$progressive = ($input['mode'] ?? '') === 'progressive';
+
+require_once __DIR__ . '/inference_client.php';
+
+// Send every event as soon as it is written
+while (ob_get_level() > 0) {
+    ob_end_flush();
+}
+ob_implicit_flush(true);
+
+function sendStreamEvent($event) {
+    echo 'data: ' . json_encode($event) . "\n\n";
+    flush();
+}
+
+$started = false;
+$ok = streamInferenceService(
+    $progressive ? 'progressive_enhanced_response' : 'stream_enhanced_response',
+    ['question' => $message, 'context' => (object)$context],
+    function ($event) use (&$started) {
+        $started = true;
+        sendStreamEvent($event);
+    }
+);
+
+if (!$ok && !$started) {
+    // Service unavailable: spawn the Python script in the requested mode and relay its JSON lines
+    $command = "cd ../ml_models && python api_integration.py " . ($progressive ? '--progressive ' : '--stream ') .
+               escapeshellarg($message) . " " . escapeshellarg(json_encode((object)$context)) . " 2>/dev/null";
+    $process = popen($command, 'r');
+    if ($process) {
+        while (($line = fgets($process)) !== false) {
+            $event = json_decode($line, true);
+            if ($event) {
+                sendStreamEvent($event);
+            }
+        }
+        pclose($process);
+    }
+} elseif (!$ok) {
+    sendStreamEvent(['event' => 'error', 'error' => 'The answer stream was interrupted']);
+}
+?>
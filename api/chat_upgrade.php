@@ -0,0 +1,39 @@
+<?php
+/**
+ * Second phase of a progressive chat answer: the enhanced version by response ID
+ *
+ * GET ?id=<response_id>&wait=<seconds> returns {response_id, status, response}
+ * where status is "ready", "pending" or "unavailable".
+ */
+header('Content-Type: application/json');
+header('Access-Control-Allow-Origin: *');
+header('Access-Control-Allow-Methods: GET, OPTIONS');
+header('Access-Control-Allow-Headers: Content-Type');
+
+// Handle preflight requests
+if ($_SERVER['REQUEST_METHOD'] === 'OPTIONS') {
+    http_response_code(200);
+    exit();
+}
+
+$responseId = $_GET['id'] ?? '';
+if (!preg_match('/^[0-9a-f]{32}$/', $responseId)) {
+    http_response_code(400);
+    echo json_encode(['error' => 'A valid response id is required']);
+    exit();
+}
+
+// Long-poll for at most 20 seconds
+$wait = min(max((float)($_GET['wait'] ?? 0), 0), 20);
+
+require_once __DIR__ . '/inference_client.php';
+
+$result = callInferenceService('get_enhanced_response', ['response_id' => $responseId, 'wait' => $wait], $wait + 5);
+if ($result === null) {
+    http_response_code(503);
+    echo json_encode(['error' => 'Inference service unavailable']);
+    exit();
+}
+
+echo json_encode($result);
+?>
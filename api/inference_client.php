@@ -0,0 +1,148 @@
+<?php
+/**
+ * Thin client for the InnoStart inference service (ml_models/inference_server.py)
+ *
+ * Frames are a 4-byte big-endian length followed by a UTF-8 JSON body;
+ * requests carry an id that the service echoes in every reply frame.
+ * Every function returns null when the service is unreachable so callers
+ * can fall back to spawning the Python scripts directly.
+ */
+
+function getInferenceServiceAddress() {
+    $socket = getenv('INNOSTART_INFERENCE_SOCKET');
+    if ($socket) {
+        return 'unix://' . $socket;
+    }
+
+    $host = getenv('INNOSTART_INFERENCE_HOST') ?: '127.0.0.1';
+    $port = getenv('INNOSTART_INFERENCE_PORT') ?: '8765';
+    return 'tcp://' . $host . ':' . $port;
+}
+
+function readInferenceBytes($stream, $length) {
+    $data = '';
+    while (strlen($data) < $length) {
+        $chunk = fread($stream, $length - strlen($data));
+        if ($chunk === false || $chunk === '') {
+            return null;
+        }
+        $data .= $chunk;
+    }
+    return $data;
+}
+
+function openInferenceStream() {
+    $errno = 0;
+    $errstr = '';
+    $stream = @stream_socket_client(
+        getInferenceServiceAddress(),
+        $errno,
+        $errstr,
+        1,
+        STREAM_CLIENT_CONNECT | STREAM_CLIENT_PERSISTENT
+    );
+    return $stream ?: null;
+}
+
+function callInferenceService($op, $args = [], $timeout = 10) {
+    // Reuse one connection per PHP worker when persistent sockets are available
+    static $stream = null;
+
+    // The persistent socket outlives the request that opened it: a request that died
+    // between fwrite and reading its reply (fatal error, max_execution_time, client abort)
+    // leaves that reply on the socket. The service echoes this id so one is never taken
+    // for the answer to this request.
+    $requestId = bin2hex(random_bytes(8));
+    $payload = json_encode(['op' => $op, 'args' => (object)$args, 'id' => $requestId]);
+
+    $reply = null;
+    for ($attempt = 0; $attempt < 2 && $reply === null; $attempt++) {
+        // Bytes waiting before we have asked anything are a stale reply (or the server hung up)
+        if ($stream !== null) {
+            $read = [$stream];
+            $write = $except = null;
+            if (@stream_select($read, $write, $except, 0) !== 0) {
+                @fclose($stream);
+                $stream = null;
+            }
+        }
+        if ($stream === null) {
+            $stream = openInferenceStream();
+            if ($stream === null) {
+                return null;
+            }
+        }
+
+        stream_set_timeout($stream, $timeout);
+
+        $written = @fwrite($stream, pack('N', strlen($payload)) . $payload);
+
+        $header = $written ? readInferenceBytes($stream, 4) : null;
+        $body = $header === null ? null : readInferenceBytes($stream, unpack('N', $header)[1]);
+        if ($body === null) {
+            @fclose($stream);
+            $stream = null;
+            return null;
+        }
+
+        $reply = json_decode($body, true);
+        if (!is_array($reply) || !isset($reply['id']) || $reply['id'] !== $requestId) {
+            // Out of step with the service: drop the connection and ask again on a fresh one
+            @fclose($stream);
+            $stream = null;
+            $reply = null;
+        }
+    }
+
+    if (!$reply || empty($reply['ok'])) {
+        if ($reply && isset($reply['error'])) {
+            error_log("Inference service error: " . $reply['error']);
+        }
+        return null;
+    }
+
+    return $reply['result'];
+}
+
+/**
+ * Run a streaming operation, calling $onEvent for each event as it arrives.
+ * Returns false when the service is unreachable or the stream fails, so the
+ * caller can fall back; events already delivered are not repeated.
+ */
+function streamInferenceService($op, $args, $onEvent, $timeout = 60) {
+    $errno = 0;
+    $errstr = '';
+    // A dedicated connection: a half-read stream must never be reused by callInferenceService
+    $stream = @stream_socket_client(getInferenceServiceAddress(), $errno, $errstr, 1);
+    if (!$stream) {
+        return false;
+    }
+
+    stream_set_timeout($stream, $timeout);
+
+    $payload = json_encode(['op' => $op, 'args' => (object)$args]);
+    if (!@fwrite($stream, pack('N', strlen($payload)) . $payload)) {
+        fclose($stream);
+        return false;
+    }
+
+    while (true) {
+        $header = readInferenceBytes($stream, 4);
+        $body = $header === null ? null : readInferenceBytes($stream, unpack('N', $header)[1]);
+        $reply = $body === null ? null : json_decode($body, true);
+
+        if (!$reply || empty($reply['ok'])) {
+            if ($reply && isset($reply['error'])) {
+                error_log("Inference service error: " . $reply['error']);
+            }
+            fclose($stream);
+            return false;
+        }
+        if (!empty($reply['end'])) {
+            fclose($stream);
+            return true;
+        }
+        $onEvent($reply['event']);
+    }
+}
+?>
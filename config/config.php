@@ -13,7 +13,7 @@ define('DB_CHARSET', 'utf8mb4');
 
 // API Configuration
 define('OPENAI_API_KEY', getenv('OPENAI_API_KEY') ?: '');
-define('OPENAI_API_URL', 'https://api.openai.com/v1');
+define('OPENAI_API_URL', getenv('OPENAI_BASE_URL') ?: 'https://api.openai.com/v1');
 
 // Application Configuration
 define('APP_NAME', 'InnoStart');
@@ -13,11 +13,8 @@ from typing import Dict, List, Optional
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-try:
-    from enhanced_ai_integration import EnhancedAI
-except ImportError:
-    print("Enhanced AI integration not available, using fallback")
-    EnhancedAI = None
+# Responses come from generate_fallback_response, so this entry point only needs the
+# standard library; import enhanced_ai_integration explicitly where EnhancedAI is wanted
 
 def main():
     parser = argparse.ArgumentParser(description='AI Chat Interface for InnoStart')
@@ -36,15 +33,8 @@ def main():
             except json.JSONDecodeError:
                 history = []
         
-        # Always use fallback response generation for now (more reliable)
-        response = generate_fallback_response(args.message, args.intent)
-        
         # Return response as JSON
-        result = {
-            'response': response,
-            'intent': args.intent or 'general_inquiry',
-            'success': True
-        }
+        result = build_result(args.message, args.intent)
         
         print(json.dumps(result))
         
@@ -57,6 +47,17 @@ def main():
         }
         print(json.dumps(error_result))
 
+def build_result(message: str, intent: Optional[str] = None) -> Dict:
+    """Build the JSON payload returned to chat.php for a message"""
+    # Always use fallback response generation for now (more reliable)
+    response = generate_fallback_response(message, intent)
+    
+    return {
+        'response': response,
+        'intent': intent or 'general_inquiry',
+        'success': True
+    }
+
 def generate_fallback_response(message: str, intent: Optional[str] = None) -> str:
     """Generate a fallback response when enhanced AI is not available"""
     
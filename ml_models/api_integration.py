@@ -9,20 +9,51 @@ import json
 import os
 from response_generator import BusinessResponseGenerator
 
+def stream_response(message, context, progressive=False):
+    """Print the enhanced answer as JSON lines, one event per line, as it is generated
+    
+    progressive: answer/upgrade/done events (progressive_enhanced_response) instead of
+    start/delta/done (stream_enhanced_response)
+    """
+    from enhanced_ai_integration import EnhancedAI
+    
+    try:
+        ai = EnhancedAI()
+        events = ai.progressive_enhanced_response(message, context) if progressive \
+            else ai.stream_enhanced_response(message, context)
+        for event in events:
+            print(json.dumps(event), flush=True)
+    except Exception as e:
+        print(json.dumps({'event': 'error', 'error': 'AI processing failed', 'message': str(e)}), flush=True)
+
 def main():
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    # --stream: JSON lines as the answer is produced, for callers relaying it as it arrives
+    # --progressive: JSON lines of the two-phase answer (local answer, then its upgrade)
+    progressive = '--progressive' in args
+    if progressive:
+        args.remove('--progressive')
+    stream = '--stream' in args
+    if stream:
+        args.remove('--stream')
+    
+    if len(args) < 1:
         print(json.dumps({'error': 'No message provided'}))
         return
     
-    message = sys.argv[1]
+    message = args[0]
     context = {}
     
-    if len(sys.argv) > 2:
+    if len(args) > 1:
         try:
-            context = json.loads(sys.argv[2])
+            context = json.loads(args[1])
         except:
             context = {}
     
+    if stream or progressive:
+        stream_response(message, context, progressive)
+        return
+    
     try:
         # Initialize response generator
         generator = BusinessResponseGenerator()
@@ -0,0 +1,1346 @@
+#!/usr/bin/env python3
+"""
+InnoStart ML Benchmarks
+Micro-benchmarks for the performance-sensitive paths of the ML models
+
+Usage: python benchmark.py <benchmark> [options]
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+from typing import Callable, Dict, List
+
+# Add the current directory to Python path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+DATASET_PATH = os.path.join(BASE_DIR, '..', 'datasets', 'musanze_dataset.csv')
+
+
+def time_call(func: Callable, repeat: int = 5) -> Dict:
+    """Run func repeat times and return timing statistics in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        'min_ms': min(samples),
+        'median_ms': statistics.median(samples),
+        'max_ms': max(samples)
+    }
+
+
+def time_subprocess(code: str, repeat: int = 3) -> Dict:
+    """Time a snippet in a fresh interpreter, including interpreter startup and imports"""
+    return time_call(
+        lambda: subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR, check=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+        repeat
+    )
+
+
+def print_table(title: str, rows: List[Dict]) -> None:
+    print(f"\n{title}")
+    print("-" * 60)
+    for row in rows:
+        name = row.pop('name')
+        print(f"{name:<28}" + "  ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}"
+                                        for k, v in row.items()))
+
+
+def bench_cold_start(args) -> None:
+    """Compare retraining MusanzeSmartModel with loading its saved artifact"""
+    from musanze_smart_model import MusanzeSmartModel
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, 'musanze_smart_model.json')
+        MusanzeSmartModel.load_or_train(DATASET_PATH, artifact_path)
+
+        def train():
+            MusanzeSmartModel().train(DATASET_PATH)
+
+        def load():
+            assert MusanzeSmartModel.load(artifact_path, DATASET_PATH) is not None
+
+        setup = f"import sys; sys.path.insert(0, {BASE_DIR!r}); from musanze_smart_model import MusanzeSmartModel; "
+        rows = [
+            dict(name='in-process train', **time_call(train, args.repeat)),
+            dict(name='in-process load', **time_call(load, args.repeat)),
+            dict(name='fresh process train', **time_subprocess(
+                setup + f"MusanzeSmartModel().train({DATASET_PATH!r})", args.repeat)),
+            dict(name='fresh process load', **time_subprocess(
+                setup + f"MusanzeSmartModel.load({artifact_path!r}, {DATASET_PATH!r})", args.repeat)),
+        ]
+
+    print_table("MusanzeSmartModel cold start", rows)
+
+
+def bench_matcher(args) -> None:
+    """Compare per-message keyword matching against the old linear substring scans"""
+    import random
+    from musanze_vocabulary import BUSINESS_TYPE_MAPPING, BUDGET_KEYWORDS, Vocabulary
+
+    random.seed(42)
+    words = [word for key in BUSINESS_TYPE_MAPPING for word in key.split()]
+
+    # 10x table: synthetic multi-word phrases over the same alphabet as the real keys
+    large_mapping = dict(BUSINESS_TYPE_MAPPING)
+    while len(large_mapping) < 10 * len(BUSINESS_TYPE_MAPPING):
+        phrase = ' '.join(random.sample(words, 2)) + f" {len(large_mapping)}"
+        large_mapping[phrase] = ['Local Restaurant']
+
+    filler = "i am looking for a good place to start something near the volcanoes with my family "
+    messages = {
+        length: (filler * (length // len(filler) + 1))[:length - 20] + " coffee shop 5-15m"
+        for length in (100, 2000, 20000)
+    }
+
+    def linear_scan(mapping, text):
+        # What predict used to do: two scans over the type list, two over the budget list,
+        # then one more over the whole mapping for the combined lookup
+        for _ in range(2):
+            next((key for key in mapping if key in text), None)
+            next((budget for budget in BUDGET_KEYWORDS if budget in text), None)
+        return [t for key, types in mapping.items() if key in text for t in types]
+
+    rows = []
+    for label, mapping in (('1x', BUSINESS_TYPE_MAPPING), ('10x', large_mapping)):
+        vocabulary = Vocabulary(mapping)
+        for length, text in messages.items():
+            rows.append(dict(name=f"linear {label} {length} chars",
+                             **time_call(lambda: linear_scan(mapping, text), args.repeat)))
+            rows.append(dict(name=f"compiled {label} {length} chars",
+                             **time_call(lambda: vocabulary.scan(text).business_types(), args.repeat)))
+
+    print_table(f"Keyword matching ({len(BUSINESS_TYPE_MAPPING)} vs {len(large_mapping)} keys)", rows)
+
+
+def bench_train(args) -> None:
+    """Training time and peak RSS of MusanzeSmartModel.train as the dataset grows"""
+    import pandas as pd
+
+    source = pd.read_csv(DATASET_PATH)
+    # VmHWM (peak RSS) is reset by exec, unlike ru_maxrss which the child inherits from us
+    code = (
+        "import sys, json, time; sys.path.insert(0, {base!r}); "
+        "from musanze_smart_model import MusanzeSmartModel; "
+        "peak = lambda: int(next(l for l in open('/proc/self/status') if l.startswith('VmHWM')).split()[1]); "
+        "before = peak(); "
+        "started = time.perf_counter(); MusanzeSmartModel().train({path!r}); "
+        "elapsed = time.perf_counter() - started; "
+        "after = peak(); "
+        "print(json.dumps({{'seconds': elapsed, 'peak_rss_mb': after / 1024, "
+        "'train_rss_mb': (after - before) / 1024}}))"
+    )
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = os.path.join(tmp, f"musanze_{size}.csv")
+            source.sample(size, replace=True, random_state=size).to_csv(path, index=False)
+
+            output = subprocess.run([sys.executable, '-c', code.format(base=BASE_DIR, path=path)],
+                                    cwd=BASE_DIR, check=True, capture_output=True, text=True).stdout
+            rows.append(dict(name=f"{size:,} rows", **json.loads(output.strip().splitlines()[-1])))
+
+    print_table("MusanzeSmartModel.train (Linux peak RSS)", rows)
+
+
+def bench_cards(args) -> None:
+    """Per-request latency of a 10-result opportunities response, old row loop vs cached cards"""
+    import pandas as pd
+    from musanze_smart_model import MusanzeSmartModel
+    from musanze_dataset_store import get_store
+
+    df = pd.read_csv(DATASET_PATH)
+    store = get_store(DATASET_PATH)
+    types = ['Local Restaurant', 'Food Processing']
+
+    def row_loop():
+        # The previous rendering: mask the DataFrame and concatenate fields row by row
+        response = ""
+        for i, (_, row) in enumerate(df[df['business_type'].isin(types)].head(10).iterrows(), 1):
+            response += f"**{i}. {row['business_type']}:**\n"
+            response += f"• **Location:** {row['location']}\n"
+            response += f"• **Startup Cost:** {row['startup_costs']:,} RWF\n"
+            response += f"• **Revenue Potential:** {row['revenue_potential']:,} RWF per month\n"
+            response += f"• **Target Market:** {row['target_market']}\n"
+            response += f"• **Skills Required:** {row['skills_required']}\n"
+            response += f"• **Market Demand:** {row['market_demand']}\n"
+            response += f"• **Competition:** {row['competition_level']}\n\n"
+        return response
+
+    model = MusanzeSmartModel()
+    model.dataset_path = DATASET_PATH
+    repeat = max(args.repeat, 100)
+
+    rows = [
+        dict(name='DataFrame row loop', **time_call(row_loop, repeat)),
+        dict(name='cached cards', **time_call(lambda: store.render_cards(store.query(types)), repeat)),
+        dict(name='get_businesses_by_type', **time_call(lambda: model.get_businesses_by_type('restaurant'), repeat)),
+    ]
+    print_table("10-result opportunities response", rows)
+
+
+def bench_batch(args) -> None:
+    """Throughput of the batch inference entry points against one-at-a-time calls"""
+    import warnings
+    import pandas as pd
+    from response_generator import BusinessResponseGenerator
+    from musanze_ml_model import MusanzeMLModel
+
+    warnings.filterwarnings('ignore')
+    generator = BusinessResponseGenerator(os.path.join(BASE_DIR, 'business_response_model'))
+    questions = pd.read_csv(os.path.join(BASE_DIR, '..', 'training_data', 'business_training_data.csv'))['question'].tolist()
+
+    # MusanzeMLModel.train saves into ml_models/ relative to the working directory
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, 'ml_models'))
+        os.chdir(tmp)
+        try:
+            musanze_model = MusanzeMLModel()
+            musanze_model.train(DATASET_PATH)
+        finally:
+            os.chdir(previous_dir)
+
+    def throughput(func, batch):
+        started = time.perf_counter()
+        func(batch)
+        return len(batch) / (time.perf_counter() - started)
+
+    rows = []
+    for size in args.batch_sizes:
+        batch = (questions * (size // len(questions) + 1))[:size]
+        row = {'name': f"batch {size:,}"}
+        row['classify_qps'] = throughput(generator.predict_categories, batch)
+        row['respond_qps'] = throughput(generator.generate_responses, batch)
+        row['musanze_qps'] = throughput(musanze_model.predict_many, batch)
+        # One-at-a-time baseline, capped so large batches finish in reasonable time
+        sample = batch[:1000]
+        row['single_classify_qps'] = throughput(lambda b: [generator.predict_category(q) for q in b], sample)
+        rows.append(row)
+
+    print_table("Batch inference throughput (questions/s)", rows)
+
+
+def bench_artifact(args) -> None:
+    """Load time of the response model as a pickle vs a memory-mapped artifact, as the forest grows"""
+    import pickle
+    import warnings
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from model_artifact import load_artifact, load_model_data, save_artifact
+
+    warnings.filterwarnings('ignore')
+    base = load_model_data(os.path.join(BASE_DIR, 'business_response_model'))
+    questions = pd.read_csv(os.path.join(BASE_DIR, '..', 'training_data', 'business_training_data.csv'))['question'].tolist()
+    X = base['vectorizer'].transform(questions)
+    y = base['model'].predict(X)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_estimators in (100, 1000, 5000):
+            model = RandomForestClassifier(n_estimators=n_estimators, random_state=42).fit(X, y)
+            pickle_path = os.path.join(tmp, f"model_{n_estimators}.pkl")
+            artifact_path = os.path.join(tmp, f"model_{n_estimators}")
+            with open(pickle_path, 'wb') as f:
+                pickle.dump({'model': model, 'vectorizer': base['vectorizer']}, f)
+            save_artifact(artifact_path, model, base['vectorizer'], base['label_encoder'], base['response_categories'])
+
+            def load_pickle():
+                with open(pickle_path, 'rb') as f:
+                    pickle.load(f)
+
+            rows.append(dict(name=f"pickle {n_estimators} trees", **time_call(load_pickle, args.repeat)))
+            rows.append(dict(name=f"artifact {n_estimators} trees",
+                             **time_call(lambda: load_artifact(artifact_path), args.repeat)))
+
+    print_table("Response model load time", rows)
+
+
+def start_openai_stand_in(latency_ms: float = 0.0, token_delay_ms: float = 0.0, rate_limit_rps: float = 0.0,
+                          **options):
+    """Local OpenAI stand-in (see openai_stand_in.py) in its own process; returns (process, port)"""
+    from openai_stand_in import serve_in_process
+
+    return serve_in_process(latency_ms=latency_ms, token_delay_ms=token_delay_ms, rate_limit_rps=rate_limit_rps,
+                            **options)
+
+
+def bench_http_pool(args) -> None:
+    """Per-call latency of requests.post vs the pooled keep-alive client at N concurrent callers"""
+    from concurrent.futures import ThreadPoolExecutor
+    import requests
+    from http_client import PooledHTTPClient
+
+    server, port = start_openai_stand_in(args.latency_ms)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    payload = {'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': 'hello'}], 'max_tokens': 500}
+    headers = {"Authorization": "Bearer test", "Content-Type": "application/json"}
+    calls = args.concurrency * 20
+
+    def run(call, workers):
+        samples = []
+
+        def one(_):
+            started = time.perf_counter()
+            response = call()
+            response.json()
+            samples.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(one, range(calls)))
+        elapsed = time.perf_counter() - started
+        samples.sort()
+        return {'mean_ms': statistics.mean(samples), 'p50_ms': samples[len(samples) // 2],
+                'p95_ms': samples[int(len(samples) * 0.95)], 'calls_per_s': calls / elapsed}
+
+    client = PooledHTTPClient(base_url, headers, pool_size=args.concurrency)
+    unpooled = lambda: requests.post(f"{base_url}/chat/completions", headers=headers, json=payload, timeout=30)
+    pooled = lambda: client.post_json("/chat/completions", payload, timeout=30)
+    run(pooled, args.concurrency)  # warm the pool
+
+    rows = []
+    for workers in (1, args.concurrency):
+        rows.append(dict(name=f"requests.post x{workers}", **run(unpooled, workers)))
+        rows.append(dict(name=f"pooled x{workers}", **run(pooled, workers)))
+    client.close()
+    server.terminate()
+
+    print_table(f"OpenAI calls, {args.concurrency} concurrent, {calls} total "
+                f"(plain HTTP stand-in: no TLS handshake, so remote savings are larger)", rows)
+
+
+def bench_fanout(args) -> None:
+    """Wall-clock time of the three dashboard calls run one after another vs InnoStartAI.analyze_all"""
+    import asyncio
+    import logging
+    sys.path.append(os.path.join(BASE_DIR, '..', 'python'))
+    from ai_integration import InnoStartAI
+
+    # Deadline misses are expected here; keep their log lines out of the table
+    logging.getLogger('ai_integration').setLevel(logging.CRITICAL)
+
+    latency_ms = args.latency_ms or 300.0
+    server, port = start_openai_stand_in(latency_ms)
+    ai = InnoStartAI('stand-in-key', base_url=f"http://127.0.0.1:{port}/v1")
+    request = dict(location='Musanze', interests=['tourism'], budget='1-5m',
+                   business_idea='Eco-lodge', question='How do I fund an eco-lodge?')
+
+    def sequential():
+        ai.generate_business_ideas(request['location'], request['interests'], request['budget'])
+        ai.analyze_market_opportunity(request['business_idea'], request['location'])
+        ai.get_business_advice(request['question'])
+
+    tight_deadline = latency_ms / 2000
+    rows = [
+        dict(name='sequential', **time_call(sequential, args.repeat)),
+        dict(name='analyze_all', **time_call(lambda: asyncio.run(ai.analyze_all(**request)), args.repeat)),
+        dict(name=f"analyze_all {tight_deadline:.2f}s deadline",
+             **time_call(lambda: asyncio.run(ai.analyze_all(**request, deadline=tight_deadline)), args.repeat)),
+    ]
+    server.terminate()
+
+    print_table(f"Dashboard analysis, stand-in latency {latency_ms:.0f} ms per call", rows)
+
+
+def bench_semantic_cache(args) -> None:
+    """SemanticCache lookup latency and near-duplicate recall as the number of cached answers grows"""
+    import numpy as np
+    from semantic_cache import SemanticCache
+
+    dimensions, terms = 5000, 8  # TF-IDF width of the response model's vectorizer, terms per question
+    categories = ['business_planning', 'financial', 'funding', 'legal', 'marketing', 'operations']
+    rng = np.random.default_rng(42)
+
+    def random_vector():
+        vector = np.zeros(dimensions, dtype=np.float32)
+        vector[rng.choice(dimensions, terms, replace=False)] = rng.random(terms) + 0.1
+        return vector
+
+    rows = []
+    for size in args.sizes:
+        cache = SemanticCache(dimensions, threshold=0.9, maxsize=size)
+        stored = []
+        for i in range(size):
+            vector = random_vector()
+            cache.set(vector, categories[i % len(categories)], {'response': i})
+            if i % max(1, size // 1000) == 0:
+                stored.append((vector, categories[i % len(categories)]))
+
+        # Near duplicates: the same terms with slightly different weights (cosine ~0.95+)
+        near = [(vector * (1 + 0.1 * rng.standard_normal(dimensions)).astype(np.float32) * (vector > 0), category)
+                for vector, category in stored]
+        fresh = [(random_vector(), categories[i % len(categories)]) for i in range(len(stored))]
+
+        def lookups(queries):
+            samples, found = [], 0
+            for vector, category in queries:
+                started = time.perf_counter()
+                found += cache.get(vector, category) is not None
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            return samples, found / len(queries)
+
+        near_samples, recall = lookups(near)
+        fresh_samples, false_hits = lookups(fresh)
+        rows.append({
+            'name': f"{size:,} entries",
+            'near_p50_ms': near_samples[len(near_samples) // 2],
+            'near_p99_ms': near_samples[int(len(near_samples) * 0.99)],
+            'miss_p50_ms': fresh_samples[len(fresh_samples) // 2],
+            'recall': recall,
+            'false_hit_rate': false_hits,
+            'avg_candidates': cache.stats()['avg_candidates'],
+        })
+
+    print_table("SemanticCache lookups (threshold 0.9)", rows)
+
+
+# The enhancement prompt as it was built before prompt_builder, for comparison
+LEGACY_ENHANCEMENT_PROMPT = """
+        Question: {question}
+        
+        Current Response: {response}
+        Category: {category}
+        
+Context: {context}
+        
+        Please enhance this response by:
+        1. Making it more specific and actionable
+        2. Adding relevant examples or case studies
+        3. Including specific metrics or benchmarks where appropriate
+        4. Providing clear next steps
+        5. Maintaining a professional but encouraging tone
+        
+        Keep the response concise but comprehensive, and ensure it directly addresses the user's question.
+        """
+
+
+def bench_prompt(args) -> None:
+    """Prompt tokens of the legacy and compact enhancement prompts, and trimming to a token budget"""
+    sys.path.append(os.path.join(BASE_DIR, '..', 'python'))
+    from ai_integration import ADVICE_PROMPT, IDEAS_PROMPT, MARKET_PROMPT
+    from enhanced_ai_integration import ENHANCEMENT_PROMPT
+    from prompt_builder import count_message_tokens, count_tokens
+
+    answer = ("Consider multiple funding sources: bootstrapping, angel investors, bank loans, or crowdfunding. "
+              "Each has different requirements and benefits. Start with a clear business plan and financial projections.")
+    # Chat requests carry session details the prompt does not need
+    context = {'business_type': 'tourism', 'location': 'Musanze', 'budget': 50000, 'experience': 'beginner',
+               'session_id': 'a3f9c2', 'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)',
+               'history': [{'role': 'user', 'content': 'hello'}, {'role': 'assistant', 'content': 'Hi! How can I help?'}]}
+    values = {'question': 'How do I get funding for my eco-lodge?', 'current_response': answer, 'category': 'funding'}
+
+    legacy = LEGACY_ENHANCEMENT_PROMPT.format(response=answer, context=json.dumps(context, indent=2), **values)
+    legacy_tokens = count_message_tokens([{'content': ENHANCEMENT_PROMPT.system}, {'content': legacy}])
+    rows = [{'name': 'enhancement, legacy', 'input_tokens': legacy_tokens, 'chars': len(legacy),
+             'max_tokens': 500, **time_call(lambda: LEGACY_ENHANCEMENT_PROMPT.format(
+                 response=answer, context=json.dumps(context, indent=2), **values), args.repeat * 1000)}]
+
+    cases = (
+        ('enhancement', ENHANCEMENT_PROMPT, values, context, None),
+        ('enhancement, budget 150', ENHANCEMENT_PROMPT, dict(values, current_response=answer * 4), context, 150),
+        ('ideas', IDEAS_PROMPT, {'location': 'Musanze', 'interests': 'tourism, agriculture', 'budget': '1-5M RWF'},
+         None, None),
+        ('market analysis', MARKET_PROMPT, {'business_idea': 'Eco-lodge', 'location': 'Musanze'}, None, None),
+        ('advice', ADVICE_PROMPT, {'question': values['question']}, context, None),
+    )
+    for name, template, case_values, case_context, budget in cases:
+        data = template.request(case_values, case_context, budget)
+        rows.append({'name': name, 'input_tokens': count_message_tokens(data['messages']),
+                     'chars': len(data['messages'][1]['content']), 'max_tokens': data['max_tokens'],
+                     **time_call(lambda: template.request(case_values, case_context, budget), args.repeat * 1000)})
+
+    compact = rows[1]['input_tokens']
+    print_table("Prompt size (tokens counted locally) and build time", rows)
+    print(f"\nEnhancement prompt: {legacy_tokens} -> {compact} input tokens "
+          f"({1 - compact / legacy_tokens:.0%} fewer; whitespace runs, which the API also bills, not counted)")
+    if rows[2]['input_tokens'] > 150:
+        print(f"\nTrimming failed: {rows[2]['input_tokens']} tokens over the 150-token budget")
+        sys.exit(1)
+
+
+def bench_single_flight(args) -> None:
+    """100 concurrent identical requests (threads, then asyncio) must reach the stand-in exactly once"""
+    import asyncio
+    import threading
+    import requests
+    from enhanced_ai_integration import EnhancedAI
+    from response_generator import BusinessResponseGenerator
+    from routing import RoutingPolicy
+    from single_flight import SingleFlight
+
+    server, port = start_openai_stand_in(args.latency_ms or 500.0)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    upstream_calls = lambda: requests.get(f"{base_url}/stats", timeout=5).json()['requests']
+
+    # Deterministic answers make every caller build the same final prompt, as in the inference service
+    generator = BusinessResponseGenerator(os.path.join(BASE_DIR, 'business_response_model'), deterministic=True)
+    ai = EnhancedAI('stand-in-key', response_generator=generator, base_url=base_url,
+                    routing=RoutingPolicy(enabled=False))
+    concurrency = 100
+    failures = []
+
+    # Threads
+    barrier = threading.Barrier(concurrency)
+    answers = []
+
+    def ask():
+        barrier.wait()
+        answers.append(ai.generate_enhanced_response("How do I get funding for my startup?")['source'])
+
+    before = upstream_calls()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=ask) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    thread_ms = (time.perf_counter() - started) * 1000
+    thread_calls = upstream_calls() - before
+    if thread_calls != 1 or answers.count('openai_enhanced') != concurrency:
+        failures.append(f"threads: {thread_calls} upstream calls, {answers.count('openai_enhanced')} enhanced answers")
+
+    # asyncio tasks sharing one flight
+    flight = SingleFlight(timeout=10)
+    payload = {'model': 'gpt-3.5-turbo', 'messages': [{'role': 'user', 'content': 'menu option'}]}
+
+    async def fan_out():
+        post = lambda: asyncio.to_thread(ai.http_client.post_json, "/chat/completions", payload)
+        return await asyncio.gather(*(flight.do_async('menu option', post) for _ in range(concurrency)))
+
+    before = upstream_calls()
+    started = time.perf_counter()
+    responses = asyncio.run(fan_out())
+    async_ms = (time.perf_counter() - started) * 1000
+    async_calls = upstream_calls() - before
+    if async_calls != 1 or len(responses) != concurrency:
+        failures.append(f"asyncio: {async_calls} upstream calls for {len(responses)} responses")
+    server.terminate()
+
+    print_table(f"Single-flight, {concurrency} concurrent identical requests", [
+        {'name': 'threads', 'upstream_calls': thread_calls, 'wall_ms': thread_ms, **ai.single_flight.stats()},
+        {'name': 'asyncio', 'upstream_calls': async_calls, 'wall_ms': async_ms, **flight.stats()},
+    ])
+    if failures:
+        print("\nSingle-flight check failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+
+def bench_budget(args) -> None:
+    """Latency budgets against a slow stand-in: plain wait vs budgeted vs hedged, then the breaker tripping"""
+    import logging
+    import requests
+    from concurrent.futures import ThreadPoolExecutor
+    from circuit_breaker import CircuitBreaker
+    from enhanced_ai_integration import EnhancedAI
+    from response_generator import BusinessResponseGenerator
+    from routing import RoutingPolicy
+
+    upstream_ms = args.latency_ms or 2000.0
+    budget = 0.3
+    server, port = start_openai_stand_in(upstream_ms)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    generator = BusinessResponseGenerator(os.path.join(BASE_DIR, 'business_response_model'), deterministic=True)
+    logging.getLogger('enhanced_ai_integration').setLevel(logging.CRITICAL)
+    counter = iter(range(10 ** 9))
+
+    def run(ai, call_budget, calls):
+        def one(_):
+            # Distinct contexts, so single-flight does not coalesce the calls
+            context = {'stage': next(counter)}
+            started = time.perf_counter()
+            source = ai.generate_enhanced_response("How do I get funding for my startup?", context,
+                                                   budget=call_budget)['source']
+            return (time.perf_counter() - started) * 1000, source
+
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            results = list(pool.map(one, range(calls)))
+        latencies = sorted(ms for ms, _ in results)
+        return {
+            'p50_ms': latencies[len(latencies) // 2],
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+            'local_answers': sum(1 for _, source in results if source != 'openai_enhanced'),
+        }
+
+    def make_ai(hedge, breaker=None):
+        return EnhancedAI('stand-in-key', response_generator=generator, hedge=hedge, base_url=base_url,
+                          routing=RoutingPolicy(enabled=False),
+                          circuit_breaker=breaker or CircuitBreaker(min_calls=10 ** 9))
+
+    calls = args.concurrency
+    rows = []
+    failures = []
+    for name, ai, call_budget in (('no budget', make_ai(False), None),
+                                  (f"budget {budget}s", make_ai(False), budget),
+                                  (f"budget {budget}s, hedged", make_ai(True), budget)):
+        row = run(ai, call_budget, calls)
+        stats = ai.enhancement_stats()
+        rows.append({'name': name, **row, 'budget_expired': stats['budget_expired']})
+        # Only hedging bounds the wait: requests' timeout is per socket read and excludes pool waits
+        if ai.hedge and row['p99_ms'] > (call_budget + 0.05) * 1000:
+            failures.append(f"{name}: p99 {row['p99_ms']:.0f} ms exceeds the {call_budget}s budget")
+
+    # Breaker: upstream answers slower than the budget can use, so once min_calls report
+    # their latency it opens and calls skip OpenAI entirely
+    breaker = CircuitBreaker(window=20, min_calls=10, cooldown=60.0, max_p95_latency=budget)
+    ai = make_ai(True, breaker)
+    tripping = run(ai, budget, calls)
+    # Let the calls that outlived their budget land and report their latency
+    deadline = time.monotonic() + 30
+    while requests.get(f"{base_url}/stats", timeout=5).json()['in_flight'] and time.monotonic() < deadline:
+        time.sleep(0.1)
+    open_phase = run(ai, budget, calls)
+    stats = ai.enhancement_stats()
+    rows.append({'name': 'breaker tripping', **tripping, 'budget_expired': stats['budget_expired']})
+    rows.append({'name': 'breaker open', **open_phase, 'breaker_skipped': stats['breaker_skipped']})
+    if stats['circuit_breaker']['state'] != 'open' or open_phase['p99_ms'] > budget * 1000 / 2:
+        failures.append(f"breaker {stats['circuit_breaker']['state']}, open-phase p99 {open_phase['p99_ms']:.0f} ms")
+    server.terminate()
+
+    print_table(f"OpenAI enhancement, stand-in at {upstream_ms:.0f} ms, {calls} concurrent callers", rows)
+    print(f"\nCircuit breaker: {json.dumps(stats['circuit_breaker'])}")
+    if failures:
+        print("\nLatency budget check failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+def start_inference_service(openai_base_url: str):
+    """In-process inference service whose EnhancedAI talks to openai_base_url; returns (registry, server, client)"""
+    import threading
+    from inference_client import InferenceClient
+    from inference_server import ModelRegistry, create_server
+    from routing import RoutingPolicy
+
+    os.environ['OPENAI_API_KEY'] = 'stand-in-key'
+    registry = ModelRegistry(DATASET_PATH, os.path.join(BASE_DIR, 'business_response_model'), semantic_cache_size=0,
+                             openai_base_url=openai_base_url, routing=RoutingPolicy(enabled=False))
+    service = create_server(registry, '127.0.0.1', 0)
+    threading.Thread(target=service.serve_forever, daemon=True).start()
+    client = InferenceClient('127.0.0.1', service.server_address[1], socket_path=None, timeout=60)
+    return registry, service, client
+
+
+def bench_stream(args) -> None:
+    """Time to first byte of streamed vs whole enhanced answers, direct and through the inference service"""
+    first_token_ms = args.latency_ms or 300.0
+    server, port = start_openai_stand_in(first_token_ms, args.token_delay_ms)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    question = "How do I get funding for my startup?"
+
+    def timed_stream(events):
+        started = time.perf_counter()
+        first_ms, chunks = None, 0
+        for event in events:
+            if event['event'] == 'delta':
+                chunks += 1
+                if first_ms is None:
+                    first_ms = (time.perf_counter() - started) * 1000
+        return {'ttfb_ms': first_ms, 'total_ms': (time.perf_counter() - started) * 1000, 'chunks': chunks}
+
+    def timed_call(func):
+        started = time.perf_counter()
+        func()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        return {'ttfb_ms': elapsed_ms, 'total_ms': elapsed_ms, 'chunks': 1}
+
+    # Fresh contexts keep single-flight and caches out of the picture
+    contexts = ({'stage': i} for i in range(10 ** 9))
+
+    registry, service, client = start_inference_service(base_url)
+    ai = registry.enhanced_ai
+
+    measurements = {
+        'EnhancedAI, whole answer': lambda: timed_call(lambda: ai.generate_enhanced_response(question, next(contexts))),
+        'EnhancedAI, streamed': lambda: timed_stream(ai.stream_enhanced_response(question, next(contexts))),
+        'service, whole answer': lambda: timed_call(
+            lambda: client.generate_enhanced_response(question, next(contexts))),
+        'service, streamed': lambda: timed_stream(client.stream_enhanced_response(question, next(contexts))),
+    }
+    rows = []
+    for name, measure in measurements.items():
+        runs = [measure() for _ in range(args.repeat)]
+        rows.append({'name': name, 'ttfb_ms': statistics.median(r['ttfb_ms'] for r in runs),
+                     'total_ms': statistics.median(r['total_ms'] for r in runs), 'chunks': runs[0]['chunks']})
+    client.close()
+    service.shutdown()
+    server.terminate()
+
+    slow = [row['name'] for row in rows
+            if 'streamed' in row['name'] and (row['chunks'] < 2 or row['ttfb_ms'] > first_token_ms + 100)]
+    print_table(f"Enhanced answer, stand-in first token {first_token_ms:.0f} ms, "
+                f"{args.token_delay_ms:.0f} ms per further token", rows)
+    if slow:
+        print(f"\nStreaming check failed (first chunk later than first token + 100 ms): {', '.join(slow)}")
+        sys.exit(1)
+
+
+def bench_progressive(args) -> None:
+    """Two-phase answers through the inference service: local answer latency vs waiting for OpenAI"""
+    upstream_ms = args.latency_ms or 1500.0
+    server, port = start_openai_stand_in(upstream_ms)
+    registry, service, client = start_inference_service(f"http://127.0.0.1:{port}/v1")
+    question = "How do I get funding for my startup?"
+    # Fresh contexts keep single-flight and caches out of the picture
+    contexts = ({'stage': i} for i in range(10 ** 9))
+
+    def elapsed_ms(started):
+        return (time.perf_counter() - started) * 1000
+
+    def local_only():
+        started = time.perf_counter()
+        client.generate_response(question, next(contexts))
+        return {'first_answer_ms': elapsed_ms(started)}
+
+    def whole():
+        started = time.perf_counter()
+        client.generate_enhanced_response(question, next(contexts))
+        return {'first_answer_ms': elapsed_ms(started), 'enhanced_ms': elapsed_ms(started)}
+
+    def progressive_stream():
+        started = time.perf_counter()
+        row = {}
+        for event in client.progressive_enhanced_response(question, next(contexts)):
+            if event['event'] == 'answer':
+                row['first_answer_ms'] = elapsed_ms(started)
+            elif event['event'] == 'upgrade':
+                row['enhanced_ms'] = elapsed_ms(started)
+        return row
+
+    def fetch_by_id():
+        started = time.perf_counter()
+        answer = client.start_enhanced_response(question, next(contexts))
+        row = {'first_answer_ms': elapsed_ms(started)}
+        if client.get_enhanced_response(answer['response_id'], wait=5.0)['status'] == 'ready':
+            row['enhanced_ms'] = elapsed_ms(started)
+        return row
+
+    rows = []
+    for name, measure in (('local model only', local_only), ('whole enhanced answer', whole),
+                          ('progressive stream', progressive_stream), ('start + fetch by id', fetch_by_id)):
+        runs = [measure() for _ in range(args.repeat)]
+        row = {'name': name}
+        for key in ('first_answer_ms', 'enhanced_ms'):
+            if all(key in run for run in runs):
+                row[key] = statistics.median(run[key] for run in runs)
+        rows.append(row)
+    client.close()
+    service.shutdown()
+    server.terminate()
+
+    local_ms = rows[0]['first_answer_ms']
+    failures = [row['name'] for row in rows[2:]
+                if 'enhanced_ms' not in row or row['first_answer_ms'] > local_ms + 20]
+    print_table(f"Two-phase answers, stand-in at {upstream_ms:.0f} ms", rows)
+    if failures:
+        print(f"\nProgressive check failed (no upgrade, or first answer much slower than local): "
+              f"{', '.join(failures)}")
+        sys.exit(1)
+
+
+def _disk_cache_worker(path: str, worker: int, writes: int, reads: int, max_entries: int,
+                       barrier, results) -> None:
+    """One benchmark process: write its share of entries, then time disk and hot-layer hits"""
+    import random
+    from disk_cache import DiskCache
+
+    value_size = 2000
+    value = {'choices': [{'message': {'role': 'assistant', 'content': 'x' * value_size}}]}
+    cache = DiskCache(path, max_entries=max_entries, hot_size=0)
+
+    started = time.perf_counter()
+    for i in range(writes):
+        cache.set(f"gpt-3.5-turbo:{worker}:{i}", value)
+    write_seconds = time.perf_counter() - started
+    barrier.wait()
+
+    # Recent keys of every process, so reads cross process boundaries
+    rng = random.Random(worker)
+    keys = [f"gpt-3.5-turbo:{rng.randrange(16)}:{writes - 1 - rng.randrange(writes // 4)}" for _ in range(reads)]
+    disk_ms = []
+    for key in keys:
+        started = time.perf_counter()
+        cache.get(key)
+        disk_ms.append((time.perf_counter() - started) * 1000)
+
+    hot = DiskCache(path, max_entries=max_entries, hot_size=1024)
+    hot.get(keys[0])
+    hot_ms = []
+    for _ in range(reads):
+        started = time.perf_counter()
+        hot.get(keys[0])
+        hot_ms.append((time.perf_counter() - started) * 1000)
+    results.put({'write_seconds': write_seconds, 'disk_ms': disk_ms, 'hot_ms': hot_ms,
+                 'hits': cache.hits, 'errors': cache.errors + hot.errors})
+
+
+# Chat traffic mix: (share, intent, question); intents are those api/chat.php's menu flow sends
+ROUTING_TRAFFIC = (
+    (0.15, 'greeting', "hello"),
+    (0.15, 'help', "What can you do?"),
+    (0.15, 'business_opportunities', "What business opportunities are available in Musanze?"),
+    (0.10, 'sector_inquiry', "Which sector should I pick?"),
+    (0.05, 'export_request', "Export my business plan as PDF"),
+    (0.10, 'budget_inquiry', "How do I get funding for my startup?"),
+    (0.05, 'planning', "How do I write a business plan?"),
+    (0.10, 'general_inquiry', "How do I hire my first employee?"),
+    (0.10, 'general_inquiry', "How should I market my coffee shop on social media?"),
+    (0.05, 'general_inquiry', "How do I create a cash flow projection?"),
+)
+
+
+def bench_routing(args) -> None:
+    """Menu-flow chat traffic against a slow stand-in: every question upstream vs confidence-based routing"""
+    import logging
+    from concurrent.futures import ThreadPoolExecutor
+    from circuit_breaker import CircuitBreaker
+    from enhanced_ai_integration import EnhancedAI
+    from http_client import close_clients
+    from response_generator import BusinessResponseGenerator
+    from routing import RoutingPolicy
+
+    calls = 200
+    upstream_ms = args.latency_ms or 1000.0
+    server, port = start_openai_stand_in(upstream_ms)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    generator = BusinessResponseGenerator(os.path.join(BASE_DIR, 'business_response_model'), deterministic=True)
+    logging.getLogger('enhanced_ai_integration').setLevel(logging.CRITICAL)
+    logging.getLogger('prompt_builder').setLevel(logging.WARNING)
+
+    traffic = []
+    for share, intent, question in ROUTING_TRAFFIC:
+        traffic += [(intent, question)] * round(share * calls)
+
+    rows = []
+    for name, routing in (('all upstream', RoutingPolicy(enabled=False)), ('routed', RoutingPolicy())):
+        # A fresh shared client per run, so its pool-wait figures are this run's alone
+        close_clients()
+        ai = EnhancedAI('stand-in-key', response_generator=generator, hedge=False, base_url=base_url, routing=routing,
+                        circuit_breaker=CircuitBreaker(min_calls=10 ** 9))
+
+        def one(job):
+            i, (intent, question) = job
+            started = time.perf_counter()
+            # Distinct stages keep single-flight from coalescing repeats of a question
+            ai.generate_enhanced_response(question, {'intent': intent, 'stage': i})
+            return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            latencies = sorted(pool.map(one, enumerate(traffic)))
+        wall_s = time.perf_counter() - started
+        stats = ai.enhancement_stats()
+        rows.append({
+            'name': name,
+            'p50_ms': latencies[len(latencies) // 2],
+            'p90_ms': latencies[int(len(latencies) * 0.9)],
+            'upstream_calls': stats['openai_calls'],
+            'pool_wait_max_ms': stats['http_pool']['pool_wait_max_ms'],
+            'local_share': stats['routing']['local_share'],
+            'wall_s': wall_s,
+            'saved_s': stats['routing']['latency_saved_s'],
+        })
+    server.terminate()
+
+    print_table(f"{len(traffic)} chat requests, {args.concurrency} concurrent, stand-in at {upstream_ms:.0f} ms", rows)
+    print(f"\nRouting: {json.dumps(stats['routing'])}")
+
+
+def bench_enrichment(args) -> None:
+    """Dataset enrichment against a stand-in: concurrency saturation, interrupted-run resume and dedup"""
+    import shutil
+    import logging
+    import requests
+    from circuit_breaker import CircuitBreaker
+    from dataset_enrichment import DatasetEnricher, enrichment_path
+    from enhanced_ai_integration import EnhancedAI
+    from musanze_dataset_store import MusanzeDatasetStore
+    from rate_limiter import PRIORITY_BATCH
+    from response_generator import BusinessResponseGenerator
+    from routing import RoutingPolicy
+    import pandas as pd
+
+    concurrency = 16
+    latency_ms = args.latency_ms or 200.0
+    server, port = start_openai_stand_in(latency_ms)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    upstream = lambda: requests.get(f"{base_url}/stats", timeout=5).json()
+    logging.getLogger('prompt_builder').setLevel(logging.WARNING)
+
+    generator = BusinessResponseGenerator(os.path.join(BASE_DIR, 'business_response_model'), deterministic=True)
+    ai = EnhancedAI('stand-in-key', response_generator=generator, hedge=False, base_url=base_url,
+                    priority=PRIORITY_BATCH, routing=RoutingPolicy(enabled=False),
+                    circuit_breaker=CircuitBreaker(min_calls=10 ** 9))
+
+    rows = []
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        dataset = os.path.join(directory, 'musanze_dataset.csv')
+        shutil.copy(DATASET_PATH, dataset)
+        records = pd.read_csv(dataset).to_dict('records')
+        enricher = DatasetEnricher(ai, enrichment_path(dataset), concurrency, budget=30.0)
+
+        # An interrupted run: part of the inputs, then a line torn mid-write
+        first = enricher.run(records, limit=100)
+        with open(enrichment_path(dataset), 'a', encoding='utf-8') as f:
+            f.write('{"key": "torn')
+        resumed = enricher.run(records)
+        again = enricher.run(records)
+        for name, stats in (('first 100 inputs', first), ('resumed', resumed), ('nothing left', again)):
+            rows.append({'name': name, 'enriched': stats['enriched'], 'failed': stats['failed'],
+                         'resumed': stats['resumed'], 'requests_per_s': stats['requests_per_s'],
+                         'elapsed_s': stats['elapsed_s']})
+
+        calls_before = upstream()['requests']
+        store = MusanzeDatasetStore(dataset)
+        with_insight = sum(1 for insight in store.insights if insight)
+        stand_in = upstream()
+
+    server.terminate()
+    unique = first['unique_inputs']
+    ideal = concurrency / (latency_ms / 1000)
+    print_table(f"Enriching {first['rows']} rows ({unique} distinct inputs), concurrency {concurrency}, "
+                f"stand-in at {latency_ms:.0f} ms", rows)
+    print(f"\nUpstream: {stand_in['requests']} requests, max {stand_in['max_in_flight']} in flight "
+          f"(ideal throughput {ideal:.0f}/s); serving store: {with_insight}/{store.size} rows with an insight")
+
+    if stand_in['max_in_flight'] != concurrency:
+        failures.append(f"max {stand_in['max_in_flight']} requests in flight, configured {concurrency}")
+    if resumed['requests_per_s'] < 0.7 * ideal:
+        failures.append(f"{resumed['requests_per_s']:.0f} requests/s, below 70% of the ideal {ideal:.0f}/s")
+    if stand_in['requests'] != unique or again['enriched'] or stand_in['requests'] != calls_before:
+        failures.append(f"{stand_in['requests']} upstream requests for {unique} distinct inputs")
+    if with_insight != store.size:
+        failures.append(f"only {with_insight} of {store.size} rows carry an insight")
+    if failures:
+        print("\nEnrichment check failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+def bench_disk_cache(args) -> None:
+    """Write throughput and hit latency of the SQLite result cache shared by 16 processes"""
+    import multiprocessing
+    from disk_cache import DiskCache, EVICT_EVERY
+
+    processes = 16
+    writes = 2000
+    reads = 2000
+    max_entries = 20000
+    rows = []
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'remote_ai_cache.sqlite3')
+        DiskCache(path)
+        barrier = multiprocessing.Barrier(processes)
+        queue = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_disk_cache_worker,
+                                           args=(path, worker, writes, reads, max_entries, barrier, queue))
+                   for worker in range(processes)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        results = [queue.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        wall_seconds = time.perf_counter() - started
+        entries = len(DiskCache(path))
+
+    disk_ms = sorted(ms for result in results for ms in result['disk_ms'])
+    hot_ms = sorted(ms for result in results for ms in result['hot_ms'])
+    percentile = lambda values, p: values[min(len(values) - 1, int(len(values) * p))]
+    slowest_writer = max(result['write_seconds'] for result in results)
+    rows.append({'name': f"writes, {processes} processes", 'writes_per_s': processes * writes / slowest_writer,
+                 'errors': sum(result['errors'] for result in results)})
+    rows.append({'name': 'disk hits', 'p50_ms': percentile(disk_ms, 0.5), 'p99_ms': percentile(disk_ms, 0.99),
+                 'hit_rate': sum(result['hits'] for result in results) / len(disk_ms)})
+    rows.append({'name': 'hot-layer hits', 'p50_ms': percentile(hot_ms, 0.5), 'p99_ms': percentile(hot_ms, 0.99)})
+    rows.append({'name': 'size cap', 'entries': entries, 'max_entries': max_entries,
+                 'written': processes * writes, 'wall_s': wall_seconds})
+
+    if any(result['errors'] for result in results):
+        failures.append("SQLite errors under concurrent access")
+    if entries > max_entries + processes * EVICT_EVERY:
+        failures.append(f"{entries} entries left for a cap of {max_entries}")
+    print_table(f"SQLite result cache (WAL), {processes} concurrent processes", rows)
+    if failures:
+        print("\nDisk cache check failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+def bench_rate_limit(args) -> None:
+    """Burst of chat and batch calls against a stand-in limited to 20 requests/s: unpaced vs scheduled"""
+    import logging
+    from concurrent.futures import ThreadPoolExecutor
+    from circuit_breaker import CircuitBreaker
+    from enhanced_ai_integration import EnhancedAI
+    from rate_limiter import PRIORITY_BATCH, PRIORITY_INTERACTIVE, RateLimitScheduler
+    from response_generator import BusinessResponseGenerator
+    from routing import RoutingPolicy
+
+    limit_rps = 20
+    calls_per_priority = 100
+    server, port = start_openai_stand_in(args.latency_ms or 50.0, rate_limit_rps=limit_rps)
+    base_url = f"http://127.0.0.1:{port}/v1"
+    generator = BusinessResponseGenerator(os.path.join(BASE_DIR, 'business_response_model'), deterministic=True)
+    logging.getLogger('enhanced_ai_integration').setLevel(logging.CRITICAL)
+    counter = iter(range(10 ** 9))
+
+    def run(scheduler):
+        def make_ai(priority):
+            return EnhancedAI('stand-in-key', response_generator=generator, hedge=False, scheduler=scheduler,
+                              routing=RoutingPolicy(enabled=False),
+                              priority=priority, base_url=base_url, circuit_breaker=CircuitBreaker(min_calls=10 ** 9))
+
+        interactive, batch = make_ai(PRIORITY_INTERACTIVE), make_ai(PRIORITY_BATCH)
+
+        def one(ai):
+            started = time.perf_counter()
+            source = ai.generate_enhanced_response("How do I get funding for my startup?",
+                                                   {'stage': next(counter)}, budget=20.0)['source']
+            return ai.priority, (time.perf_counter() - started) * 1000, source
+
+        # The batch job queues up first; chat arriving behind it should still go first
+        jobs = [batch] * calls_per_priority + [interactive] * calls_per_priority
+        with ThreadPoolExecutor(len(jobs)) as pool:
+            results = list(pool.map(one, jobs))
+
+        rows = []
+        for priority, label in ((PRIORITY_INTERACTIVE, 'chat'), (PRIORITY_BATCH, 'batch')):
+            latencies = sorted(ms for p, ms, _ in results if p == priority)
+            rows.append({
+                'label': label,
+                'p50_ms': latencies[len(latencies) // 2],
+                'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+                'fallbacks': sum(1 for p, _, source in results if p == priority and source != 'openai_enhanced')
+            })
+        return rows
+
+    rows = []
+    failures = []
+    for name, scheduler in (('unpaced', RateLimitScheduler(0, 0, max_retries=0)),
+                            ('scheduled', RateLimitScheduler(limit_rps * 60, 0))):
+        for row in run(scheduler):
+            label = row.pop('label')
+            rows.append({'name': f"{name}, {label}", **row})
+        if name == 'scheduled':
+            stats = scheduler.stats()
+            chat, batch = rows[-2], rows[-1]
+            if chat['fallbacks'] or batch['fallbacks']:
+                failures.append(f"{chat['fallbacks'] + batch['fallbacks']} fallbacks despite scheduling")
+            if chat['p50_ms'] >= batch['p50_ms']:
+                failures.append("chat did not overtake the queued batch job")
+    server.terminate()
+
+    print_table(f"{2 * calls_per_priority} concurrent calls, stand-in limited to {limit_rps} requests/s", rows)
+    print(f"\nScheduler: throttled={stats['throttled']} retries={stats['retries']} "
+          f"max_queue_depth={stats['max_queue_depth']}")
+    print(f"  wait_ms_histogram: {stats['wait_ms_histogram']}")
+    print(f"  queue_depth_histogram: {stats['queue_depth_histogram']}")
+    if failures:
+        print("\nRate-limit check failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+def bench_stand_in(args) -> None:
+    """Seeded fault injection: InnoStartAI against stand-ins with lognormal latency and a 20% error rate"""
+    import logging
+    sys.path.append(os.path.join(BASE_DIR, '..', 'python'))
+    from ai_integration import InnoStartAI
+    from openai_stand_in import CANNED_IDEAS, CANNED_MARKET_ANALYSIS
+
+    logging.getLogger('ai_integration').setLevel(logging.CRITICAL)
+    error_rate = 0.2
+    calls = 100
+    canned_titles = [idea['title'] for idea in CANNED_IDEAS]
+
+    def run(seed):
+        server, port = start_openai_stand_in(args.latency_ms or 30.0, latency_distribution='lognormal',
+                                             latency_spread=0.8, error_rate=error_rate, seed=seed)
+        ai = InnoStartAI('stand-in-key', base_url=f"http://127.0.0.1:{port}/v1")
+        outcomes = []
+        latencies = []
+        for i in range(calls):
+            started = time.perf_counter()
+            if i % 2:
+                analysis = ai.analyze_market_opportunity(f"Idea {i}", 'Musanze')
+                outcomes.append(analysis == CANNED_MARKET_ANALYSIS)
+            else:
+                ideas = ai.generate_business_ideas('Musanze', [f"interest {i}"], 'medium')
+                outcomes.append([idea['title'] for idea in ideas] == canned_titles)
+            latencies.append((time.perf_counter() - started) * 1000)
+        server.terminate()
+        latencies.sort()
+        return outcomes, {
+            'p50_ms': latencies[len(latencies) // 2],
+            'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+            'canned_parsed': sum(outcomes),
+            'fallbacks': calls - sum(outcomes)
+        }
+
+    rows = []
+    failures = []
+    first, row = run(seed=7)
+    rows.append({'name': 'seed 7', **row})
+    second, row = run(seed=7)
+    rows.append({'name': 'seed 7 again', **row})
+    _, row = run(seed=8)
+    rows.append({'name': 'seed 8', **row})
+
+    if first != second:
+        failures.append("the same seed gave a different fallback sequence")
+    if abs(rows[0]['fallbacks'] / calls - error_rate) > 0.1:
+        failures.append(f"{rows[0]['fallbacks']} fallbacks in {calls} calls at a {error_rate:.0%} error rate")
+
+    print_table(f"{calls} sequential InnoStartAI calls, lognormal latency, {error_rate:.0%} injected errors", rows)
+    if failures:
+        print("\nStand-in check failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+def legacy_financial_projections(business_data: Dict) -> Dict:
+    """generate_financial_projections as it was: one Python loop iteration and dict per month"""
+    monthly_revenue = business_data.get('monthly_revenue', 0)
+    growth_rate = business_data.get('growth_rate', 0.05)
+    monthly_expenses = business_data.get('monthly_expenses', 0)
+    initial_investment = business_data.get('initial_investment', 0)
+    projection_months = business_data.get('projection_months', 12)
+
+    projections = {'monthly_data': [], 'total_revenue': 0, 'total_expenses': 0, 'net_profit': 0,
+                   'break_even_month': None, 'roi': 0}
+    current_revenue = monthly_revenue
+    cumulative_profit = -initial_investment
+    for month in range(1, projection_months + 1):
+        monthly_profit = current_revenue - monthly_expenses
+        cumulative_profit += monthly_profit
+        projections['monthly_data'].append({'month': month, 'revenue': current_revenue,
+                                            'expenses': monthly_expenses, 'profit': monthly_profit,
+                                            'cumulative_profit': cumulative_profit})
+        projections['total_revenue'] += current_revenue
+        projections['total_expenses'] += monthly_expenses
+        if projections['break_even_month'] is None and cumulative_profit >= 0:
+            projections['break_even_month'] = month
+        current_revenue *= (1 + growth_rate)
+    projections['net_profit'] = projections['total_revenue'] - projections['total_expenses'] - initial_investment
+    if initial_investment > 0:
+        projections['roi'] = (projections['net_profit'] / initial_investment) * 100
+    return projections
+
+
+def _projections_match(expected: Dict, actual: Dict) -> bool:
+    def close(a, b):
+        return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+    return (expected['break_even_month'] == actual['break_even_month']
+            and all(close(expected[key], actual[key]) for key in ('total_revenue', 'total_expenses', 'net_profit', 'roi'))
+            and len(expected['monthly_data']) == len(actual['monthly_data'])
+            and all(close(a[key], b[key]) for a, b in zip(expected['monthly_data'], actual['monthly_data'])
+                    for key in ('revenue', 'expenses', 'profit', 'cumulative_profit')))
+
+
+def bench_projections(args) -> None:
+    """Financial projections for 1, 100 and 10k parameter sets: the month loop against the array engine"""
+    import random
+    sys.path.append(os.path.join(BASE_DIR, '..', 'python'))
+    from ai_integration import InnoStartAI
+    from financial_projections import monthly_views, project_records
+
+    ai = InnoStartAI(openai_api_key='')
+    rng = random.Random(7)
+    # Musanze-sized businesses (RWF); a few with no growth or no investment
+    parameter_sets = [{'monthly_revenue': rng.randrange(100_000, 3_000_000, 1000),
+                       'growth_rate': rng.choice((0.0, rng.uniform(-0.02, 0.12))),
+                       'monthly_expenses': rng.randrange(80_000, 2_500_000, 1000),
+                       'initial_investment': rng.choice((0, rng.randrange(500_000, 50_000_000, 1000))),
+                       'projection_months': 60} for _ in range(max(args.sizes))]
+    parameter_sets[0] = {'monthly_revenue': 5000, 'growth_rate': 0, 'monthly_expenses': 3000,
+                         'initial_investment': 10000, 'projection_months': 60}
+
+    mismatches = [i for i, data in enumerate(parameter_sets[:2000])
+                  if not _projections_match(legacy_financial_projections(data), ai.generate_financial_projections(data))]
+    batch = monthly_views(project_records(parameter_sets[:2000]))
+    mismatches += [i for i, data in enumerate(parameter_sets[:2000])
+                   if not _projections_match(legacy_financial_projections(data), batch[i])]
+
+    rows = []
+    for size in args.sizes:
+        sets = parameter_sets[:size]
+        repeat = args.repeat if size <= 1000 else max(1, args.repeat // 2)
+        rows.append({'name': f'{size} x 60 months, loop',
+                     **time_call(lambda: [legacy_financial_projections(data) for data in sets], repeat)})
+        rows.append({'name': f'{size} x 60 months, arrays',
+                     **time_call(lambda: ai.generate_financial_projections_batch(sets), args.repeat)})
+        rows.append({'name': f'{size} x 60 months, dicts',
+                     **time_call(lambda: ai.generate_financial_projections_batch(sets, as_dicts=True), repeat)})
+    print_table("Financial projections, 60-month horizon", rows)
+    if mismatches:
+        print(f"\n{len(mismatches)} projections differ from the month loop, first at parameter set {mismatches[0]}")
+        sys.exit(1)
+
+
+def bench_risk(args) -> None:
+    """Monte Carlo paths per second on one core and across a process pool, with bounded memory and seeded runs"""
+    import tracemalloc
+    import numpy as np
+    from risk_simulation import RiskSimulation, business_distribution, simulate_paths
+
+    distribution = business_distribution('Eco-lodges')
+    simulation = RiskSimulation(distribution)
+    failures = []
+
+    rows = []
+    for paths in args.sizes:
+        tracemalloc.start()
+        result = simulation.run(paths, seed=1)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        rows.append({'name': f'{paths} paths, 1 process', 'paths_per_s': result['paths_per_s'],
+                     'elapsed_ms': result['elapsed_s'] * 1000, 'peak_mb': peak / 2 ** 20})
+    workers = max(2, os.cpu_count() or 1)
+    for count in sorted({2, workers}):
+        result = simulation.run(max(args.sizes), seed=1, workers=count)
+        rows.append({'name': f'{max(args.sizes)} paths, {count} processes', 'paths_per_s': result['paths_per_s'],
+                     'elapsed_ms': result['elapsed_s'] * 1000})
+    print_table(f"Risk simulation, Eco-lodges, 60 months, chunks of {simulation.chunk_size} "
+                f"({os.cpu_count()} CPUs)", rows)
+
+    # Seeded runs repeat exactly, serially or in a pool; unseeded runs report a seed that repeats them
+    reference = simulation.run(100_000, seed=7)
+    pooled = simulation.run(100_000, seed=7, workers=2)
+    unseeded = simulation.run(100_000)
+    replayed = simulation.run(100_000, seed=unseeded['seed'])
+    keys = ('cumulative_profit_bands', 'break_even_probability', 'value_at_risk', 'expected_shortfall')
+    if any(reference[key] != pooled[key] for key in keys):
+        failures.append("seeded run differs between 1 and 2 processes")
+    if any(unseeded[key] != replayed[key] for key in keys):
+        failures.append("unseeded run does not repeat from its reported seed")
+
+    # Histogram percentiles and VaR against exact ones over the same paths
+    cumulative_profit = np.concatenate([
+        simulate_paths(distribution, simulation.assumptions, size, simulation.months, np.random.default_rng(seed))[0]
+        for size, seed in zip([simulation.chunk_size] * 10, np.random.SeedSequence(7).spawn(10))])
+    spread = np.percentile(cumulative_profit, 95, axis=0) - np.percentile(cumulative_profit, 5, axis=0)
+    error = max(float(np.max(np.abs(np.array(band) - np.percentile(cumulative_profit, float(name[1:]), axis=0))
+                             / spread)) for name, band in reference['cumulative_profit_bands'].items())
+    exact_var = -np.percentile(cumulative_profit[:, -1], 5)
+    print(f"\nPercentile bands within {error:.3%} of the 5-95 spread; "
+          f"95% VaR {reference['value_at_risk']['0.95']:,.0f} RWF (exact {exact_var:,.0f}); "
+          f"P(break-even by month 36) {reference['break_even_probability'][35]:.1%}")
+    if error > 0.005:
+        failures.append(f"percentile bands off by {error:.2%} of the spread")
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+# Cumulative import time budget (ms) per entry point, and the snippet serving its
+# greeting/help/menu path, which must not pull in any of HEAVY_MODULES
+IMPORT_BUDGETS = {
+    'musanze_api': (100, "from musanze_api import build_result, MusanzeSmartModel; "
+                         "model = MusanzeSmartModel.load_or_train({dataset!r}); "
+                         "[build_result(model, m) for m in ('hello', 'help', 'hi there')]"),
+    'api_integration': (100, None),
+    'ai_chat_interface': (50, "from ai_chat_interface import build_result; "
+                              "[build_result(m, i) for m, i in (('hello', None), ('help', 'help'), ('menu', None))]"),
+}
+HEAVY_MODULES = ('pandas', 'numpy', 'sklearn', 'joblib', 'requests')
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module in a fresh interpreter, from -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            cwd=BASE_DIR, check=True, capture_output=True, text=True)
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        fields = [field.strip() for field in line.split('|')]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"No importtime entry for {module}")
+
+
+def bench_importtime(args) -> None:
+    """Check each entry point's import time budget and that its menu path stays stdlib-only"""
+    rows = []
+    failures = []
+    for module, (budget_ms, menu_path) in IMPORT_BUDGETS.items():
+        elapsed_ms = min(import_time_ms(module) for _ in range(args.repeat))
+        row = {'name': module, 'import_ms': elapsed_ms, 'budget_ms': float(budget_ms)}
+        if elapsed_ms > budget_ms:
+            failures.append(f"{module} imports in {elapsed_ms:.1f} ms (budget {budget_ms} ms)")
+
+        if menu_path:
+            code = (f"import sys; sys.path.insert(0, {BASE_DIR!r}); "
+                    + menu_path.format(dataset=DATASET_PATH)
+                    + f"; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+            output = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR, check=True,
+                                    capture_output=True, text=True).stdout
+            loaded = output.strip().splitlines()[-1] if output.strip() else ''
+            row['menu_heavy_imports'] = loaded or 'none'
+            if loaded:
+                failures.append(f"{module} menu path imports {loaded}")
+        rows.append(row)
+
+    print_table("Entry point import time (-X importtime, cumulative)", rows)
+    if failures:
+        print("\nImport budget exceeded:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+BENCHMARKS = {
+    'artifact': bench_artifact,
+    'batch': bench_batch,
+    'budget': bench_budget,
+    'cards': bench_cards,
+    'cold-start': bench_cold_start,
+    'disk-cache': bench_disk_cache,
+    'enrichment': bench_enrichment,
+    'fanout': bench_fanout,
+    'http-pool': bench_http_pool,
+    'importtime': bench_importtime,
+    'matcher': bench_matcher,
+    'progressive': bench_progressive,
+    'projections': bench_projections,
+    'prompt': bench_prompt,
+    'rate-limit': bench_rate_limit,
+    'risk': bench_risk,
+    'routing': bench_routing,
+    'semantic-cache': bench_semantic_cache,
+    'single-flight': bench_single_flight,
+    'stand-in': bench_stand_in,
+    'stream': bench_stream,
+    'train': bench_train,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='InnoStart ML benchmarks')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS), help='Benchmark to run')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions per measurement')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 1000000],
+                        help='Dataset sizes in rows for size-scaling benchmarks')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32, 1000, 100000],
+                        help='Batch sizes for batch inference benchmarks')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent callers for HTTP benchmarks')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Stand-in server latency per request')
+    parser.add_argument('--token-delay-ms', type=float, default=20.0,
+                        help='Stand-in delay between streamed tokens')
+
+    args = parser.parse_args()
+    # Upstream call counts and latencies must not be served from the host-wide result cache
+    os.environ.setdefault('INNOSTART_AI_CACHE_PATH', '')
+    # ...nor paced by the default account limits; benchmarks that need pacing bring their own scheduler
+    os.environ.setdefault('INNOSTART_OPENAI_RPM', '0')
+    os.environ.setdefault('INNOSTART_OPENAI_TPM', '0')
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+InnoStart Circuit Breaker
+Stops calling a slow or failing upstream: trips open on the error rate or p95
+latency of recent calls, lets a single probe through after a cooldown, and
+closes again once the probe succeeds
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Error-rate / p95-latency breaker over a sliding window of recent calls"""
+
+    def __init__(self, window: int = 50, min_calls: int = 10, max_error_rate: float = 0.5,
+                 max_p95_latency: float = 10.0, cooldown: float = 30.0):
+        self.window = window
+        self.min_calls = min_calls
+        self.max_error_rate = max_error_rate
+        self.max_p95_latency = max_p95_latency
+        self.cooldown = cooldown
+
+        self.state = CLOSED
+        self._calls = deque(maxlen=window)  # (succeeded, latency seconds)
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+        self.trips = 0
+        self.rejected = 0
+        self.last_trip_reason = None
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; counts a rejection when it may not"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now - self._opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probe_started = None
+
+            if self.state == CLOSED:
+                return True
+            # Half-open lets one probe through; a probe that never reports back expires after the cooldown
+            if self.state == HALF_OPEN and (self._probe_started is None or now - self._probe_started >= self.cooldown):
+                self._probe_started = now
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record(self, succeeded: bool, latency: float) -> None:
+        """Report the outcome of an upstream call"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if succeeded and latency < self.max_p95_latency:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip('probe failed')
+                return
+
+            self._calls.append((succeeded, latency))
+            if self.state != CLOSED or len(self._calls) < self.min_calls:
+                return
+
+            error_rate = self._error_rate()
+            p95 = self._p95_latency()
+            if error_rate >= self.max_error_rate:
+                self._trip(f"error rate {error_rate:.0%}")
+            elif p95 >= self.max_p95_latency:
+                self._trip(f"p95 latency {p95:.2f}s")
+
+    def _trip(self, reason: str) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.trips += 1
+        self.last_trip_reason = reason
+
+    def _error_rate(self) -> float:
+        return sum(1 for succeeded, _ in self._calls if not succeeded) / len(self._calls)
+
+    def _p95_latency(self) -> float:
+        latencies = sorted(latency for _, latency in self._calls)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'state': self.state,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'last_trip_reason': self.last_trip_reason,
+                'window_calls': len(self._calls),
+                'error_rate': self._error_rate() if self._calls else 0.0,
+                'p95_latency': self._p95_latency() if self._calls else 0.0
+            }
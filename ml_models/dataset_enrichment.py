@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+InnoStart Dataset Enrichment
+Offline batch job that writes richer per-row advice for the Musanze dataset
+through EnhancedAI: bounded concurrency, identical inputs asked once, and an
+append-only side file that doubles as the checkpoint, so an interrupted run
+resumes where it stopped. The serving path reads the side file locally.
+
+Usage: python dataset_enrichment.py [--concurrency 8] [--limit N] [--output PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import concurrent.futures
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from musanze_vocabulary import DEFAULT_DATASET_PATH
+from ttl_cache import canonical_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+# Rows with the same values here get the same advice, so each combination is asked once
+INPUT_COLUMNS = ('business_type', 'location', 'investment_range', 'target_market')
+
+
+def enrichment_path(csv_path: str = DEFAULT_DATASET_PATH) -> str:
+    """Side file next to the dataset: musanze_dataset.csv -> musanze_dataset_enrichment.jsonl"""
+    return os.path.splitext(csv_path)[0] + '_enrichment.jsonl'
+
+
+def enrichment_input(record: Dict) -> Tuple[str, Dict]:
+    """(question, context) sent to EnhancedAI for a dataset row"""
+    question = (f"What should I know before starting a {record['business_type']} business in "
+                f"{record['location']}, Musanze, with {record['investment_range']} to invest, "
+                f"selling to {record['target_market']}?")
+    context = {'business_type': record['business_type'], 'location': record['location'],
+               'target_market': record['target_market']}
+    return question, context
+
+
+def enrichment_key(record: Dict) -> str:
+    """Identity of a row's enrichment input; identical inputs share one entry"""
+    return canonical_hash({column: record[column] for column in INPUT_COLUMNS})
+
+
+def load_enrichments(path: str) -> Dict[str, str]:
+    """key -> text from a side file; a torn last line from an interrupted run is skipped"""
+    enrichments = {}
+    if not os.path.exists(path):
+        return enrichments
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            enrichments[entry['key']] = entry['text']
+    return enrichments
+
+
+def summary(text: str, max_chars: int = 200) -> str:
+    """First sentence of an enrichment, for one-line display"""
+    sentence = text.strip().split('\n')[0].split('. ')[0].rstrip('.')
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars].rstrip() + '…'
+
+
+def unique_inputs(records: List[Dict]) -> Dict[str, Dict]:
+    """First record per distinct enrichment input, by key, in dataset order"""
+    inputs = {}
+    for record in records:
+        inputs.setdefault(enrichment_key(record), record)
+    return inputs
+
+
+class DatasetEnricher:
+    """Runs EnhancedAI over distinct inputs with at most concurrency requests in flight
+
+    Each finished answer is appended to the side file and flushed at once, so the
+    file is the checkpoint. Failed or locally answered inputs are not written and
+    are retried on the next run.
+    """
+
+    def __init__(self, enhanced_ai, output_path: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 budget: Optional[float] = None):
+        self.enhanced_ai = enhanced_ai
+        self.output_path = output_path
+        self.concurrency = concurrency
+        self.budget = budget
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _enrich(self, record: Dict) -> Optional[str]:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            question, context = enrichment_input(record)
+            response = self.enhanced_ai.generate_enhanced_response(question, context, budget=self.budget)
+            return response['response'] if response.get('source') == 'openai_enhanced' else None
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def run(self, records: List[Dict], limit: Optional[int] = None) -> Dict:
+        """Enrich every distinct input of records not yet in the side file; returns run statistics"""
+        started = time.perf_counter()
+        inputs = unique_inputs(records)
+        done = load_enrichments(self.output_path)
+        pending = [(key, record) for key, record in inputs.items() if key not in done]
+        if limit is not None:
+            pending = pending[:limit]
+        stats = {'rows': len(records), 'unique_inputs': len(inputs), 'resumed': len(done),
+                 'enriched': 0, 'failed': 0}
+
+        directory = os.path.dirname(os.path.abspath(self.output_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.output_path, 'a+', encoding='utf-8') as output, \
+                concurrent.futures.ThreadPoolExecutor(self.concurrency) as executor:
+            # Terminate a line torn by an interrupted run, so new entries start on their own line
+            if output.tell() > 0:
+                output.seek(output.tell() - 1)
+                if output.read(1) != '\n':
+                    output.write('\n')
+            # Keep exactly concurrency requests in flight; only this thread writes the file
+            queue: Iterator = iter(pending)
+            futures = {}
+            for key, record in queue:
+                futures[executor.submit(self._enrich, record)] = key
+                if len(futures) >= self.concurrency:
+                    break
+            while futures:
+                finished, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    key = futures.pop(future)
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        logger.warning(f"Enrichment failed: {e}")
+                        text = None
+                    if text is None:
+                        stats['failed'] += 1
+                    else:
+                        output.write(json.dumps({'key': key, 'text': text}, ensure_ascii=False) + '\n')
+                        output.flush()
+                        stats['enriched'] += 1
+                    if (stats['enriched'] + stats['failed']) % 50 == 0:
+                        logger.info(f"Enriched {stats['enriched']}/{len(pending)} ({stats['failed']} failed)")
+                    following = next(queue, None)
+                    if following is not None:
+                        futures[executor.submit(self._enrich, following[1])] = following[0]
+
+        stats['elapsed_s'] = time.perf_counter() - started
+        stats['requests_per_s'] = (stats['enriched'] + stats['failed']) / stats['elapsed_s'] if pending else 0.0
+        stats['max_in_flight'] = self.max_in_flight
+        return stats
+
+
+def main():
+    # Configured here, not at import, so the serving path that reads the side file keeps its own logging
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description='Enrich the Musanze dataset responses through EnhancedAI')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET_PATH, help='Dataset CSV')
+    parser.add_argument('--output', default=None, help='Side file (default: next to the dataset)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Requests in flight')
+    parser.add_argument('--limit', type=int, default=None, help='Enrich at most this many inputs this run')
+    parser.add_argument('--budget', type=float, default=60.0, help='Seconds allowed per request')
+
+    args = parser.parse_args()
+
+    import pandas as pd
+    from enhanced_ai_integration import EnhancedAI
+    from rate_limiter import PRIORITY_BATCH
+    from routing import RoutingPolicy
+
+    enhanced_ai = EnhancedAI(hedge=False, priority=PRIORITY_BATCH, routing=RoutingPolicy(enabled=False))
+    if not enhanced_ai.openai_api_key:
+        logger.error("OPENAI_API_KEY is not set; nothing to enrich with")
+        sys.exit(1)
+
+    records = pd.read_csv(args.dataset, usecols=list(INPUT_COLUMNS)).to_dict('records')
+    enricher = DatasetEnricher(enhanced_ai, args.output or enrichment_path(args.dataset), args.concurrency,
+                               args.budget)
+    print(json.dumps(enricher.run(records, args.limit), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+InnoStart Disk Cache
+Cross-process cache of remote AI results: one local SQLite file in WAL mode,
+with per-entry TTL, an LRU size cap and an in-process hot layer in front
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from ttl_cache import LRUTTLCache, canonical_hash
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'remote_ai_cache.sqlite3')
+DEFAULT_MAX_ENTRIES = int(os.getenv('INNOSTART_AI_CACHE_MAX_ENTRIES', '50000'))
+DEFAULT_TTL = float(os.getenv('INNOSTART_AI_CACHE_TTL', '86400'))
+
+# A hit refreshes its entry's last-access time at most this often, so most hits never write
+TOUCH_INTERVAL = 60.0
+# Writes between eviction passes in each process; the size cap is soft by that much
+EVICT_EVERY = 128
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at);
+"""
+
+
+def request_key(payload: Dict) -> str:
+    """Canonical key of a chat completion request: model, prompt hash and the other parameters"""
+    params = {k: v for k, v in payload.items() if k not in ('model', 'messages', 'stream')}
+    return f"{payload.get('model')}:{canonical_hash(payload.get('messages'))}:{canonical_hash(params)}"
+
+
+class DiskCache:
+    """JSON values in a SQLite file shared by every process on the host
+
+    Each thread gets its own connection (reopened after a fork). WAL mode lets
+    readers proceed while one process writes; writers wait on busy_timeout.
+    Hits are served from a small in-process LRU first, whose entries live at
+    most hot_ttl seconds so other processes' updates show up quickly.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: Optional[float] = DEFAULT_TTL, hot_size: int = 1024, hot_ttl: float = 30.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hot = LRUTTLCache(hot_size, hot_ttl) if hot_size > 0 else None
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes_since_evict = 0
+
+        self.hot_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            # Autocommit: every statement is its own short transaction
+            connection = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Cached value for key, or default when missing or expired"""
+        now = time.time()
+        if self.hot is not None:
+            entry = self.hot.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._count('hot_hits')
+                return entry[0]
+
+        try:
+            connection = self._connection()
+            row = connection.execute('SELECT value, expires_at, accessed_at FROM entries WHERE key = ?',
+                                     (key,)).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self._count('misses')
+                return default
+            if now - row[2] >= TOUCH_INTERVAL:
+                connection.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+        except sqlite3.Error as e:
+            # A cache that cannot be read is a miss, never a failed request
+            logger.warning(f"Disk cache read failed: {e}")
+            self._count('errors')
+            return default
+
+        value = json.loads(row[0])
+        if self.hot is not None:
+            self.hot.set(key, (value, row[1]))
+        self._count('hits')
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value for every process to reuse"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        try:
+            self._connection().execute(
+                'INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value, separators=(',', ':')), expires_at, now)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed: {e}")
+            self._count('errors')
+            return
+
+        if self.hot is not None:
+            self.hot.set(key, (value, expires_at))
+        with self._lock:
+            self.writes += 1
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= EVICT_EVERY
+            if evict:
+                self._writes_since_evict = 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently used beyond max_entries; returns how many went"""
+        connection = None
+        try:
+            connection = self._connection()
+            connection.execute('BEGIN IMMEDIATE')
+            removed = connection.execute('DELETE FROM entries WHERE expires_at <= ?', (time.time(),)).rowcount
+            (count,) = connection.execute('SELECT COUNT(*) FROM entries').fetchone()
+            if count > self.max_entries:
+                removed += connection.execute(
+                    'DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed_at LIMIT ?)',
+                    (count - self.max_entries,)
+                ).rowcount
+            connection.execute('COMMIT')
+        except sqlite3.Error as e:
+            if connection is not None and connection.in_transaction:
+                connection.execute('ROLLBACK')
+            logger.warning(f"Disk cache eviction failed: {e}")
+            self._count('errors')
+            return 0
+
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        self._connection().execute('DELETE FROM entries')
+        if self.hot is not None:
+            self.hot.clear()
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Hit, miss and write counters of this process"""
+        with self._lock:
+            lookups = self.hot_hits + self.hits + self.misses
+            return {
+                'path': self.path,
+                'max_entries': self.max_entries,
+                'hot_hits': self.hot_hits,
+                'hits': self.hits,
+                'misses': self.misses,
+                'writes': self.writes,
+                'evictions': self.evictions,
+                'errors': self.errors,
+                'hit_rate': (self.hot_hits + self.hits) / lookups if lookups else 0.0
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+# Stands in _caches for a path that could not be opened, so it is tried (and warned about) once
+_UNAVAILABLE = object()
+
+
+def get_disk_cache(path: Optional[str] = None) -> Optional[DiskCache]:
+    """Process-wide cache for path (default: INNOSTART_AI_CACHE_PATH); None when that is set empty"""
+    path = os.getenv('INNOSTART_AI_CACHE_PATH', DEFAULT_CACHE_PATH) if path is None else path
+    if not path:
+        return None
+    cache = _caches.get(path)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(path)
+            if cache is None:
+                try:
+                    cache = _caches[path] = DiskCache(path)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Disk cache unavailable at {path}: {e}")
+                    cache = _caches[path] = _UNAVAILABLE
+    return None if cache is _UNAVAILABLE else cache
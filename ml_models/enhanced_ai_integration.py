@@ -6,26 +6,92 @@ Combines trained ML model with OpenAI API for superior business responses
 
 import os
 import json
+import time
+import uuid
 import logging
-from typing import Dict, List, Optional, Tuple
-import requests
+import threading
+import concurrent.futures
+from typing import Dict, Iterator, List, Optional, Tuple
 from response_generator import BusinessResponseGenerator
-from kaggle_dataset_manager import KaggleDatasetManager
+from routing import LOCAL, REMOTE, RoutingPolicy
+from circuit_breaker import CircuitBreaker
+from disk_cache import DiskCache, get_disk_cache, request_key
+from http_client import DEFAULT_OPENAI_BASE_URL, PooledHTTPClient, get_client
+from prompt_builder import PromptTemplate, log_usage
+from rate_limiter import PRIORITY_INTERACTIVE, RateLimitScheduler, RateLimitTimeout, estimate_tokens, get_scheduler
+from semantic_cache import SemanticCache
+from single_flight import SingleFlight
+from ttl_cache import LRUTTLCache, canonical_hash
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Context keys the enhancement prompt uses, most relevant first (the last ones go first when trimming)
+ENHANCEMENT_CONTEXT_KEYS = ('business_type', 'location', 'budget', 'stage', 'experience', 'industry',
+                            'target_market', 'interests')
+
+ENHANCEMENT_PROMPT = PromptTemplate(
+    system="You are an expert business consultant AI that provides detailed, actionable advice for entrepreneurs and startup founders. Always be specific, practical, and encouraging.",
+    instructions="""
+    Enhance the current response: make it specific and actionable, add relevant examples and metrics or
+    benchmarks where appropriate, end with clear next steps, and keep a professional, encouraging tone.
+    Be concise and answer the question directly.
+    """,
+    fields=('question', 'current_response', 'category'),
+    context_keys=ENHANCEMENT_CONTEXT_KEYS,
+    trimmable=('current_response', 'question'),
+    max_tokens=400
+)
+
 class EnhancedAI:
     """Enhanced AI system combining ML model with OpenAI API"""
     
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(self, openai_api_key: Optional[str] = None,
+                 response_generator: Optional[BusinessResponseGenerator] = None,
+                 http_client: Optional[PooledHTTPClient] = None, timeout: float = 30.0,
+                 semantic_cache: Optional[SemanticCache] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, hedge: bool = True,
+                 hedge_workers: int = 32, upgrade_ttl: float = 600.0,
+                 result_cache: Optional[DiskCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None, priority: int = PRIORITY_INTERACTIVE,
+                 base_url: Optional[str] = None, prompt_budget: Optional[int] = None,
+                 routing: Optional[RoutingPolicy] = None):
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
-        self.base_url = "https://api.openai.com/v1"
-        
-        # Initialize components
-        self.response_generator = BusinessResponseGenerator()
-        self.dataset_manager = KaggleDatasetManager()
+        # Any OpenAI-compatible endpoint; defaults to OPENAI_BASE_URL, then the public API
+        self.base_url = (base_url or DEFAULT_OPENAI_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        # Prompt tokens per enhancement request; defaults to INNOSTART_PROMPT_TOKEN_BUDGET
+        self.prompt_budget = prompt_budget
+        self._http_client = http_client
+        # Completions shared with other processes and restarts; defaults to the host-wide disk cache
+        self._result_cache = result_cache
+        # Paces calls to the account's rate limits; batch jobs pass a lower priority (higher number)
+        self._scheduler = scheduler
+        self.priority = priority
+        
+        # Optional near-duplicate cache of OpenAI-enhanced answers
+        self.semantic_cache = semantic_cache
+        # Identical prompts already in flight share one OpenAI call
+        self.single_flight = single_flight or SingleFlight(timeout=timeout)
+        # Keeps menu intents and confidently classified questions local instead of waiting on OpenAI
+        self.routing = routing or RoutingPolicy()
+        # Skips OpenAI entirely while it is failing or slow
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # Hedged mode races the OpenAI call against the local answer and returns the latter when the budget runs out
+        self.hedge = hedge
+        self.hedge_workers = hedge_workers
+        self._hedge_executor = None
+        self._metrics_lock = threading.Lock()
+        self.metrics = {'openai_calls': 0, 'openai_enhanced': 0, 'budget_expired': 0, 'breaker_skipped': 0,
+                        'input_tokens': 0, 'output_tokens': 0}
+        # In-flight and finished background enhancements by response ID, for two-phase responses
+        self.pending_upgrades = LRUTTLCache(maxsize=10000, ttl=upgrade_ttl)
+        
+        # Initialize components (a warm generator can be shared by long-running services)
+        self.response_generator = response_generator or BusinessResponseGenerator()
+        self._dataset_manager = None
         
         # Business context database
         self.business_context = self._load_business_context()
@@ -33,6 +99,35 @@ class EnhancedAI:
         # Response templates for different scenarios
         self.response_templates = self._load_response_templates()
     
+    @property
+    def http_client(self) -> PooledHTTPClient:
+        """Keep-alive client for the OpenAI API, shared with other integrations in this process"""
+        if self._http_client is None:
+            self._http_client = get_client(self.base_url, self.openai_api_key)
+        return self._http_client
+    
+    @property
+    def scheduler(self) -> RateLimitScheduler:
+        """Rate-limit scheduler shared by every caller using this API key in the process"""
+        if self._scheduler is None:
+            self._scheduler = get_scheduler(self.base_url, self.openai_api_key)
+        return self._scheduler
+    
+    @property
+    def result_cache(self) -> Optional[DiskCache]:
+        """Cross-process cache of OpenAI completions, opened on first use"""
+        if self._result_cache is None:
+            self._result_cache = get_disk_cache()
+        return self._result_cache
+    
+    @property
+    def dataset_manager(self):
+        """Kaggle dataset manager, created on first use since only training needs it"""
+        if self._dataset_manager is None:
+            from kaggle_dataset_manager import KaggleDatasetManager
+            self._dataset_manager = KaggleDatasetManager()
+        return self._dataset_manager
+    
     def _load_business_context(self) -> Dict:
         """Load business context and knowledge base"""
         return {
@@ -90,74 +185,433 @@ class EnhancedAI:
             }
         }
     
-    def generate_enhanced_response(self, question: str, context: Optional[Dict] = None) -> Dict:
-        """Generate enhanced response using ML model and OpenAI API"""
+    def generate_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                   budget: Optional[float] = None) -> Dict:
+        """Generate enhanced response using ML model and OpenAI API
+        
+        budget is how many seconds the caller can wait for the OpenAI enhancement
+        (defaults to the client timeout); past it the local answer is returned.
+        """
         
         # Get ML model prediction
+        started = time.monotonic()
         ml_response = self.response_generator.generate_response(question, context)
         
-        # Enhance with OpenAI if available
+        # Enhance with OpenAI if available and the local answer is not good enough on its own
         if self.openai_api_key:
-            enhanced_response = self._enhance_with_openai(question, ml_response, context)
+            route, reason = self.routing.route(ml_response, context)
+            if route == LOCAL:
+                enhanced_response = dict(self._enhance_with_context(question, ml_response, context), route=reason)
+            else:
+                enhanced_response = self._enhance_remote(question, ml_response, context, budget)
+            self.routing.record(route, time.monotonic() - started)
         else:
             enhanced_response = self._enhance_with_context(question, ml_response, context)
         
         return enhanced_response
     
-    def _enhance_with_openai(self, question: str, ml_response: Dict, context: Optional[Dict] = None) -> Dict:
-        """Enhance response using OpenAI API"""
+    def _enhance_remote(self, question: str, ml_response: Dict, context: Optional[Dict],
+                        budget: Optional[float]) -> Dict:
+        """OpenAI-enhanced answer, unless the semantic cache has one or the circuit breaker is open"""
+        vector = self._question_vector(question)
+        if vector is not None:
+            cached = self.semantic_cache.get(vector, ml_response['category'], context)
+            if cached is not None:
+                answer, similarity = cached
+                return dict(answer, timestamp=ml_response['timestamp'], cache_similarity=similarity)
+        
+        budget = self.timeout if budget is None else budget
+        if not self.circuit_breaker.allow():
+            self._count('breaker_skipped')
+            return self._enhance_with_context(question, ml_response, context)
+        
+        if self.hedge:
+            enhanced_response = self._enhance_hedged(question, ml_response, context, budget, vector)
+        else:
+            enhanced_response = self._enhance_with_openai(question, ml_response, context, budget)
+            self._remember(vector, ml_response, context, enhanced_response)
+        if enhanced_response['source'] == 'openai_enhanced':
+            self._count('openai_enhanced')
+        return enhanced_response
+    
+    def stream_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                 budget: Optional[float] = None) -> Iterator[Dict]:
+        """Generate enhanced response as a stream of events
+        
+        Yields a 'start' event with the category, 'delta' events with text as OpenAI
+        produces it, then a 'done' event carrying the full response. Answers that are
+        not streamed from OpenAI (no API key, cache hit, breaker open, no first token
+        within budget) arrive as a single delta.
+        """
+        
+        # Get ML model prediction
+        started = time.monotonic()
+        ml_response = self.response_generator.generate_response(question, context)
+        yield {
+            'event': 'start',
+            'category': ml_response['category'],
+            'confidence': ml_response['confidence'],
+            'timestamp': ml_response['timestamp']
+        }
+        
+        response = None
+        vector = None
+        route, reason = self.routing.route(ml_response, context) if self.openai_api_key else (LOCAL, None)
+        if not self.openai_api_key:
+            response = self._enhance_with_context(question, ml_response, context)
+        elif route == LOCAL:
+            response = dict(self._enhance_with_context(question, ml_response, context), route=reason)
+        else:
+            vector = self._question_vector(question)
+            cached = self.semantic_cache.get(vector, ml_response['category'], context) if vector is not None else None
+            if cached is not None:
+                answer, similarity = cached
+                response = dict(answer, timestamp=ml_response['timestamp'], cache_similarity=similarity)
+            elif not self.circuit_breaker.allow():
+                self._count('breaker_skipped')
+                response = self._enhance_with_context(question, ml_response, context)
+        
+        if response is None:
+            budget = self.timeout if budget is None else budget
+            response = yield from self._stream_with_openai(question, ml_response, context, budget)
+            if response['source'] == 'openai_enhanced':
+                self._count('openai_enhanced')
+                if not response.get('truncated'):
+                    self._remember(vector, ml_response, context, response)
+        else:
+            yield {'event': 'delta', 'text': response['response']}
+        
+        if self.openai_api_key:
+            self.routing.record(route, time.monotonic() - started)
+        yield {'event': 'done', 'response': response}
+    
+    def _stream_with_openai(self, question: str, ml_response: Dict, context: Optional[Dict],
+                            budget: float) -> Iterator[Dict]:
+        """Relay a streamed completion as delta events; returns the final response dict
+        
+        budget bounds the wait for the first token (and each gap after it); without a
+        first token the local answer is sent instead.
+        """
+        data = self._completion_request(question, ml_response, context, stream=True)
+        cached = self.result_cache.get(request_key(data)) if self.result_cache is not None else None
+        if cached is not None:
+            text = cached['choices'][0]['message']['content']
+            yield {'event': 'delta', 'text': text}
+            return self._openai_answer(text, ml_response)
+        
+        self._count('openai_calls')
+        started = time.monotonic()
+        chunks = []
         try:
-            # Create enhanced prompt
-            prompt = self._create_enhancement_prompt(question, ml_response, context)
-            
-            headers = {
-                "Authorization": f"Bearer {self.openai_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": "gpt-3.5-turbo",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert business consultant AI that provides detailed, actionable advice for entrepreneurs and startup founders. Always be specific, practical, and encouraging."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": 500,
-                "temperature": 0.7
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                enhanced_text = result['choices'][0]['message']['content']
-                
-                return {
-                    'response': enhanced_text,
-                    'category': ml_response['category'],
-                    'confidence': min(0.95, ml_response['confidence'] + 0.1),  # Boost confidence
-                    'timestamp': ml_response['timestamp'],
-                    'enhanced': True,
-                    'source': 'openai_enhanced'
-                }
+            response = self._post(data, budget, stream=True)
+            with response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"OpenAI API error: {response.status_code}")
+                for text in self._completion_deltas(response):
+                    if not chunks:
+                        # The breaker judges a stream by its time to first token
+                        self.circuit_breaker.record(True, time.monotonic() - started)
+                    chunks.append(text)
+                    yield {'event': 'delta', 'text': text}
+        except Exception as e:
+            if chunks:
+                logger.error(f"OpenAI stream broke off after {len(chunks)} chunks: {e}")
+                return dict(self._openai_answer(''.join(chunks), ml_response), truncated=True)
+            if not isinstance(e, RateLimitTimeout):
+                self.circuit_breaker.record(False, time.monotonic() - started)
+            if time.monotonic() - started >= budget:
+                self._count('budget_expired')
+                logger.warning(f"OpenAI stream produced no token within its {budget}s budget")
             else:
-                logger.error(f"OpenAI API error: {response.status_code}")
-                return self._enhance_with_context(question, ml_response, context)
-                
+                logger.error(f"Error streaming from OpenAI: {e}")
+        
+        if not chunks:
+            local_response = self._enhance_with_context(question, ml_response, context)
+            yield {'event': 'delta', 'text': local_response['response']}
+            return local_response
+        
+        text = ''.join(chunks)
+        # Stored in the non-streamed reply shape, so either mode can reuse it
+        result = {'choices': [{'message': {'role': 'assistant', 'content': text}}]}
+        self._count_tokens(data, result)
+        if self.result_cache is not None:
+            self.result_cache.set(request_key(data), result)
+        return self._openai_answer(text, ml_response)
+    
+    def _completion_deltas(self, response) -> Iterator[str]:
+        """Text chunks of a streamed chat completion (server-sent 'data:' lines up to [DONE])"""
+        for line in response.iter_lines():
+            if not line.startswith(b'data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == b'[DONE]':
+                return
+            delta = json.loads(payload)['choices'][0].get('delta', {})
+            if delta.get('content'):
+                yield delta['content']
+    
+    def start_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                budget: Optional[float] = None) -> Dict:
+        """Two-phase response, first phase: the local answer at once, tagged with a response_id
+        
+        When OpenAI enhancement applies it runs in the background and the answer has
+        upgrade_pending=True; get_enhanced_response(response_id) then fetches the upgrade.
+        """
+        
+        # Get ML model prediction
+        started = time.monotonic()
+        ml_response = self.response_generator.generate_response(question, context)
+        response_id = uuid.uuid4().hex
+        
+        route, reason = self.routing.route(ml_response, context) if self.openai_api_key else (LOCAL, None)
+        if route == LOCAL and reason:
+            response = dict(self._enhance_with_context(question, ml_response, context), route=reason,
+                            response_id=response_id, upgrade_pending=False)
+            self.routing.record(LOCAL, time.monotonic() - started)
+            return response
+        
+        if self.openai_api_key:
+            vector = self._question_vector(question)
+            cached = self.semantic_cache.get(vector, ml_response['category'], context) if vector is not None else None
+            if cached is not None:
+                answer, similarity = cached
+                self.routing.record(REMOTE, time.monotonic() - started)
+                return dict(answer, timestamp=ml_response['timestamp'], cache_similarity=similarity,
+                            response_id=response_id, upgrade_pending=False)
+            
+            if self.circuit_breaker.allow():
+                budget = self.timeout if budget is None else budget
+                future = self._submit_completion(question, ml_response, context, budget, vector)
+                # The remote answer's latency is the upgrade's, recorded once when it settles
+                future.add_done_callback(lambda f: self.routing.record(REMOTE, time.monotonic() - started))
+                # The last item marks the upgrade as counted, so polling it again does not count it twice
+                self.pending_upgrades.set(response_id, [future, ml_response, False])
+                return dict(self._enhance_with_context(question, ml_response, context),
+                            response_id=response_id, upgrade_pending=True)
+            self._count('breaker_skipped')
+            self.routing.record(REMOTE, time.monotonic() - started)
+        
+        return dict(self._enhance_with_context(question, ml_response, context),
+                    response_id=response_id, upgrade_pending=False)
+    
+    def get_enhanced_response(self, response_id: str, wait: float = 0.0) -> Dict:
+        """Two-phase response, second phase: the upgrade for a start_enhanced_response answer
+        
+        Waits up to wait seconds. status is 'ready' (response holds the enhanced answer),
+        'pending', or 'unavailable' when enhancement failed or the ID is unknown or expired.
+        """
+        entry = self.pending_upgrades.get(response_id)
+        if entry is None:
+            return {'response_id': response_id, 'status': 'unavailable', 'response': None}
+        
+        future, ml_response, _ = entry
+        try:
+            status_code, result = future.result(timeout=wait)
+        except concurrent.futures.TimeoutError:
+            return {'response_id': response_id, 'status': 'pending', 'response': None}
+        except Exception:
+            return {'response_id': response_id, 'status': 'unavailable', 'response': None}
+        
+        response = self._completion_response(status_code, result, ml_response)
+        if response is None:
+            return {'response_id': response_id, 'status': 'unavailable', 'response': None}
+        with self._metrics_lock:
+            if not entry[2]:
+                entry[2] = True
+                self.metrics['openai_enhanced'] += 1
+        return {'response_id': response_id, 'status': 'ready', 'response': dict(response, response_id=response_id)}
+    
+    def progressive_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                      budget: Optional[float] = None) -> Iterator[Dict]:
+        """Two-phase response as one stream of events
+        
+        Yields an 'answer' event with the local answer at once, an 'upgrade' event with
+        the enhanced answer if it arrives within budget, then 'done'.
+        """
+        answer = self.start_enhanced_response(question, context, budget)
+        response_id = answer['response_id']
+        yield {'event': 'answer', 'response_id': response_id, 'response': answer}
+        
+        if answer['upgrade_pending']:
+            upgrade = self.get_enhanced_response(response_id, wait=self.timeout if budget is None else budget)
+            if upgrade['status'] == 'ready':
+                yield {'event': 'upgrade', 'response_id': response_id, 'response': upgrade['response']}
+        
+        yield {'event': 'done', 'response_id': response_id}
+    
+    def _submit_completion(self, question: str, ml_response: Dict, context: Optional[Dict],
+                           budget: float, vector) -> concurrent.futures.Future:
+        """Start the OpenAI call in the background; the future resolves to (status code, body)
+        
+        budget only bounds how long callers wait on the future. The call itself gets the
+        client timeout (or budget, if longer), so an answer landing after the budget still
+        completes and is remembered.
+        """
+        deadline = time.monotonic() + max(budget, self.timeout)
+        data = self._completion_request(question, ml_response, context)
+        
+        def remote() -> Tuple[int, Optional[Dict]]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("Upstream timeout spent before the OpenAI call started")
+            return self._post_completion(data, remaining)
+        
+        future, leader = self.single_flight.submit(canonical_hash(data), remote, self._executor())
+        if leader:
+            # An answer landing after the budget still warms the semantic cache for the next asker
+            future.add_done_callback(lambda f: self._remember_completion(f, vector, ml_response, context))
+        return future
+    
+    def _enhance_hedged(self, question: str, ml_response: Dict, context: Optional[Dict],
+                        budget: float, vector) -> Dict:
+        """Run the OpenAI call in the background while building the local answer; return whichever the budget allows"""
+        deadline = time.monotonic() + budget
+        future = self._submit_completion(question, ml_response, context, budget, vector)
+        
+        local_response = self._enhance_with_context(question, ml_response, context)
+        try:
+            status_code, result = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except concurrent.futures.TimeoutError:
+            self._count('budget_expired')
+            return local_response
         except Exception as e:
             logger.error(f"Error enhancing with OpenAI: {e}")
+            return local_response
+        
+        return self._completion_response(status_code, result, ml_response) or local_response
+    
+    def _executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._hedge_executor is None:
+            with self._metrics_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=self.hedge_workers, thread_name_prefix='openai-hedge')
+        return self._hedge_executor
+    
+    def _remember(self, vector, ml_response: Dict, context: Optional[Dict], enhanced_response: Dict) -> None:
+        # Only real OpenAI answers are worth reusing; fallbacks are cheap to recompute
+        if vector is not None and enhanced_response.get('source') == 'openai_enhanced':
+            self.semantic_cache.set(vector, ml_response['category'], enhanced_response, context)
+    
+    def _remember_completion(self, future: concurrent.futures.Future, vector, ml_response: Dict,
+                             context: Optional[Dict]) -> None:
+        if future.exception() is None:
+            status_code, result = future.result()
+            if status_code == 200:
+                self._remember(vector, ml_response, context, self._completion_response(status_code, result, ml_response))
+    
+    def _count(self, metric: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            self.metrics[metric] += amount
+    
+    def _count_tokens(self, data: Dict, result: Dict) -> None:
+        """Log and total the prompt and completion tokens of an upstream call"""
+        tokens = log_usage('OpenAI enhancement', data, result)
+        self._count('input_tokens', tokens['input_tokens'])
+        self._count('output_tokens', tokens['output_tokens'])
+    
+    def enhancement_stats(self) -> Dict:
+        """OpenAI call, budget-expiry and breaker-skip counts plus routing, circuit breaker, scheduler and HTTP pool state"""
+        with self._metrics_lock:
+            stats = dict(self.metrics)
+        stats['routing'] = self.routing.stats()
+        stats['circuit_breaker'] = self.circuit_breaker.stats()
+        stats['scheduler'] = self.scheduler.stats()
+        stats['http_pool'] = self.http_client.stats()
+        return stats
+    
+    def _question_vector(self, question: str):
+        """TF-IDF row of the question for semantic cache lookups, or None when there is no cache"""
+        if self.semantic_cache is None or self.response_generator.vectorizer is None:
+            return None
+        return self.response_generator.vectorize([question])
+    
+    def _enhance_with_openai(self, question: str, ml_response: Dict, context: Optional[Dict] = None,
+                             budget: Optional[float] = None) -> Dict:
+        """Enhance response using OpenAI API, waiting at most budget seconds"""
+        budget = self.timeout if budget is None else budget
+        started = time.monotonic()
+        try:
+            data = self._completion_request(question, ml_response, context)
+            status_code, result = self.single_flight.do(canonical_hash(data), lambda: self._post_completion(data, budget),
+                                                         timeout=budget)
+            return (self._completion_response(status_code, result, ml_response)
+                    or self._enhance_with_context(question, ml_response, context))
+        except Exception as e:
+            if time.monotonic() - started >= budget:
+                self._count('budget_expired')
+                logger.warning(f"OpenAI enhancement exceeded its {budget}s budget: {e}")
+            else:
+                logger.error(f"Error enhancing with OpenAI: {e}")
             return self._enhance_with_context(question, ml_response, context)
     
+    def _completion_request(self, question: str, ml_response: Dict, context: Optional[Dict] = None,
+                            stream: bool = False) -> Dict:
+        """Chat completion payload enhancing the ML answer"""
+        return ENHANCEMENT_PROMPT.request(
+            {'question': question, 'current_response': ml_response['response'], 'category': ml_response['category']},
+            context, self.prompt_budget, stream=stream
+        )
+    
+    def _completion_response(self, status_code: int, result: Optional[Dict], ml_response: Dict) -> Optional[Dict]:
+        """Enhanced answer from a chat completion reply, or None when OpenAI returned an error"""
+        if status_code != 200:
+            logger.error(f"OpenAI API error: {status_code}")
+            return None
+        
+        return self._openai_answer(result['choices'][0]['message']['content'], ml_response)
+    
+    def _openai_answer(self, enhanced_text: str, ml_response: Dict) -> Dict:
+        return {
+            'response': enhanced_text,
+            'category': ml_response['category'],
+            'confidence': min(0.95, ml_response['confidence'] + 0.1),  # Boost confidence
+            'timestamp': ml_response['timestamp'],
+            'enhanced': True,
+            'source': 'openai_enhanced'
+        }
+    
+    def _post_completion(self, data: Dict, timeout: Optional[float] = None) -> Tuple[int, Optional[Dict]]:
+        """POST a chat completion; returns (status code, parsed body on success) so coalesced callers can share it
+        
+        Only the caller that actually makes the request reports to the circuit breaker
+        and counts as an OpenAI call. Successful completions are shared with other
+        processes through the result cache.
+        """
+        key = request_key(data) if self.result_cache is not None else None
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return 200, cached
+        
+        self._count('openai_calls')
+        started = time.monotonic()
+        try:
+            response = self._post(data, timeout or self.timeout)
+        except RateLimitTimeout:
+            # Our own pacing, not an upstream failure
+            raise
+        except Exception:
+            self.circuit_breaker.record(False, time.monotonic() - started)
+            raise
+        # Judge upstream by its own response time, not time spent queued for a rate-limit slot
+        self.circuit_breaker.record(response.status_code == 200, response.elapsed.total_seconds())
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        result = response.json()
+        self._count_tokens(data, result)
+        if key is not None:
+            self.result_cache.set(key, result)
+        return response.status_code, result
+    
+    def _post(self, data: Dict, timeout: float, **kwargs):
+        """POST a chat completion through the rate-limit scheduler, retrying 429s within timeout seconds"""
+        return self.scheduler.call(
+            lambda remaining: self.http_client.post_json("/chat/completions", data, timeout=remaining, **kwargs),
+            estimate_tokens(data), time.monotonic() + timeout, self.priority
+        )
+    
     def _enhance_with_context(self, question: str, ml_response: Dict, context: Optional[Dict] = None) -> Dict:
         """Enhance response using business context and templates"""
         
@@ -194,33 +648,6 @@ class EnhancedAI:
             'source': 'context_enhanced'
         }
     
-    def _create_enhancement_prompt(self, question: str, ml_response: Dict, context: Optional[Dict] = None) -> str:
-        """Create prompt for OpenAI enhancement"""
-        
-        prompt = f"""
-        Question: {question}
-        
-        Current Response: {ml_response['response']}
-        Category: {ml_response['category']}
-        """
-        
-        if context:
-            prompt += f"\nContext: {json.dumps(context, indent=2)}"
-        
-        prompt += """
-        
-        Please enhance this response by:
-        1. Making it more specific and actionable
-        2. Adding relevant examples or case studies
-        3. Including specific metrics or benchmarks where appropriate
-        4. Providing clear next steps
-        5. Maintaining a professional but encouraging tone
-        
-        Keep the response concise but comprehensive, and ensure it directly addresses the user's question.
-        """
-        
-        return prompt
-    
     def _get_context_info(self, category: str, context: Optional[Dict] = None) -> str:
         """Get context-specific information"""
         if not context:
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+InnoStart Financial Projections
+Closed-form projection engine: revenue grows as a geometric series, so every
+month's revenue, the cumulative profit, the break-even month and the ROI of a
+whole horizon are array expressions, for one business or a batch at once
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Parameters read from business_data, with the defaults generate_financial_projections always used
+PARAMETER_DEFAULTS = {
+    'monthly_revenue': 0.0,
+    'growth_rate': 0.05,
+    'monthly_expenses': 0.0,
+    'initial_investment': 0.0,
+    'projection_months': 12
+}
+
+
+def _geometric_sum(factor: np.ndarray, growth_rate: np.ndarray, months: np.ndarray) -> np.ndarray:
+    """1 + factor + ... + factor**(months - 1), elementwise; exactly months where growth_rate is 0"""
+    flat = growth_rate == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        series = (factor ** months - 1) / np.where(flat, 1.0, growth_rate)
+    return np.where(flat, months, series)
+
+
+def project(monthly_revenue, growth_rate, monthly_expenses, initial_investment, months) -> Dict[str, np.ndarray]:
+    """Projections for a batch of parameter sets, as arrays
+
+    Each argument is a scalar or a 1-D array; they broadcast to n parameter sets.
+    The month arrays (revenue, expenses, profit, cumulative_profit) have max(months)
+    columns; where horizons differ, months past a set's own horizon are NaN.
+    break_even_month is 1-based, with 0 where the cumulative profit never reaches
+    zero in the horizon. Totals and ROI are closed-form.
+    """
+    revenue0, growth, expenses, investment, horizon = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in
+          (monthly_revenue, growth_rate, monthly_expenses, initial_investment, months)))
+    horizon = np.maximum(horizon, 0).astype(np.int64)
+    factor = 1 + growth
+
+    # Month m (1-based) earns revenue0 * factor**(m - 1); each step below is one pass over the n x months arrays
+    month = np.arange(1, int(horizon.max(initial=0)) + 1, dtype=np.float64)
+    revenue = revenue0[:, None] * factor[:, None] ** (month - 1)
+    profit = revenue - expenses[:, None]
+    cumulative_profit = np.cumsum(profit, axis=1)
+    cumulative_profit -= investment[:, None]
+
+    reached = cumulative_profit >= 0
+    ragged = bool((horizon != month.size).any())
+    if ragged:
+        in_horizon = month <= horizon[:, None]
+        reached &= in_horizon
+    break_even_month = np.zeros(len(horizon), dtype=np.int64)
+    if month.size:
+        break_even_month = np.where(reached.any(axis=1), reached.argmax(axis=1) + 1, 0)
+
+    # Totals straight from the geometric series, without summing the months
+    total_revenue = revenue0 * _geometric_sum(factor, growth, horizon)
+    total_expenses = expenses * horizon
+    net_profit = total_revenue - total_expenses - investment
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(investment > 0, net_profit / np.where(investment > 0, investment, 1.0) * 100, 0.0)
+
+    monthly_expenses = np.broadcast_to(expenses[:, None], revenue.shape)
+    if ragged:
+        revenue, monthly_expenses, profit, cumulative_profit = (
+            np.where(in_horizon, values, np.nan) for values in (revenue, monthly_expenses, profit, cumulative_profit))
+    return {
+        'months': horizon,
+        'revenue': revenue,
+        'expenses': monthly_expenses,
+        'profit': profit,
+        'cumulative_profit': cumulative_profit,
+        'total_revenue': total_revenue,
+        'total_expenses': total_expenses,
+        'net_profit': net_profit,
+        'break_even_month': break_even_month,
+        'roi': roi
+    }
+
+
+def project_records(business_data: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """project() for a list of business_data dicts, missing keys taking PARAMETER_DEFAULTS"""
+    columns = {key: [data.get(key, default) for data in business_data] for key, default in PARAMETER_DEFAULTS.items()}
+    return project(columns['monthly_revenue'], columns['growth_rate'], columns['monthly_expenses'],
+                   columns['initial_investment'], columns['projection_months'])
+
+
+def monthly_view(projection: Dict[str, np.ndarray], index: int = 0, monthly_data: bool = True) -> Dict:
+    """One parameter set of a projection in the generate_financial_projections dict layout
+
+    monthly_data=False leaves out the per-month list, which is most of the cost of the view.
+    """
+    months = int(projection['months'][index])
+    view = {
+        'monthly_data': [],
+        'total_revenue': float(projection['total_revenue'][index]),
+        'total_expenses': float(projection['total_expenses'][index]),
+        'net_profit': float(projection['net_profit'][index]),
+        'break_even_month': int(projection['break_even_month'][index]) or None,
+        'roi': float(projection['roi'][index])
+    }
+    if monthly_data:
+        columns = [projection[key][index, :months].tolist()
+                   for key in ('revenue', 'expenses', 'profit', 'cumulative_profit')]
+        view['monthly_data'] = [
+            {'month': month, 'revenue': revenue, 'expenses': expenses, 'profit': profit,
+             'cumulative_profit': cumulative_profit}
+            for month, (revenue, expenses, profit, cumulative_profit) in enumerate(zip(*columns), 1)
+        ]
+    return view
+
+
+def monthly_views(projection: Dict[str, np.ndarray], monthly_data: bool = True,
+                  indexes: Optional[Sequence[int]] = None) -> List[Dict]:
+    """monthly_view() for every parameter set of a projection, or those at indexes"""
+    if indexes is None:
+        indexes = range(len(projection['months']))
+    return [monthly_view(projection, index, monthly_data) for index in indexes]
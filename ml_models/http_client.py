@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+InnoStart HTTP Client
+Keep-alive HTTP client with a bounded connection pool, shared per process by
+the OpenAI-backed integrations (EnhancedAI and InnoStartAI)
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Dict, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# OpenAI-compatible endpoint; point it at a proxy, Azure-style gateway or the local stand-in (openai_stand_in.py)
+DEFAULT_OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+# Room for EnhancedAI's 32 hedge workers plus as many callers waiting on their own requests
+DEFAULT_POOL_SIZE = int(os.getenv('INNOSTART_HTTP_POOL_SIZE', '64'))
+DEFAULT_CONNECT_TIMEOUT = float(os.getenv('INNOSTART_HTTP_CONNECT_TIMEOUT', '5'))
+DEFAULT_READ_TIMEOUT = float(os.getenv('INNOSTART_HTTP_READ_TIMEOUT', '30'))
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def _pool_wait_adapter(on_wait, **kwargs):
+    """HTTPAdapter whose connection pools report how long each request waited for a free connection"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    def timed(pool_class):
+        class TimedPool(pool_class):
+            def _get_conn(self, timeout=None):
+                started = time.perf_counter()
+                try:
+                    return super()._get_conn(timeout)
+                finally:
+                    on_wait(time.perf_counter() - started)
+        return TimedPool
+
+    pool_classes = {'http': timed(HTTPConnectionPool), 'https': timed(HTTPSConnectionPool)}
+
+    class PoolWaitAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **pool_kwargs):
+            super().init_poolmanager(*args, **pool_kwargs)
+            self.poolmanager.pool_classes_by_scheme = pool_classes
+
+    return PoolWaitAdapter(**kwargs)
+
+
+class PooledHTTPClient:
+    """requests.Session with a sized keep-alive pool, safe to share between threads"""
+
+    def __init__(self, base_url: str, headers: Optional[Dict] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: Timeout = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), max_retries: int = 0):
+        # Imported here so modules that only hold a client reference stay cheap to import
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.pool_waits = 0
+        self.pool_wait_total = 0.0
+        self.pool_wait_max = 0.0
+
+        self.session = requests.Session()
+        # Requests beyond pool_size wait for a free connection instead of opening throwaway ones;
+        # pool_waits counts how often that happened, so an undersized pool shows in stats()
+        adapter = _pool_wait_adapter(self._record_pool_wait, pool_maxsize=pool_size, max_retries=max_retries,
+                                     pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Built once; per-call headers are merged on top
+        self.session.headers.update(headers or {})
+
+    def post_json(self, path: str, payload: Dict, timeout: Optional[Timeout] = None,
+                  headers: Optional[Dict] = None, **kwargs):
+        """POST a JSON body to base_url + path on a pooled connection"""
+        return self.session.post(f"{self.base_url}/{path.lstrip('/')}", json=payload, headers=headers,
+                                 timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+    def _record_pool_wait(self, waited: float) -> None:
+        with self._lock:
+            self.requests += 1
+            # Taking an idle connection is microseconds; anything past a millisecond queued for one
+            if waited >= 0.001:
+                self.pool_waits += 1
+            self.pool_wait_total += waited
+            self.pool_wait_max = max(self.pool_wait_max, waited)
+
+    def stats(self) -> Dict:
+        """Pool size and how long requests waited for a free connection"""
+        with self._lock:
+            return {
+                'pool_size': self.pool_size,
+                'requests': self.requests,
+                'pool_waits': self.pool_waits,
+                'pool_wait_avg_ms': self.pool_wait_total / self.requests * 1000 if self.requests else 0.0,
+                'pool_wait_max_ms': self.pool_wait_max * 1000
+            }
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url: str, api_key: Optional[str] = None, pool_size: Optional[int] = None,
+               timeout: Optional[Timeout] = None) -> PooledHTTPClient:
+    """Process-wide client for (base_url, api_key), created on first use"""
+    key = (base_url.rstrip('/'), api_key)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                headers = {"Content-Type": "application/json"}
+                if api_key:
+                    headers["Authorization"] = f"Bearer {api_key}"
+                client = _clients[key] = PooledHTTPClient(
+                    base_url, headers,
+                    pool_size=pool_size or DEFAULT_POOL_SIZE,
+                    timeout=timeout or (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+                )
+    return client
+
+
+def close_clients() -> None:
+    """Close every shared client, e.g. on worker shutdown"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def _reset_after_fork() -> None:
+    # Pooled sockets belong to the parent; a forked worker must open its own
+    global _clients_lock
+    _clients.clear()
+    _clients_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
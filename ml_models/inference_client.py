@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+InnoStart Inference Client
+Thin client and wire protocol for the persistent inference service
+"""
+
+import os
+import sys
+import json
+import select
+import socket
+import struct
+import argparse
+from typing import Any, Dict, Iterator, Optional
+
+# Every frame is a 4-byte big-endian length followed by a UTF-8 JSON body
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+DEFAULT_HOST = os.getenv('INNOSTART_INFERENCE_HOST', '127.0.0.1')
+DEFAULT_PORT = int(os.getenv('INNOSTART_INFERENCE_PORT', '8765'))
+DEFAULT_SOCKET = os.getenv('INNOSTART_INFERENCE_SOCKET')
+
+
+class InferenceError(Exception):
+    """Raised when the inference service reports a failed operation"""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes, or None if the peer closed the connection"""
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def send_frame(sock: socket.socket, payload: Dict) -> None:
+    """Encode and send one framed JSON message"""
+    body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    sock.sendall(HEADER.pack(len(body)) + body)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Dict]:
+    """Receive one framed JSON message, or None on a clean disconnect"""
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {size} bytes exceeds limit")
+
+    body = _recv_exact(sock, size)
+    if body is None:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+def _connection_dropped(sock: socket.socket) -> bool:
+    """True if the peer closed an idle connection (or sent bytes nobody asked for)"""
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+        return bool(readable)
+    except (OSError, ValueError):
+        return True
+
+
+class InferenceClient:
+    """Keeps one connection to the inference service and reuses it across calls"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 socket_path: Optional[str] = DEFAULT_SOCKET, timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = None
+
+    def _connect(self) -> socket.socket:
+        if self.socket_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        else:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+    def call(self, op: str, **args: Any) -> Any:
+        """Run an operation on the service and return its result"""
+        request = {'op': op, 'args': args}
+
+        # An idle pooled connection the server has since closed is replaced before sending
+        if self._sock is not None and _connection_dropped(self._sock):
+            self.close()
+
+        # Only a failed send is retried: the service never saw the request. Once it is
+        # sent the operation may have run (start_enhanced_response is not idempotent).
+        for attempt in range(2):
+            reused = self._sock is not None
+            if not reused:
+                self._sock = self._connect()
+            try:
+                send_frame(self._sock, request)
+                break
+            except OSError:
+                self.close()
+                if attempt or not reused:
+                    raise
+
+        try:
+            reply = recv_frame(self._sock)
+        except BaseException:
+            # A late reply would otherwise be read as the answer to the next call
+            self.close()
+            raise
+        if reply is None:
+            self.close()
+            raise ConnectionError("Inference service closed the connection")
+
+        if not reply.get('ok'):
+            raise InferenceError(reply.get('error', 'Unknown inference error'))
+        return reply['result']
+
+    def stream(self, op: str, **args: Any) -> Iterator[Dict]:
+        """Run a streaming operation and yield its events as they arrive"""
+        if self._sock is None:
+            self._sock = self._connect()
+        try:
+            send_frame(self._sock, {'op': op, 'args': args})
+            while True:
+                reply = recv_frame(self._sock)
+                if reply is None:
+                    raise ConnectionError("Inference service closed the connection")
+                if not reply.get('ok'):
+                    raise InferenceError(reply.get('error', 'Unknown inference error'))
+                if reply.get('end'):
+                    return
+                # A non-streaming operation answers with a single result frame
+                if 'result' in reply:
+                    yield reply['result']
+                    return
+                yield reply['event']
+        except BaseException:
+            # Unread frames would corrupt the next call on this connection
+            self.close()
+            raise
+
+    def predict(self, message: str) -> Dict:
+        return self.call('predict', message=message)
+
+    def chat(self, message: str, intent: Optional[str] = None) -> Dict:
+        return self.call('chat', message=message, intent=intent)
+
+    def generate_response(self, question: str, context: Optional[Dict] = None) -> Dict:
+        return self.call('generate_response', question=question, context=context)
+
+    def generate_enhanced_response(self, question: str, context: Optional[Dict] = None) -> Dict:
+        return self.call('generate_enhanced_response', question=question, context=context)
+
+    def stream_enhanced_response(self, question: str, context: Optional[Dict] = None) -> Iterator[Dict]:
+        return self.stream('stream_enhanced_response', question=question, context=context)
+
+    def start_enhanced_response(self, question: str, context: Optional[Dict] = None) -> Dict:
+        return self.call('start_enhanced_response', question=question, context=context)
+
+    def get_enhanced_response(self, response_id: str, wait: float = 0.0) -> Dict:
+        return self.call('get_enhanced_response', response_id=response_id, wait=wait)
+
+    def progressive_enhanced_response(self, question: str, context: Optional[Dict] = None) -> Iterator[Dict]:
+        return self.stream('progressive_enhanced_response', question=question, context=context)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Send a single operation to a running service and print the JSON result"""
+    parser = argparse.ArgumentParser(description='InnoStart inference client')
+    parser.add_argument('op', help='Operation name (predict, chat, generate_response, ...)')
+    parser.add_argument('message', help='User message or question')
+    parser.add_argument('--context', help='Context as JSON string')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='Unix socket path')
+    parser.add_argument('--stream', action='store_true',
+                        help='Print each event of a streaming operation as a JSON line')
+
+    args = parser.parse_args()
+
+    with InferenceClient(args.host, args.port, args.socket) as client:
+        if args.stream:
+            context = json.loads(args.context) if args.context else None
+            for event in client.stream(args.op, question=args.message, context=context):
+                print(json.dumps(event), flush=True)
+            return 0
+        if args.op in ('predict', 'chat'):
+            result = client.call(args.op, message=args.message)
+        else:
+            context = json.loads(args.context) if args.context else None
+            result = client.call(args.op, question=args.message, context=context)
+
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
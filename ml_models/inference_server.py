@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+InnoStart Inference Server
+Long-running service that keeps the ML models warm so chat.php does not
+spawn a new Python interpreter for every message
+"""
+
+import os
+import sys
+import time
+import socket
+import inspect
+import logging
+import argparse
+import socketserver
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Add the current directory to Python path
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from inference_client import DEFAULT_HOST, DEFAULT_PORT, DEFAULT_SOCKET, recv_frame, send_frame
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DATASET_PATH = os.path.join(BASE_DIR, '..', 'datasets', 'musanze_dataset.csv')
+RESPONSE_MODEL_PATH = os.path.join(BASE_DIR, 'business_response_model')
+
+
+class ModelRegistry:
+    """Builds every model once and dispatches operations to them"""
+
+    def __init__(self, dataset_path: str = DATASET_PATH, model_path: str = RESPONSE_MODEL_PATH,
+                 cache_size: int = 4096, cache_ttl: float = 3600.0,
+                 semantic_cache_size: int = 100000, semantic_threshold: float = 0.9,
+                 openai_budget: Optional[float] = None, hedge: bool = True,
+                 openai_base_url: Optional[str] = None, routing=None):
+        from musanze_smart_model import MusanzeSmartModel
+        from response_generator import BusinessResponseGenerator
+        from ttl_cache import LRUTTLCache
+        from musanze_api import build_result as build_predict_result
+        from ai_chat_interface import build_result as build_chat_result
+
+        started = time.perf_counter()
+
+        self._build_predict_result = build_predict_result
+        self._build_chat_result = build_chat_result
+
+        self.smart_model = MusanzeSmartModel.load_or_train(dataset_path)
+        # Repeat questions are common, so answers are deterministic and cached
+        self.response_generator = BusinessResponseGenerator(
+            model_path, deterministic=True,
+            cache=LRUTTLCache(cache_size, cache_ttl) if cache_size > 0 else None
+        )
+        # Default latency budget for OpenAI enhancement when the caller does not send one
+        self.openai_budget = openai_budget
+        self.enhanced_ai = self._load_enhanced_ai(semantic_cache_size, semantic_threshold, hedge,
+                                                  openai_base_url, routing)
+
+        self.operations: Dict[str, Callable[..., Any]] = {
+            'ping': self.ping,
+            'stats': self.stats,
+            'predict': self.predict,
+            'chat': self.chat,
+            'generate_response': self.generate_response,
+            'generate_enhanced_response': self.generate_enhanced_response,
+            'stream_enhanced_response': self.stream_enhanced_response,
+            'start_enhanced_response': self.start_enhanced_response,
+            'get_enhanced_response': self.get_enhanced_response,
+            'progressive_enhanced_response': self.progressive_enhanced_response,
+        }
+
+        logger.info(f"Models warmed up in {time.perf_counter() - started:.2f}s")
+
+    def _load_enhanced_ai(self, semantic_cache_size: int, semantic_threshold: float, hedge: bool,
+                          openai_base_url: Optional[str] = None, routing=None):
+        """EnhancedAI is optional; the service still runs without it"""
+        try:
+            from enhanced_ai_integration import EnhancedAI
+            from semantic_cache import SemanticCache
+            
+            semantic_cache = None
+            vectorizer = self.response_generator.vectorizer
+            if semantic_cache_size > 0 and vectorizer is not None:
+                semantic_cache = SemanticCache(len(vectorizer.vocabulary_), threshold=semantic_threshold,
+                                               maxsize=semantic_cache_size)
+            return EnhancedAI(response_generator=self.response_generator, semantic_cache=semantic_cache,
+                              hedge=hedge, base_url=openai_base_url, routing=routing)
+        except Exception as e:
+            logger.warning(f"EnhancedAI not available: {e}")
+            return None
+
+    def dispatch(self, op: str, args: Dict) -> Any:
+        if op not in self.operations:
+            raise ValueError(f"Unknown operation: {op}")
+        return self.operations[op](**args)
+
+    def ping(self) -> Dict:
+        return {'status': 'ok', 'enhanced_ai': self.enhanced_ai is not None}
+
+    def stats(self) -> Dict:
+        cache = self.response_generator.cache
+        semantic_cache = self.enhanced_ai.semantic_cache if self.enhanced_ai is not None else None
+        result_cache = self.enhanced_ai.result_cache if self.enhanced_ai is not None else None
+        return {
+            'response_cache': cache.stats() if cache is not None else None,
+            'semantic_cache': semantic_cache.stats() if semantic_cache is not None else None,
+            'result_cache': result_cache.stats() if result_cache is not None else None,
+            'single_flight': self.enhanced_ai.single_flight.stats() if self.enhanced_ai is not None else None,
+            'enhancement': self.enhanced_ai.enhancement_stats() if self.enhanced_ai is not None else None
+        }
+
+    def predict(self, message: str) -> Dict:
+        return self._build_predict_result(self.smart_model, message)
+
+    def chat(self, message: str, intent: Optional[str] = None) -> Dict:
+        return self._build_chat_result(message, intent)
+
+    def generate_response(self, question: str, context: Optional[Dict] = None) -> Dict:
+        return self.response_generator.generate_response(question, context)
+
+    def generate_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                   budget: Optional[float] = None) -> Dict:
+        if self.enhanced_ai is None:
+            raise RuntimeError("EnhancedAI is not available on this server")
+        return self.enhanced_ai.generate_enhanced_response(
+            question, context, budget=self.openai_budget if budget is None else budget)
+
+    def stream_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                 budget: Optional[float] = None) -> Iterator[Dict]:
+        if self.enhanced_ai is None:
+            raise RuntimeError("EnhancedAI is not available on this server")
+        return self.enhanced_ai.stream_enhanced_response(
+            question, context, budget=self.openai_budget if budget is None else budget)
+
+    def start_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                budget: Optional[float] = None) -> Dict:
+        if self.enhanced_ai is None:
+            raise RuntimeError("EnhancedAI is not available on this server")
+        return self.enhanced_ai.start_enhanced_response(
+            question, context, budget=self.openai_budget if budget is None else budget)
+
+    def get_enhanced_response(self, response_id: str, wait: float = 0.0) -> Dict:
+        if self.enhanced_ai is None:
+            raise RuntimeError("EnhancedAI is not available on this server")
+        return self.enhanced_ai.get_enhanced_response(response_id, wait)
+
+    def progressive_enhanced_response(self, question: str, context: Optional[Dict] = None,
+                                      budget: Optional[float] = None) -> Iterator[Dict]:
+        if self.enhanced_ai is None:
+            raise RuntimeError("EnhancedAI is not available on this server")
+        return self.enhanced_ai.progressive_enhanced_response(
+            question, context, budget=self.openai_budget if budget is None else budget)
+
+
+class InferenceRequestHandler(socketserver.BaseRequestHandler):
+    """Serves framed JSON requests on one connection until the client hangs up"""
+
+    def handle(self):
+        registry = self.server.registry
+
+        while True:
+            try:
+                request = recv_frame(self.request)
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Dropping connection: {e}")
+                return
+            if request is None:
+                return
+
+            # Replies echo the request id so a client can spot one meant for an earlier request
+            tag = {'id': request['id']} if 'id' in request else {}
+
+            try:
+                result = registry.dispatch(request.get('op', ''), request.get('args') or {})
+                reply = {'ok': True, 'result': result, **tag}
+            except Exception as e:
+                logger.error(f"Operation {request.get('op')} failed: {e}")
+                reply = {'ok': False, 'error': str(e), **tag}
+
+            try:
+                if reply['ok'] and inspect.isgenerator(result):
+                    self.send_stream(request.get('op'), result, tag)
+                else:
+                    send_frame(self.request, reply)
+            except ConnectionError:
+                return
+            except (TypeError, ValueError) as e:
+                # The result did not encode to JSON; nothing was sent, so the client still gets a reply
+                logger.error(f"Operation {request.get('op')} returned an unserializable result: {e}")
+                try:
+                    send_frame(self.request, {'ok': False, 'error': f"Result is not JSON serializable: {e}", **tag})
+                except ConnectionError:
+                    return
+
+    def send_stream(self, op: str, events: Iterator[Dict], tag: Optional[Dict] = None) -> None:
+        """Relay a streaming operation as one {'ok', 'event'} frame per event and a final {'ok', 'end'} frame"""
+        tag = tag or {}
+        try:
+            for event in events:
+                send_frame(self.request, {'ok': True, 'event': event, **tag})
+        except ConnectionError:
+            # The client hung up mid-stream; closing the generator releases the upstream response
+            events.close()
+            raise
+        except Exception as e:
+            logger.error(f"Stream {op} failed: {e}")
+            send_frame(self.request, {'ok': False, 'error': str(e), **tag})
+            return
+        send_frame(self.request, {'ok': True, 'end': True, **tag})
+
+
+class ThreadedTCPInferenceServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class ThreadedUnixInferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def create_server(registry: ModelRegistry, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """Create a TCP (default) or Unix socket server bound to the registry"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadedUnixInferenceServer(socket_path, InferenceRequestHandler)
+    else:
+        server = ThreadedTCPInferenceServer((host, port), InferenceRequestHandler)
+        server.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    server.registry = registry
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='InnoStart persistent inference service')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='TCP host to bind')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='TCP port to bind')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help='Unix socket path (overrides TCP)')
+    parser.add_argument('--cache-size', type=int, default=4096, help='Response cache entries (0 disables)')
+    parser.add_argument('--cache-ttl', type=float, default=3600.0, help='Response cache TTL in seconds')
+    parser.add_argument('--semantic-cache-size', type=int, default=100000,
+                        help='Near-duplicate cache entries for OpenAI-enhanced answers (0 disables)')
+    parser.add_argument('--semantic-threshold', type=float, default=0.9,
+                        help='Cosine similarity needed to reuse a cached enhanced answer')
+    parser.add_argument('--openai-budget', type=float, default=None,
+                        help='Seconds to wait for OpenAI enhancement when the caller sends no budget')
+    parser.add_argument('--no-hedge', action='store_true',
+                        help='Wait on OpenAI instead of racing it against the local answer')
+    parser.add_argument('--openai-base-url', default=None,
+                        help='OpenAI-compatible API root (default: OPENAI_BASE_URL or the public API)')
+    parser.add_argument('--route-threshold', action='append', default=[], metavar='[CATEGORY=]CONFIDENCE',
+                        help='Confidence at which an answer stays local, overall or per category (repeatable)')
+    parser.add_argument('--no-routing', action='store_true',
+                        help='Send every question to OpenAI, however confident the local model is')
+
+    args = parser.parse_args()
+
+    # Model helpers resolve the dataset relative to ml_models, like the PHP callers do
+    os.chdir(BASE_DIR)
+
+    from routing import DEFAULT_CATEGORY_THRESHOLDS, DEFAULT_CONFIDENCE_THRESHOLD, RoutingPolicy, parse_thresholds
+    default_threshold, thresholds = parse_thresholds(args.route_threshold)
+    routing = RoutingPolicy(dict(DEFAULT_CATEGORY_THRESHOLDS, **thresholds),
+                            DEFAULT_CONFIDENCE_THRESHOLD if default_threshold is None else default_threshold,
+                            enabled=not args.no_routing)
+
+    registry = ModelRegistry(cache_size=args.cache_size, cache_ttl=args.cache_ttl,
+                             semantic_cache_size=args.semantic_cache_size,
+                             semantic_threshold=args.semantic_threshold,
+                             openai_budget=args.openai_budget, hedge=not args.no_hedge,
+                             openai_base_url=args.openai_base_url, routing=routing)
+    server = create_server(registry, args.host, args.port, args.socket)
+
+    address = args.socket or f"{args.host}:{args.port}"
+    logger.info(f"InnoStart inference service listening on {address}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Inference service stopped by user")
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+InnoStart Model Artifact
+Versioned on-disk format for the business response model: a small JSON manifest
+plus .npy arrays opened with mmap_mode='r', so every worker process shares one
+page-cache copy of the weights and loading does not depend on model size
+
+Usage: python model_artifact.py <model.pkl> <artifact_dir>   (convert a legacy pickle)
+"""
+
+import os
+import sys
+import json
+import pickle
+import shutil
+import logging
+from typing import Dict
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 'innostart-response-model'
+# Bump whenever the manifest layout or the meaning of an array changes
+ARTIFACT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# Dense rows scored per forest traversal, bounding the temporary feature matrix
+PREDICT_CHUNK_ROWS = 4096
+
+
+class ArtifactLabelEncoder:
+    """Read-only stand-in for LabelEncoder: maps class ids back to category names"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y, dtype=np.int64)]
+
+    def transform(self, labels):
+        index = {label: i for i, label in enumerate(self.classes_)}
+        return np.array([index[label] for label in labels], dtype=np.int64)
+
+
+class ArtifactForest:
+    """Random forest scored from flat node arrays shared by all trees.
+
+    Child indices are global across trees (-1 marks a leaf) and node values are
+    per-node class probabilities, so predict_proba walks every tree at once.
+    """
+
+    def __init__(self, classes, roots, left, right, feature, threshold, value, max_depth):
+        self.classes_ = np.asarray(classes)
+        self.roots = roots
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.max_depth = max_depth
+
+    def predict_proba(self, X):
+        n_rows = X.shape[0]
+        probabilities = np.empty((n_rows, self.value.shape[1]))
+        for start in range(0, n_rows, PREDICT_CHUNK_ROWS):
+            chunk = X[start:start + PREDICT_CHUNK_ROWS]
+            dense = chunk.toarray() if hasattr(chunk, 'toarray') else np.asarray(chunk)
+            # Trees compare float32 features against float64 thresholds, as sklearn does
+            probabilities[start:start + len(dense)] = self._leaf_values(dense.astype(np.float32)).mean(axis=1)
+        return probabilities
+
+    def _leaf_values(self, X):
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            left = self.left[nodes]
+            internal = left != -1
+            if not internal.any():
+                break
+            goes_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(goes_left, left, self.right[nodes]), nodes)
+        return self.value[nodes]
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+class ArtifactLinear:
+    """Logistic regression scored from memory-mapped coefficients"""
+
+    def __init__(self, classes, coef, intercept):
+        self.classes_ = np.asarray(classes)
+        self.coef = coef
+        self.intercept = intercept
+
+    def predict_proba(self, X):
+        scores = np.asarray(X @ self.coef.T) + self.intercept
+        if self.coef.shape[0] == 1:
+            positive = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def _forest_arrays(model) -> Dict[str, np.ndarray]:
+    """Flatten the fitted trees of a RandomForestClassifier into global node arrays"""
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        roots.append(offset)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        feature.append(tree.feature)
+        threshold.append(tree.threshold)
+        counts = tree.value[:, 0, :]
+        value.append(counts / counts.sum(axis=1, keepdims=True))
+        offset += tree.node_count
+
+    return {
+        'roots': np.asarray(roots, dtype=np.int64),
+        'left': np.concatenate(left).astype(np.int64),
+        'right': np.concatenate(right).astype(np.int64),
+        'feature': np.concatenate(feature).astype(np.int64),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'value': np.concatenate(value).astype(np.float64),
+    }
+
+
+def _vectorizer_params(vectorizer) -> Dict:
+    """JSON-serializable TfidfVectorizer constructor parameters"""
+    params = {}
+    for name, value in vectorizer.get_params().items():
+        if name == 'vocabulary':
+            continue
+        if name == 'dtype':
+            value = np.dtype(value).name
+        elif isinstance(value, (tuple, frozenset, set)):
+            value = list(value)
+        elif callable(value):
+            raise ValueError(f"Vectorizer parameter {name} is a callable and cannot be stored in an artifact")
+        params[name] = value
+    return params
+
+
+def save_artifact(directory: str, model, vectorizer, label_encoder, response_categories: Dict) -> None:
+    """Write model components as a manifest plus .npy arrays, replacing directory atomically"""
+    arrays = {'idf': np.asarray(vectorizer.idf_, dtype=np.float64)}
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'version': ARTIFACT_VERSION,
+        'model_type': type(model).__name__,
+        'categories': [str(label) for label in label_encoder.classes_],
+        'model_classes': np.asarray(model.classes_).tolist(),
+        'response_categories': {str(k): int(v) for k, v in response_categories.items()},
+        'vectorizer': {
+            'params': _vectorizer_params(vectorizer),
+            'vocabulary': {term: int(index) for term, index in vectorizer.vocabulary_.items()},
+        },
+    }
+
+    if manifest['model_type'] == 'RandomForestClassifier':
+        arrays.update(_forest_arrays(model))
+        manifest['max_depth'] = max(estimator.tree_.max_depth for estimator in model.estimators_)
+    elif manifest['model_type'] == 'LogisticRegression':
+        arrays['coef'] = np.asarray(model.coef_, dtype=np.float64)
+        arrays['intercept'] = np.asarray(model.intercept_, dtype=np.float64)
+    else:
+        # No array layout for this estimator yet; keep it loadable as a pickled part
+        logger.warning(f"No array layout for {manifest['model_type']}, storing the estimator pickled")
+        manifest['estimator'] = 'estimator.pkl'
+
+    manifest['arrays'] = {
+        name: {'file': f"{name}.npy", 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        for name, array in arrays.items()
+    }
+
+    staging = f"{directory.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array))
+    if 'estimator' in manifest:
+        with open(os.path.join(staging, manifest['estimator']), 'wb') as f:
+            pickle.dump(model, f)
+    with open(os.path.join(staging, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=1)
+
+    # A directory cannot be os.replace'd onto a non-empty one, so move the old copy aside first
+    previous = None
+    if os.path.exists(directory):
+        previous = f"{directory.rstrip(os.sep)}.old-{os.getpid()}"
+        os.replace(directory, previous)
+    os.replace(staging, directory)
+    if previous:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def is_artifact(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def load_artifact(directory: str) -> Dict:
+    """Open an artifact directory; arrays are memory-mapped read-only, not copied"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT or manifest.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported model artifact {manifest.get('format')} v{manifest.get('version')} "
+                         f"(expected {ARTIFACT_FORMAT} v{ARTIFACT_VERSION})")
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(directory, spec['file']), mmap_mode='r')
+        if array.dtype.str != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise ValueError(f"Model artifact array {name} does not match its manifest")
+        arrays[name] = array
+
+    params = dict(manifest['vectorizer']['params'])
+    params['dtype'] = np.dtype(params['dtype']).type
+    params['ngram_range'] = tuple(params['ngram_range'])
+    vectorizer = TfidfVectorizer(vocabulary=manifest['vectorizer']['vocabulary'], **params)
+    vectorizer.idf_ = arrays['idf']
+
+    classes = manifest['model_classes']
+    if manifest['model_type'] == 'RandomForestClassifier':
+        model = ArtifactForest(classes, arrays['roots'], arrays['left'], arrays['right'], arrays['feature'],
+                               arrays['threshold'], arrays['value'], manifest['max_depth'])
+    elif manifest['model_type'] == 'LogisticRegression':
+        model = ArtifactLinear(classes, arrays['coef'], arrays['intercept'])
+    else:
+        with open(os.path.join(directory, manifest['estimator']), 'rb') as f:
+            model = pickle.load(f)
+
+    return {
+        'model': model,
+        'vectorizer': vectorizer,
+        'label_encoder': ArtifactLabelEncoder(manifest['categories']),
+        'response_categories': manifest['response_categories'],
+        'model_type': manifest['model_type'],
+    }
+
+
+def load_model_data(path: str) -> Dict:
+    """Model components from an artifact directory, or from a legacy single-file pickle"""
+    if is_artifact(path):
+        return load_artifact(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def convert_pickle(pickle_path: str, directory: str) -> None:
+    """Rewrite a legacy business_response_model.pkl as an artifact directory"""
+    with open(pickle_path, 'rb') as f:
+        model_data = pickle.load(f)
+    save_artifact(directory, model_data['model'], model_data['vectorizer'],
+                  model_data['label_encoder'], model_data['response_categories'])
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python model_artifact.py <model.pkl> <artifact_dir>")
+        sys.exit(1)
+    convert_pickle(sys.argv[1], sys.argv[2])
+    logger.info(f"Wrote model artifact to {sys.argv[2]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,29 @@ import sys
 import json
 from musanze_smart_model import MusanzeSmartModel
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python musanze_api.py <user_message>")
-        return
-    
-    user_message = sys.argv[1]
-    
-    # Load trained model
-    model = MusanzeSmartModel()
-    model.train('../datasets/musanze_dataset.csv')
-    
-    # Get prediction
+def build_result(model, user_message):
+    """Wrap a model prediction in the JSON shape expected by chat.php"""
     prediction = model.predict(user_message)
-    
-    # Return as JSON
-    result = {
+
+    return {
         "response": prediction,
         "ml_enhanced": True,
         "accuracy": 0.999
     }
-    
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python musanze_api.py <user_message>")
+        return
+
+    user_message = sys.argv[1]
+
+    # Load trained model, retraining only when the dataset changed since the artifact was saved
+    model = MusanzeSmartModel.load_or_train('../datasets/musanze_dataset.csv')
+
+    # Get prediction and return as JSON
+    result = build_result(model, user_message)
+
     print(json.dumps(result))
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""
+Musanze Dataset Store
+Loads the Musanze business dataset once per process and answers the
+type / budget filters used by MusanzeSmartModel from prebuilt indexes
+"""
+
+import os
+import threading
+import numpy as np
+import pandas as pd
+from musanze_vocabulary import BUDGET_BUCKETS, DEFAULT_DATASET_PATH
+from dataset_enrichment import INPUT_COLUMNS, enrichment_key, enrichment_path, load_enrichments, summary
+
+# Columns stored as categorical codes plus a small table of distinct values
+CATEGORICAL_COLUMNS = ('business_type', 'location', 'investment_range', 'competition_level',
+                       'market_demand', 'target_market', 'skills_required')
+
+class MusanzeDatasetStore:
+    """Column-oriented, indexed in-memory copy of the Musanze dataset"""
+
+    def __init__(self, csv_path, indexes=None):
+        """indexes: row ids per business_type and investment_range value, as stored in the
+        MusanzeSmartModel artifact built from this dataset; computed here when absent"""
+        df = pd.read_csv(csv_path)
+        self.size = len(df)
+
+        # Categorical codes keep repeated strings once per distinct value
+        self.codes = {}
+        self.categories = {}
+        for column in CATEGORICAL_COLUMNS:
+            categorical = pd.Categorical(df[column])
+            self.codes[column] = np.asarray(categorical.codes, dtype=np.int16)
+            self.categories[column] = [str(value) for value in categorical.categories]
+
+        self.startup_costs = df['startup_costs'].to_numpy(dtype=np.int64)
+        self.revenue_potential = df['revenue_potential'].to_numpy(dtype=np.int64)
+        self.success_probability = df['success_probability'].to_numpy(dtype=np.float32)
+
+        # Row ids (ascending, i.e. dataset order) per business type and per investment range
+        if indexes is not None:
+            self.type_rows = {value: np.asarray(rows, dtype=np.int64)
+                              for value, rows in indexes['business_type'].items()}
+            range_rows = {value: np.asarray(rows, dtype=np.int64)
+                          for value, rows in indexes['investment_range'].items()}
+        else:
+            self.type_rows = self._rows_by_value('business_type')
+            range_rows = self._rows_by_value('investment_range')
+
+        self.budget_rows = {}
+        for _, label, low, high in BUDGET_BUCKETS:
+            rows = range_rows.get(label, np.empty(0, dtype=np.int64))
+            # Additional filter by actual startup costs to ensure accuracy
+            costs = self.startup_costs[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if low is not None:
+                mask &= costs > low
+            if high is not None:
+                mask &= costs <= high
+            self.budget_rows[label] = rows[mask]
+
+        # Advice written offline by dataset_enrichment.py; serving only reads its side file
+        enrichments = load_enrichments(enrichment_path(csv_path))
+        self.insights = [
+            enrichments.get(enrichment_key(dict(zip(INPUT_COLUMNS, values))))
+            for values in zip(*(df[column] for column in INPUT_COLUMNS))
+        ] if enrichments else [None] * self.size
+
+        # Each row's markdown card is rendered once; responses only join cached fragments
+        self.cards = [
+            f"{business_type}:**\n"
+            f"• **Location:** {location}\n"
+            f"• **Startup Cost:** {startup_costs:,} RWF\n"
+            f"• **Revenue Potential:** {revenue_potential:,} RWF per month\n"
+            f"• **Target Market:** {target_market}\n"
+            f"• **Skills Required:** {skills_required}\n"
+            f"• **Market Demand:** {market_demand}\n"
+            f"• **Competition:** {competition_level}\n"
+            + (f"• **Insight:** {summary(insight)}\n" if insight else "")
+            + "\n"
+            for business_type, location, startup_costs, revenue_potential, target_market,
+                skills_required, market_demand, competition_level, insight in zip(
+                    df['business_type'], df['location'], self.startup_costs.tolist(),
+                    self.revenue_potential.tolist(), df['target_market'], df['skills_required'],
+                    df['market_demand'], df['competition_level'], self.insights)
+        ]
+
+        self._query_cache = {}
+
+    def _rows_by_value(self, column):
+        codes = self.codes[column]
+        return {value: np.flatnonzero(codes == code) for code, value in enumerate(self.categories[column])}
+
+    def query(self, business_types=None, budget_label=None, limit=10):
+        """Row ids matching any of business_types and the budget bucket, in dataset order"""
+        key = (tuple(sorted(set(business_types))) if business_types is not None else None,
+               budget_label, limit)
+        rows = self._query_cache.get(key)
+        if rows is not None:
+            return rows
+
+        if business_types is not None:
+            selected = [self.type_rows[t] for t in key[0] if t in self.type_rows]
+            rows = np.unique(np.concatenate(selected)) if selected else np.empty(0, dtype=np.int64)
+        else:
+            rows = None
+
+        if budget_label is not None:
+            budget = self.budget_rows.get(budget_label, np.empty(0, dtype=np.int64))
+            rows = budget if rows is None else np.intersect1d(rows, budget, assume_unique=True)
+
+        if rows is None:
+            rows = np.arange(self.size)
+
+        rows = tuple(rows[:limit].tolist())
+        self._query_cache[key] = rows
+        return rows
+
+    def render_cards(self, rows):
+        """Numbered markdown list of the pre-rendered cards for rows"""
+        cards = self.cards
+        return ''.join([f"**{i}. {cards[row]}" for i, row in enumerate(rows, 1)])
+
+    def record(self, row):
+        """Field values for a single row"""
+        record = {column: self.categories[column][self.codes[column][row]] for column in CATEGORICAL_COLUMNS}
+        record['startup_costs'] = int(self.startup_costs[row])
+        record['revenue_potential'] = int(self.revenue_potential[row])
+        record['success_probability'] = float(self.success_probability[row])
+        record['insight'] = self.insights[row]
+        return record
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(csv_path=DEFAULT_DATASET_PATH, indexes=None):
+    """Process-wide store for csv_path, loaded on first use (with indexes, if given, from its model artifact)"""
+    key = os.path.abspath(csv_path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None:
+                store = _stores[key] = MusanzeDatasetStore(csv_path, indexes)
+    return store
@@ -1,14 +1,13 @@
-import pandas as pd
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-import joblib
 import re
 
+# pandas, scikit-learn and joblib are imported where they are used, so importing this
+# module stays cheap for callers that never build or run the model
+
 class MusanzeMLModel:
     def __init__(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.ensemble import RandomForestClassifier
+        
         self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.is_trained = False
@@ -21,6 +20,12 @@ class MusanzeMLModel:
     
     def train(self, csv_path):
         """Train the model with Musanze dataset"""
+        import pandas as pd
+        import joblib
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
+        
         try:
             # Load dataset
             df = pd.read_csv(csv_path)
@@ -89,6 +94,28 @@ class MusanzeMLModel:
         except Exception as e:
             return f"Prediction error: {e}"
 
+    def predict_many(self, user_inputs):
+        """Predict responses for a batch of inputs, returned in the same order"""
+        if not self.is_trained:
+            return ["Model not trained yet. Please train the model first."] * len(user_inputs)
+        
+        import pandas as pd
+        
+        try:
+            # Preprocess all inputs with vectorized string operations
+            processed = (pd.Series(user_inputs, dtype=object).astype(str).str.lower()
+                         .str.replace(r'[^a-zA-Z\s]', '', regex=True))
+            
+            # Vectorize and run the model once; labels are the most probable classes
+            X = self.vectorizer.transform(processed)
+            probabilities = self.model.predict_proba(X)
+            prediction_ids = self.model.classes_[probabilities.argmax(axis=1)]
+            
+            return [self.id_to_response[prediction_id] for prediction_id in prediction_ids]
+            
+        except Exception as e:
+            return [f"Prediction error: {e}"] * len(user_inputs)
+
 # Train the model
 if __name__ == "__main__":
     model = MusanzeMLModel()
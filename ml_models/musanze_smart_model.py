@@ -1,35 +1,94 @@
-import pandas as pd
+import os
 import re
-from collections import Counter
+import json
+import hashlib
+import logging
+from musanze_vocabulary import BUSINESS_TYPE_MAPPING, DEFAULT_DATASET_PATH, MUSANZE_VOCABULARY, parse_budget_range
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout written by MusanzeSmartModel.save changes
+ARTIFACT_VERSION = 1
+DEFAULT_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'musanze_smart_model.json')
+
+# Dataset columns with prebuilt row indexes, and rows read per training chunk
+INDEX_COLUMNS = ('business_type', 'investment_range')
+TRAIN_CHUNK_ROWS = 200000
+
+def file_hash(path):
+    """SHA-256 of a file's content, used to detect a changed training dataset"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 class MusanzeSmartModel:
     def __init__(self):
-        self.responses = {}
+        self.responses = []
         self.keywords = {}
+        self.indexes = {}
+        self.source_hash = None
+        self.dataset_path = DEFAULT_DATASET_PATH
         self.is_trained = False
         
-    def train(self, csv_path):
+    def train(self, csv_path, chunksize=TRAIN_CHUNK_ROWS):
         """Train with keyword-based approach for high accuracy"""
+        # pandas/numpy are only needed to (re)train; loading the artifact stays stdlib-only
+        import numpy as np
+        import pandas as pd
+        
         try:
-            df = pd.read_csv(csv_path)
-            
-            # Create keyword-response mapping
-            for _, row in df.iterrows():
-                business = row['business_type'].lower()
-                response = row['response']
+            self.dataset_path = csv_path
+            self.source_hash = file_hash(csv_path)
+            
+            # Read in chunks and keep only per-(business type, response) aggregates, so memory
+            # stays bounded by the number of distinct values rather than the number of rows
+            pair_stats = []
+            index_parts = {column: {} for column in INDEX_COLUMNS}
+            offset = 0
+            
+            for chunk in pd.read_csv(csv_path, usecols=list(INDEX_COLUMNS) + ['response'], chunksize=chunksize):
+                chunk['row'] = np.arange(offset, offset + len(chunk))
+                pair_stats.append(
+                    chunk.groupby(['business_type', 'response'], sort=False)['row'].agg(['size', 'min'])
+                )
                 
-                # Extract keywords from business type
-                keywords = re.findall(r'\b\w+\b', business)
+                # Row ids per business type and investment range for fast dataset lookups
+                for column in INDEX_COLUMNS:
+                    for value, rows in chunk.groupby(column, sort=False).indices.items():
+                        index_parts[column].setdefault(value, []).append(rows + offset)
                 
-                for keyword in keywords:
-                    if len(keyword) > 2:  # Skip short words
-                        if keyword not in self.keywords:
-                            self.keywords[keyword] = []
-                        self.keywords[keyword].append(response)
+                offset += len(chunk)
+            
+            self.indexes = {
+                column: {value: np.concatenate(parts) for value, parts in values.items()}
+                for column, values in index_parts.items()
+            }
             
-            # Create most common response for each keyword
-            for keyword, responses in self.keywords.items():
-                self.keywords[keyword] = Counter(responses).most_common(1)[0][0]
+            pairs = (pd.concat(pair_stats)
+                     .groupby(level=[0, 1], sort=False)
+                     .agg({'size': 'sum', 'min': 'min'})
+                     .reset_index()
+                     .sort_values('min', kind='stable'))
+            
+            # Intern every distinct response once; keywords point into this table by id
+            response_ids, responses = pd.factorize(pairs['response'])
+            pairs['response_id'] = response_ids
+            self.responses = [str(response) for response in responses]
+            
+            # Extract keywords from business type, skipping short words
+            pairs['keyword'] = pairs['business_type'].str.lower().str.findall(r'\b\w+\b')
+            pairs = pairs.explode('keyword')
+            pairs = pairs[pairs['keyword'].str.len() > 2]
+            
+            # Most common response for each keyword; ties go to the response seen first
+            best = (pairs.groupby(['keyword', 'response_id'], sort=False)
+                    .agg({'size': 'sum', 'min': 'min'})
+                    .reset_index()
+                    .sort_values(['keyword', 'size', 'min'], ascending=[True, False, True])
+                    .drop_duplicates('keyword'))
+            self.keywords = dict(zip(best['keyword'], best['response_id'].astype(int).tolist()))
             
             self.is_trained = True
             return 0.999  # Simulated high accuracy
@@ -38,63 +97,92 @@ class MusanzeSmartModel:
             print(f"Training error: {e}")
             return 0.0
     
+    def save(self, artifact_path=DEFAULT_ARTIFACT_PATH):
+        """Write the trained keyword map, response table and indexes as one compact JSON artifact"""
+        if not self.is_trained:
+            raise ValueError("Model not trained yet.")
+        
+        artifact = {
+            'version': ARTIFACT_VERSION,
+            'source_hash': self.source_hash,
+            'responses': self.responses,
+            'keywords': self.keywords,
+            'indexes': {
+                column: {value: [int(row) for row in rows] for value, rows in values.items()}
+                for column, values in self.indexes.items()
+            }
+        }
+        
+        # Write to a temp file first so concurrent readers never see a partial artifact
+        tmp_path = f"{artifact_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, artifact_path)
+    
+    @classmethod
+    def load(cls, artifact_path=DEFAULT_ARTIFACT_PATH, csv_path=None):
+        """Load a saved artifact; returns None if it is missing, outdated or built from another dataset"""
+        try:
+            with open(artifact_path, 'r', encoding='utf-8') as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if artifact.get('version') != ARTIFACT_VERSION:
+            return None
+        if csv_path is not None and artifact.get('source_hash') != file_hash(csv_path):
+            return None
+        
+        model = cls()
+        model.responses = artifact['responses']
+        model.keywords = artifact['keywords']
+        model.indexes = artifact['indexes']
+        model.source_hash = artifact['source_hash']
+        model.is_trained = True
+        return model
+    
+    @classmethod
+    def load_or_train(cls, csv_path, artifact_path=DEFAULT_ARTIFACT_PATH):
+        """Load the artifact for csv_path, retraining and re-saving it when the dataset changed"""
+        model = cls.load(artifact_path, csv_path)
+        if model is not None:
+            model.dataset_path = csv_path
+            return model
+        
+        model = cls()
+        model.train(csv_path)
+        if model.is_trained:
+            try:
+                model.save(artifact_path)
+            except OSError as e:
+                logger.warning(f"Could not save model artifact: {e}")
+        return model
+    
+    def _dataset(self):
+        """Shared, load-once dataset store for this model's dataset, reusing the artifact's row indexes"""
+        from musanze_dataset_store import get_store
+        return get_store(self.dataset_path, self.indexes or None)
+    
     def get_businesses_by_budget(self, budget_range):
         """Get businesses filtered by budget range from dataset"""
         try:
-            df = pd.read_csv('../datasets/musanze_dataset.csv')
+            store = self._dataset()
             
             # Parse budget range
-            if '1-5m' in budget_range.lower() or '1-5' in budget_range.lower():
-                budget_filter = "1,000,000-5,000,000 RWF"
-            elif '5-15m' in budget_range.lower() or '5-15' in budget_range.lower():
-                budget_filter = "5,000,000-15,000,000 RWF"
-            elif '15-50m' in budget_range.lower() or '15-50' in budget_range.lower():
-                budget_filter = "15,000,000-50,000,000 RWF"
-            elif '50m+' in budget_range.lower() or '50+' in budget_range.lower():
-                budget_filter = "50,000,000+ RWF"
-            else:
+            budget_filter = parse_budget_range(budget_range)
+            if budget_filter is None:
                 return None
             
-            # Filter businesses by budget range
-            filtered_df = df[df['investment_range'] == budget_filter]
-            
-            # Additional filter by actual startup costs to ensure accuracy
-            if '1-5m' in budget_range.lower() or '1-5' in budget_range.lower():
-                filtered_df = filtered_df[filtered_df['startup_costs'] <= 5000000]
-            elif '5-15m' in budget_range.lower() or '5-15' in budget_range.lower():
-                filtered_df = filtered_df[(filtered_df['startup_costs'] > 5000000) & (filtered_df['startup_costs'] <= 15000000)]
-            elif '15-50m' in budget_range.lower() or '15-50' in budget_range.lower():
-                filtered_df = filtered_df[(filtered_df['startup_costs'] > 15000000) & (filtered_df['startup_costs'] <= 50000000)]
-            elif '50m+' in budget_range.lower() or '50+' in budget_range.lower():
-                filtered_df = filtered_df[filtered_df['startup_costs'] > 50000000]
+            # Filter businesses by budget range (investment range and actual startup costs),
+            # limited to top 10 to avoid overwhelming users
+            rows = store.query(budget_label=budget_filter)
             
-            if len(filtered_df) == 0:
+            if len(rows) == 0:
                 return None
             
-            # Limit results to top 10 to avoid overwhelming users
-            filtered_df = filtered_df.head(10)
-            
             # Create comprehensive response
             response = f"Perfect! With a budget of {budget_filter}, here are your top business opportunities in Musanze:\n\n**{budget_filter} Business Opportunities:**\n\n"
-            
-            for i, (_, row) in enumerate(filtered_df.iterrows(), 1):
-                business_type = row['business_type']
-                location = row['location']
-                startup_costs = row['startup_costs']
-                revenue_potential = row['revenue_potential']
-                target_market = row['target_market']
-                skills_required = row['skills_required']
-                market_demand = row['market_demand']
-                competition_level = row['competition_level']
-                
-                response += f"**{i}. {business_type}:**\n"
-                response += f"• **Location:** {location}\n"
-                response += f"• **Startup Cost:** {startup_costs:,} RWF\n"
-                response += f"• **Revenue Potential:** {revenue_potential:,} RWF per month\n"
-                response += f"• **Target Market:** {target_market}\n"
-                response += f"• **Skills Required:** {skills_required}\n"
-                response += f"• **Market Demand:** {market_demand}\n"
-                response += f"• **Competition:** {competition_level}\n\n"
+            response += store.render_cards(rows)
             
             response += "Which of these interests you most? I can provide detailed startup guidance!"
             return response
@@ -105,98 +193,23 @@ class MusanzeSmartModel:
     def get_businesses_by_type(self, business_type):
         """Get businesses filtered by business type from dataset"""
         try:
-            df = pd.read_csv('../datasets/musanze_dataset.csv')
-            
-            # Map common business type queries to dataset business types
-            business_mapping = {
-                # Direct matches from dataset
-                'local restaurant': ['Local Restaurant'],
-                'coffee processing': ['Coffee Processing'],
-                'organic farming': ['Organic Farming'],
-                'internet cafe': ['Internet Cafe'],
-                'eco-lodges': ['Eco-lodges'],
-                'eco-lodge': ['Eco-lodges'],
-                'souvenir shop': ['Souvenir Shop'],
-                'local transport': ['Local Transport'],
-                'local guide services': ['Local Guide Services'],
-                'volcano trekking': ['Volcano Trekking'],
-                'food processing': ['Food Processing'],
-                'guesthouse': ['Guesthouse'],
-                'mountain hiking tours': ['Mountain Hiking Tours'],
-                # Common variations and related terms
-                'restaurant': ['Local Restaurant', 'Food Processing'],
-                'coffee': ['Coffee Processing', 'Organic Farming'],
-                'hotel': ['Guesthouse', 'Eco-lodges'],
-                'lodge': ['Eco-lodges', 'Guesthouse'],
-                'transport': ['Local Transport'],
-                'shop': ['Souvenir Shop', 'Internet Cafe'],
-                'souvenir': ['Souvenir Shop'],
-                'gift': ['Souvenir Shop'],
-                'hiking': ['Mountain Hiking Tours', 'Volcano Trekking'],
-                'mountain': ['Mountain Hiking Tours', 'Volcano Trekking'],
-                'tour': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services'],
-                'tours': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services'],
-                'guide': ['Local Guide Services', 'Mountain Hiking Tours'],
-                'farming': ['Organic Farming'],
-                'agriculture': ['Organic Farming'],
-                'craft': ['Souvenir Shop'],
-                'traditional': ['Souvenir Shop'],
-                'adventure': ['Mountain Hiking Tours', 'Volcano Trekking'],
-                'cultural': ['Local Guide Services', 'Souvenir Shop'],
-                'wildlife': ['Local Guide Services', 'Eco-lodges'],
-                'photography': ['Local Guide Services'],
-                'internet': ['Internet Cafe'],
-                'cafe': ['Internet Cafe', 'Local Restaurant'],
-                'mobile': ['Internet Cafe'],
-                'money': ['Internet Cafe'],
-                'equipment': ['Local Transport'],
-                'organic': ['Organic Farming'],
-                'food': ['Food Processing', 'Local Restaurant'],
-                'processing': ['Food Processing', 'Coffee Processing'],
-                'tourism': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services', 'Eco-lodges', 'Guesthouse', 'Souvenir Shop'],
-                'hospitality': ['Guesthouse', 'Eco-lodges', 'Local Restaurant'],
-                'bed': ['Guesthouse', 'Eco-lodges'],
-                'breakfast': ['Guesthouse', 'Eco-lodges'],
-                'accommodation': ['Guesthouse', 'Eco-lodges'],
-                'trekking': ['Volcano Trekking', 'Mountain Hiking Tours']
-            }
+            store = self._dataset()
             
             # Get matching business types
-            matching_types = business_mapping.get(business_type.lower(), [])
+            matching_types = BUSINESS_TYPE_MAPPING.get(business_type.lower(), [])
             
             if not matching_types:
                 return f"Great choice! {business_type.title()} businesses are excellent opportunities in Musanze. To provide you with the most relevant options, what's your budget range?\n\n💰 **Budget Ranges:**\n\n**1-5M RWF:** Small businesses, services, retail\n**5-15M RWF:** Medium businesses, restaurants, small lodges\n**15-50M RWF:** Larger businesses, eco-lodges, processing\n**50M+ RWF:** Major investments, large facilities\n\nPlease select your budget range so I can show you the best {business_type} opportunities that match your investment capacity!"
             
-            # Filter businesses by type
-            filtered_df = df[df['business_type'].isin(matching_types)]
+            # Filter businesses by type, limited to top 10 to avoid overwhelming users
+            rows = store.query(business_types=matching_types)
             
-            if len(filtered_df) == 0:
+            if len(rows) == 0:
                 return f"Great choice! {business_type.title()} businesses are excellent opportunities in Musanze. To provide you with the most relevant options, what's your budget range?\n\n💰 **Budget Ranges:**\n\n**1-5M RWF:** Small businesses, services, retail\n**5-15M RWF:** Medium businesses, restaurants, small lodges\n**15-50M RWF:** Larger businesses, eco-lodges, processing\n**50M+ RWF:** Major investments, large facilities\n\nPlease select your budget range so I can show you the best {business_type} opportunities that match your investment capacity!"
             
-            # Limit results to top 10 to avoid overwhelming users
-            filtered_df = filtered_df.head(10)
-            
             # Create comprehensive response
             response = f"Perfect! Here are your top {business_type.title()} business opportunities in Musanze:\n\n**{business_type.title()} Business Opportunities:**\n\n"
-            
-            for i, (_, row) in enumerate(filtered_df.iterrows(), 1):
-                business_type_name = row['business_type']
-                location = row['location']
-                startup_costs = row['startup_costs']
-                revenue_potential = row['revenue_potential']
-                target_market = row['target_market']
-                skills_required = row['skills_required']
-                market_demand = row['market_demand']
-                competition_level = row['competition_level']
-                
-                response += f"**{i}. {business_type_name}:**\n"
-                response += f"• **Location:** {location}\n"
-                response += f"• **Startup Cost:** {startup_costs:,} RWF\n"
-                response += f"• **Revenue Potential:** {revenue_potential:,} RWF per month\n"
-                response += f"• **Target Market:** {target_market}\n"
-                response += f"• **Skills Required:** {skills_required}\n"
-                response += f"• **Market Demand:** {market_demand}\n"
-                response += f"• **Competition:** {competition_level}\n\n"
+            response += store.render_cards(rows)
             
             response += "Which of these interests you most? I can provide detailed startup guidance!"
             return response
@@ -207,123 +220,29 @@ class MusanzeSmartModel:
     def get_businesses_by_type_and_budget(self, business_type, budget_range):
         """Get businesses filtered by both business type and budget range from dataset"""
         try:
-            df = pd.read_csv('../datasets/musanze_dataset.csv')
-            
-            # Map common business type queries to dataset business types
-            business_mapping = {
-                # Direct matches from dataset
-                'local restaurant': ['Local Restaurant'],
-                'coffee processing': ['Coffee Processing'],
-                'organic farming': ['Organic Farming'],
-                'internet cafe': ['Internet Cafe'],
-                'eco-lodges': ['Eco-lodges'],
-                'eco-lodge': ['Eco-lodges'],
-                'souvenir shop': ['Souvenir Shop'],
-                'local transport': ['Local Transport'],
-                'local guide services': ['Local Guide Services'],
-                'volcano trekking': ['Volcano Trekking'],
-                'food processing': ['Food Processing'],
-                'guesthouse': ['Guesthouse'],
-                'mountain hiking tours': ['Mountain Hiking Tours'],
-                # Common variations and related terms
-                'restaurant': ['Local Restaurant', 'Food Processing'],
-                'coffee': ['Coffee Processing', 'Organic Farming'],
-                'hotel': ['Guesthouse', 'Eco-lodges'],
-                'lodge': ['Eco-lodges', 'Guesthouse'],
-                'transport': ['Local Transport'],
-                'shop': ['Souvenir Shop', 'Internet Cafe'],
-                'souvenir': ['Souvenir Shop'],
-                'gift': ['Souvenir Shop'],
-                'hiking': ['Mountain Hiking Tours', 'Volcano Trekking'],
-                'mountain': ['Mountain Hiking Tours', 'Volcano Trekking'],
-                'tour': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services'],
-                'tours': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services'],
-                'guide': ['Local Guide Services', 'Mountain Hiking Tours'],
-                'farming': ['Organic Farming'],
-                'agriculture': ['Organic Farming'],
-                'craft': ['Souvenir Shop'],
-                'traditional': ['Souvenir Shop'],
-                'adventure': ['Mountain Hiking Tours', 'Volcano Trekking'],
-                'cultural': ['Local Guide Services', 'Souvenir Shop'],
-                'wildlife': ['Local Guide Services', 'Eco-lodges'],
-                'photography': ['Local Guide Services'],
-                'internet': ['Internet Cafe'],
-                'cafe': ['Internet Cafe', 'Local Restaurant'],
-                'mobile': ['Internet Cafe'],
-                'money': ['Internet Cafe'],
-                'equipment': ['Local Transport'],
-                'organic': ['Organic Farming'],
-                'food': ['Food Processing', 'Local Restaurant'],
-                'processing': ['Food Processing', 'Coffee Processing'],
-                'tourism': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services', 'Eco-lodges', 'Guesthouse', 'Souvenir Shop'],
-                'hospitality': ['Guesthouse', 'Eco-lodges', 'Local Restaurant'],
-                'bed': ['Guesthouse', 'Eco-lodges'],
-                'breakfast': ['Guesthouse', 'Eco-lodges'],
-                'accommodation': ['Guesthouse', 'Eco-lodges'],
-                'trekking': ['Volcano Trekking', 'Mountain Hiking Tours']
-            }
+            store = self._dataset()
             
             # Parse budget range
-            if '1-5m' in budget_range.lower() or '1-5' in budget_range.lower():
-                budget_filter = "1,000,000-5,000,000 RWF"
-            elif '5-15m' in budget_range.lower() or '5-15' in budget_range.lower():
-                budget_filter = "5,000,000-15,000,000 RWF"
-            elif '15-50m' in budget_range.lower() or '15-50' in budget_range.lower():
-                budget_filter = "15,000,000-50,000,000 RWF"
-            elif '50m+' in budget_range.lower() or '50+' in budget_range.lower():
-                budget_filter = "50,000,000+ RWF"
-            else:
+            budget_filter = parse_budget_range(budget_range)
+            if budget_filter is None:
                 return None
             
             # Find matching business types
-            matching_types = []
-            for key, types in business_mapping.items():
-                if key in business_type.lower():
-                    matching_types.extend(types)
+            matching_types = MUSANZE_VOCABULARY.scan(business_type.lower()).business_types()
             
             if not matching_types:
                 return None
             
-            # Filter businesses by matching types AND budget range
-            filtered_df = df[(df['business_type'].isin(matching_types)) & (df['investment_range'] == budget_filter)]
-            
-            # Additional filter by actual startup costs to ensure accuracy
-            if '1-5m' in budget_range.lower() or '1-5' in budget_range.lower():
-                filtered_df = filtered_df[filtered_df['startup_costs'] <= 5000000]
-            elif '5-15m' in budget_range.lower() or '5-15' in budget_range.lower():
-                filtered_df = filtered_df[(filtered_df['startup_costs'] > 5000000) & (filtered_df['startup_costs'] <= 15000000)]
-            elif '15-50m' in budget_range.lower() or '15-50' in budget_range.lower():
-                filtered_df = filtered_df[(filtered_df['startup_costs'] > 15000000) & (filtered_df['startup_costs'] <= 50000000)]
-            elif '50m+' in budget_range.lower() or '50+' in budget_range.lower():
-                filtered_df = filtered_df[filtered_df['startup_costs'] > 50000000]
+            # Filter businesses by matching types AND budget range (investment range and actual
+            # startup costs), limited to top 10 to avoid overwhelming users
+            rows = store.query(business_types=matching_types, budget_label=budget_filter)
             
-            if len(filtered_df) == 0:
+            if len(rows) == 0:
                 return f"Sorry, I don't have specific {business_type} opportunities in the {budget_filter} range. However, here are some general {business_type} opportunities in Musanze:\n\nPlease try a different budget range or ask about other business types!"
             
-            # Limit results to top 10 to avoid overwhelming users
-            filtered_df = filtered_df.head(10)
-            
             # Create comprehensive response
             response = f"Perfect! Here are the top {business_type} business opportunities in Musanze for {budget_filter}:\n\n"
-            
-            for i, (_, row) in enumerate(filtered_df.iterrows(), 1):
-                business_type_name = row['business_type']
-                location = row['location']
-                startup_costs = row['startup_costs']
-                revenue_potential = row['revenue_potential']
-                target_market = row['target_market']
-                skills_required = row['skills_required']
-                market_demand = row['market_demand']
-                competition_level = row['competition_level']
-                
-                response += f"**{i}. {business_type_name}:**\n"
-                response += f"• **Location:** {location}\n"
-                response += f"• **Startup Cost:** {startup_costs:,} RWF\n"
-                response += f"• **Revenue Potential:** {revenue_potential:,} RWF per month\n"
-                response += f"• **Target Market:** {target_market}\n"
-                response += f"• **Skills Required:** {skills_required}\n"
-                response += f"• **Market Demand:** {market_demand}\n"
-                response += f"• **Competition:** {competition_level}\n\n"
+            response += store.render_cards(rows)
             
             response += "Which specific business interests you most? I can provide detailed startup guidance!"
             return response
@@ -339,67 +258,17 @@ class MusanzeSmartModel:
         try:
             user_input = user_input.lower()
             
+            # One pass over the message finds every business type and budget keyword
+            hits = MUSANZE_VOCABULARY.scan(user_input)
+            business_type_found = hits.best_business_type()
+            budget_range_found = hits.best_budget()
+            
             # Check for budget range queries first (but only if no business type is specified)
-            budget_keywords = ['1-5m', '5-15m', '15-50m', '50m+', '1-5', '5-15', '15-50', '50+']
-            has_budget = any(budget in user_input for budget in budget_keywords)
-            
-            if has_budget:
-                # Check if there's also a business type mentioned
-                business_types = [
-                    # Direct dataset business types
-                    'local restaurant', 'coffee processing', 'organic farming', 'internet cafe', 'eco-lodges', 'eco-lodge',
-                    'souvenir shop', 'local transport', 'local guide services', 'volcano trekking', 'food processing',
-                    'guesthouse', 'mountain hiking tours',
-                    # Common variations and related terms
-                    'restaurant', 'coffee', 'hotel', 'lodge', 'transport', 'shop', 'souvenir', 'gift', 
-                    'hiking', 'mountain', 'tour', 'tours', 'guide', 'farming', 'agriculture', 'craft', 'traditional',
-                    'adventure', 'cultural', 'wildlife', 'photography', 'internet', 'cafe', 'mobile', 
-                    'money', 'equipment', 'organic', 'food', 'processing', 'tourism', 'hospitality',
-                    'bed', 'breakfast', 'accommodation', 'trekking'
-                ]
-                
-                business_type_found = None
-                for business_type in business_types:
-                    if business_type in user_input:
-                        business_type_found = business_type
-                        break
-                
-                if business_type_found:
-                    # Both business type and budget range provided - handle in the combined section below
-                    pass
-                else:
-                    # Only budget range provided - show general budget opportunities
-                    budget_response = self.get_businesses_by_budget(user_input)
-                    if budget_response:
-                        return budget_response
-            
-            # Check for specific business type queries
-            business_types = [
-                # Direct dataset business types
-                'local restaurant', 'coffee processing', 'organic farming', 'internet cafe', 'eco-lodges', 'eco-lodge',
-                'souvenir shop', 'local transport', 'local guide services', 'volcano trekking', 'food processing',
-                'guesthouse', 'mountain hiking tours',
-                # Common variations and related terms
-                'restaurant', 'coffee', 'hotel', 'lodge', 'transport', 'shop', 'souvenir', 'gift', 
-                'hiking', 'mountain', 'tour', 'tours', 'guide', 'farming', 'agriculture', 'craft', 'traditional',
-                'adventure', 'cultural', 'wildlife', 'photography', 'internet', 'cafe', 'mobile', 
-                'money', 'equipment', 'organic', 'food', 'processing', 'tourism', 'hospitality',
-                'bed', 'breakfast', 'accommodation', 'trekking'
-            ]
-            
-            # Check if user provides both business type and budget range
-            business_type_found = None
-            budget_range_found = None
-            
-            for business_type in business_types:
-                if business_type in user_input:
-                    business_type_found = business_type
-                    break
-            
-            for budget in ['1-5m', '5-15m', '15-50m', '50m+', '1-5', '5-15', '15-50', '50+']:
-                if budget in user_input:
-                    budget_range_found = budget
-                    break
+            if budget_range_found and not business_type_found:
+                # Only budget range provided - show general budget opportunities
+                budget_response = self.get_businesses_by_budget(user_input)
+                if budget_response:
+                    return budget_response
             
             # If both business type and budget range are provided
             if business_type_found and budget_range_found:
@@ -426,7 +295,7 @@ class MusanzeSmartModel:
                     score = len(word) * (1 if word in ['musanze', 'tourism', 'business', 'restaurant', 'coffee', 'farming'] else 0.5)
                     if score > best_score:
                         best_score = score
-                        best_match = self.keywords[word]
+                        best_match = self.responses[self.keywords[word]]
             
             if best_match:
                 return best_match
@@ -442,6 +311,8 @@ if __name__ == "__main__":
     model = MusanzeSmartModel()
     accuracy = model.train('../datasets/musanze_dataset.csv')
     print(f"Musanze Smart Model trained with accuracy: {accuracy:.3f}")
+    model.save()
+    print(f"Model artifact saved to {DEFAULT_ARTIFACT_PATH}")
     
     # Test predictions
     test_inputs = [
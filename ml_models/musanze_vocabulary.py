@@ -0,0 +1,172 @@
+"""
+Musanze Vocabulary
+Business-type and budget keywords used to route chat messages, compiled once
+into a single trie-shaped regular expression so one pass over a message finds
+every keyword hit regardless of how large the vocabulary grows
+"""
+
+import re
+from collections import namedtuple
+
+DEFAULT_DATASET_PATH = '../datasets/musanze_dataset.csv'
+
+# Map common business type queries to dataset business types.
+# Order is priority: when several keys occur in a message the earliest key wins.
+BUSINESS_TYPE_MAPPING = {
+    # Direct matches from dataset
+    'local restaurant': ['Local Restaurant'],
+    'coffee processing': ['Coffee Processing'],
+    'organic farming': ['Organic Farming'],
+    'internet cafe': ['Internet Cafe'],
+    'eco-lodges': ['Eco-lodges'],
+    'eco-lodge': ['Eco-lodges'],
+    'souvenir shop': ['Souvenir Shop'],
+    'local transport': ['Local Transport'],
+    'local guide services': ['Local Guide Services'],
+    'volcano trekking': ['Volcano Trekking'],
+    'food processing': ['Food Processing'],
+    'guesthouse': ['Guesthouse'],
+    'mountain hiking tours': ['Mountain Hiking Tours'],
+    # Common variations and related terms
+    'restaurant': ['Local Restaurant', 'Food Processing'],
+    'coffee': ['Coffee Processing', 'Organic Farming'],
+    'hotel': ['Guesthouse', 'Eco-lodges'],
+    'lodge': ['Eco-lodges', 'Guesthouse'],
+    'transport': ['Local Transport'],
+    'shop': ['Souvenir Shop', 'Internet Cafe'],
+    'souvenir': ['Souvenir Shop'],
+    'gift': ['Souvenir Shop'],
+    'hiking': ['Mountain Hiking Tours', 'Volcano Trekking'],
+    'mountain': ['Mountain Hiking Tours', 'Volcano Trekking'],
+    'tour': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services'],
+    'tours': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services'],
+    'guide': ['Local Guide Services', 'Mountain Hiking Tours'],
+    'farming': ['Organic Farming'],
+    'agriculture': ['Organic Farming'],
+    'craft': ['Souvenir Shop'],
+    'traditional': ['Souvenir Shop'],
+    'adventure': ['Mountain Hiking Tours', 'Volcano Trekking'],
+    'cultural': ['Local Guide Services', 'Souvenir Shop'],
+    'wildlife': ['Local Guide Services', 'Eco-lodges'],
+    'photography': ['Local Guide Services'],
+    'internet': ['Internet Cafe'],
+    'cafe': ['Internet Cafe', 'Local Restaurant'],
+    'mobile': ['Internet Cafe'],
+    'money': ['Internet Cafe'],
+    'equipment': ['Local Transport'],
+    'organic': ['Organic Farming'],
+    'food': ['Food Processing', 'Local Restaurant'],
+    'processing': ['Food Processing', 'Coffee Processing'],
+    'tourism': ['Mountain Hiking Tours', 'Volcano Trekking', 'Local Guide Services', 'Eco-lodges', 'Guesthouse', 'Souvenir Shop'],
+    'hospitality': ['Guesthouse', 'Eco-lodges', 'Local Restaurant'],
+    'bed': ['Guesthouse', 'Eco-lodges'],
+    'breakfast': ['Guesthouse', 'Eco-lodges'],
+    'accommodation': ['Guesthouse', 'Eco-lodges'],
+    'trekking': ['Volcano Trekking', 'Mountain Hiking Tours']
+}
+
+# Budget range keywords, in priority order
+BUDGET_KEYWORDS = ('1-5m', '5-15m', '15-50m', '50m+', '1-5', '5-15', '15-50', '50+')
+
+# (query fragments, investment_range label, startup cost lower bound (exclusive), upper bound (inclusive)),
+# checked in order so '1-5' wins over the ranges that come after it
+BUDGET_BUCKETS = (
+    (('1-5m', '1-5'), "1,000,000-5,000,000 RWF", None, 5000000),
+    (('5-15m', '5-15'), "5,000,000-15,000,000 RWF", 5000000, 15000000),
+    (('15-50m', '15-50'), "15,000,000-50,000,000 RWF", 15000000, 50000000),
+    (('50m+', '50+'), "50,000,000+ RWF", 50000000, None),
+)
+
+def parse_budget_range(budget_range):
+    """Map a free-text budget query onto an investment_range label, or None"""
+    budget_range = budget_range.lower()
+    for fragments, label, _, _ in BUDGET_BUCKETS:
+        if any(fragment in budget_range for fragment in fragments):
+            return label
+    return None
+
+Hit = namedtuple('Hit', ['keyword', 'start', 'end'])
+
+def _trie_regex(keywords):
+    """Build a regex matching the longest keyword at a position, shaped as a trie of literals"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: longer keywords are optional, and tried first
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return emit(trie)
+
+class KeywordHits:
+    """Every business-type and budget keyword found in one message"""
+
+    def __init__(self, business, budget, vocabulary):
+        self.business = business
+        self.budget = budget
+        self._vocabulary = vocabulary
+
+    def best_business_type(self):
+        """Highest-priority business-type keyword in the message, or None"""
+        if not self.business:
+            return None
+        return min((hit.keyword for hit in self.business), key=self._vocabulary.business_priority.__getitem__)
+
+    def best_budget(self):
+        """Highest-priority budget keyword in the message, or None"""
+        if not self.budget:
+            return None
+        return min((hit.keyword for hit in self.budget), key=self._vocabulary.budget_priority.__getitem__)
+
+    def business_types(self):
+        """Dataset business types of every business-type keyword found"""
+        mapping = self._vocabulary.business_mapping
+        types = []
+        for keyword in sorted({hit.keyword for hit in self.business}, key=self._vocabulary.business_priority.__getitem__):
+            types.extend(mapping[keyword])
+        return types
+
+class Vocabulary:
+    """Business-type mapping and budget keywords compiled into one matcher"""
+
+    def __init__(self, business_mapping=BUSINESS_TYPE_MAPPING, budget_keywords=BUDGET_KEYWORDS):
+        self.business_mapping = business_mapping
+        self.business_priority = {keyword: i for i, keyword in enumerate(business_mapping)}
+        self.budget_priority = {keyword: i for i, keyword in enumerate(budget_keywords)}
+
+        keywords = set(self.business_priority) | set(self.budget_priority)
+
+        # Every keyword starting where a longer keyword starts is one of its prefixes
+        self._prefixes = {
+            keyword: [keyword[:i] for i in range(1, len(keyword) + 1) if keyword[:i] in keywords]
+            for keyword in keywords
+        }
+
+        # Zero-width lookahead so matches starting inside another match are still found
+        self._pattern = re.compile('(?=(' + _trie_regex(keywords) + '))')
+
+    def scan(self, text):
+        """Find every keyword occurrence (overlapping ones included) in a single pass over text"""
+        business = []
+        budget = []
+        for match in self._pattern.finditer(text):
+            start = match.start(1)
+            for keyword in self._prefixes[match.group(1)]:
+                hit = Hit(keyword, start, start + len(keyword))
+                if keyword in self.business_priority:
+                    business.append(hit)
+                if keyword in self.budget_priority:
+                    budget.append(hit)
+        return KeywordHits(business, budget, self)
+
+MUSANZE_VOCABULARY = Vocabulary()
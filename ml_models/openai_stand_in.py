@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+InnoStart OpenAI Stand-in
+Local OpenAI-compatible server for offline performance tests: /chat/completions
+(streaming included) with configurable latency distributions, error rates, 429s
+with Retry-After, and canned business-idea and market-analysis payloads
+
+Usage: python openai_stand_in.py [--port 8080] [--latency-ms 300] [--error-rate 0.05] ...
+then point the integrations at it with OPENAI_BASE_URL=http://127.0.0.1:8080/v1
+"""
+
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'exponential', 'lognormal')
+
+# Advice answer, streamed one word per server-sent event
+ADVICE_TEXT = ("Start by validating demand with a small pilot, keep fixed costs low, and reinvest "
+               "early revenue before seeking outside funding. " * 4).strip()
+
+CANNED_IDEAS = [
+    {'title': 'Volcano Trek Outfitters', 'description': 'Guided treks and gear rental for visitors to the Virunga volcanoes.',
+     'category': 'Tourism', 'budget': 'Medium', 'difficulty': 'Medium',
+     'success_factors': ['Licensed guides', 'Hotel partnerships'], 'challenges': ['Seasonal demand']},
+    {'title': 'Highland Potato Processing', 'description': 'Crisps and frozen fries made from locally grown Irish potatoes.',
+     'category': 'Agribusiness', 'budget': 'High', 'difficulty': 'Hard',
+     'success_factors': ['Farmer contracts', 'Cold chain'], 'challenges': ['Equipment cost']},
+    {'title': 'Mobile Money Kiosk', 'description': 'Cash-in, cash-out and airtime services at a busy market stall.',
+     'category': 'Financial Services', 'budget': 'Low', 'difficulty': 'Easy',
+     'success_factors': ['Foot traffic', 'Float management'], 'challenges': ['Thin margins']},
+    {'title': 'Eco Lodge Catering', 'description': 'Farm-to-table meals supplied to lodges around the national park.',
+     'category': 'Hospitality', 'budget': 'Medium', 'difficulty': 'Medium',
+     'success_factors': ['Consistent quality', 'Lodge contracts'], 'challenges': ['Logistics']},
+    {'title': 'Craft Coffee Roastery', 'description': 'Small-batch roasting of Rwandan highland coffee for cafes and tourists.',
+     'category': 'Food & Beverage', 'budget': 'Medium', 'difficulty': 'Medium',
+     'success_factors': ['Bean sourcing', 'Branding'], 'challenges': ['Export competition']},
+]
+
+CANNED_MARKET_ANALYSIS = {
+    'market_size': 'Medium, growing with tourist arrivals',
+    'target_customers': 'Tourists, lodges and local middle-income households',
+    'competition': 'A few informal competitors, no dominant brand',
+    'trends': 'Rising tourism and demand for local products',
+    'challenges': 'Seasonality and access to finance',
+    'success_probability': 7
+}
+
+
+def completion_text(payload: Dict) -> str:
+    """Canned answer for a chat completion request, chosen by its system prompt"""
+    system = ' '.join(m.get('content') or '' for m in payload.get('messages') or [] if m.get('role') == 'system')
+    # The market analyst's prompt also mentions business ideas, so it is matched first
+    if 'market research' in system:
+        return json.dumps(CANNED_MARKET_ANALYSIS)
+    if 'business ideas' in system:
+        return json.dumps(CANNED_IDEAS)
+    return ADVICE_TEXT
+
+
+class LatencyModel:
+    """Samples time to first token around mean_ms; spread is the relative width (or lognormal sigma)"""
+
+    def __init__(self, mean_ms: float = 0.0, distribution: str = 'fixed', spread: float = 0.5,
+                 rng: Optional[random.Random] = None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.mean = mean_ms / 1000
+        self.distribution = distribution
+        self.spread = spread
+        self.rng = rng or random.Random()
+
+    def sample(self) -> float:
+        if self.mean <= 0 or self.distribution == 'fixed':
+            return max(self.mean, 0.0)
+        if self.distribution == 'uniform':
+            return self.rng.uniform(self.mean * (1 - self.spread), self.mean * (1 + self.spread))
+        if self.distribution == 'exponential':
+            return self.rng.expovariate(1 / self.mean)
+        # Mean-preserving lognormal: a long tail of slow requests
+        return self.mean * self.rng.lognormvariate(-self.spread ** 2 / 2, self.spread)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded server holding the fault-injection settings and request counters"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, address: Tuple[str, int], latency_ms: float = 0.0, latency_distribution: str = 'fixed',
+                 latency_spread: float = 0.5, token_delay_ms: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rps: float = 0.0, retry_after: float = 1.0, seed: Optional[int] = None):
+        super().__init__(address, StandInHandler)
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency_ms, latency_distribution, latency_spread, self.rng)
+        self.token_delay = token_delay_ms / 1000
+        self.error_rate = error_rate
+        self.rate_limit_rps = rate_limit_rps
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.counters = {'requests': 0, 'rate_limited': 0, 'errors': 0, 'streamed': 0,
+                         'in_flight': 0, 'max_in_flight': 0}
+
+    def admit(self, stream: bool) -> Tuple[str, float]:
+        """('ok' | 'rate_limited' | 'error', latency) for the next completion; draws are serialized for seeding"""
+        with self.lock:
+            now = time.monotonic()
+            while self.recent and self.recent[0] <= now - 1.0:
+                self.recent.popleft()
+            if self.rate_limit_rps and len(self.recent) >= self.rate_limit_rps:
+                self.counters['rate_limited'] += 1
+                return 'rate_limited', 0.0
+
+            self.recent.append(now)
+            self.counters['requests'] += 1
+            self.counters['in_flight'] += 1
+            self.counters['max_in_flight'] = max(self.counters['max_in_flight'], self.counters['in_flight'])
+            latency = self.latency.sample()
+            if self.error_rate and self.rng.random() < self.error_rate:
+                self.counters['errors'] += 1
+                return 'error', latency
+            if stream:
+                self.counters['streamed'] += 1
+            return 'ok', latency
+
+    def release(self) -> None:
+        """An admitted completion has been answered"""
+        with self.lock:
+            self.counters['in_flight'] -= 1
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return dict(self.counters)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; avoid delayed-ACK stalls on kept-alive sockets
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/stats'):
+            # Counters for call-count assertions in benchmarks
+            return self.send_json(200, self.server.stats())
+        if self.path.rstrip('/').endswith('/models'):
+            return self.send_json(200, {'object': 'list', 'data': [{'id': 'gpt-3.5-turbo', 'object': 'model'}]})
+        self.send_json(404, {'error': {'type': 'not_found', 'message': f"No route for {self.path}"}})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self.send_json(404, {'error': {'type': 'not_found', 'message': f"No route for {self.path}"}})
+
+        outcome, latency = self.server.admit(bool(payload.get('stream')))
+        try:
+            if outcome == 'rate_limited':
+                return self.send_json(429, {'error': {'type': 'rate_limit_exceeded', 'message': 'Rate limit reached'}},
+                                      {'Retry-After': f"{self.server.retry_after:g}"})
+            time.sleep(latency)
+            if outcome == 'error':
+                return self.send_json(500, {'error': {'type': 'server_error', 'message': 'Injected failure'}})
+
+            text = completion_text(payload)
+            tokens = [word + ' ' for word in text.split(' ')]
+            tokens[-1] = tokens[-1].rstrip(' ')
+            if payload.get('stream'):
+                return self.stream_completion(payload, tokens)
+
+            # A whole answer arrives once every token has been generated
+            time.sleep((len(tokens) - 1) * self.server.token_delay)
+            prompt_tokens = sum(len(m.get('content') or '') for m in payload.get('messages') or []) // 4
+            self.send_json(200, {
+                'id': f"chatcmpl-standin{self.server.counters['requests']}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': payload.get('model', 'gpt-3.5-turbo'),
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': len(tokens),
+                          'total_tokens': prompt_tokens + len(tokens)}
+            })
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (e.g. a deadline benchmark); nothing to answer
+            self.close_connection = True
+        finally:
+            if outcome != 'rate_limited':
+                self.server.release()
+
+    def stream_completion(self, payload: Dict, tokens):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i and self.server.token_delay:
+                time.sleep(self.server.token_delay)
+            chunk = {'object': 'chat.completion.chunk', 'model': payload.get('model', 'gpt-3.5-turbo'),
+                     'choices': [{'index': 0, 'delta': {'content': token}}]}
+            self.write_chunk(b'data: ' + json.dumps(chunk).encode() + b'\n\n')
+        self.write_chunk(b'data: [DONE]\n\n')
+        self.write_chunk(b'')
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b'\r\n')
+        self.wfile.flush()
+
+    def send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+        encoded = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(port_queue, host: str, port: int, options: Dict) -> None:
+    server = StandInServer((host, port), **options)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def serve_in_process(host: str = DEFAULT_HOST, port: int = 0, **options):
+    """Run a stand-in in its own process, so it does not share the caller's GIL; returns (process, port)
+
+    options are StandInServer's keyword arguments (latency_ms, error_rate, seed, ...).
+    """
+    import multiprocessing
+
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(port_queue, host, port, options), daemon=True)
+    process.start()
+    return process, port_queue.get(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local OpenAI-compatible stand-in for offline performance tests')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Host to bind')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to bind')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Mean time to first token')
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='fixed',
+                        help='Distribution of the time to first token')
+    parser.add_argument('--latency-spread', type=float, default=0.5,
+                        help='Relative spread (uniform) or sigma (lognormal) of the latency')
+    parser.add_argument('--token-delay-ms', type=float, default=0.0, help='Time per further token')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of completions answered with a 500')
+    parser.add_argument('--rate-limit-rps', type=float, default=0.0,
+                        help='Completions per second before answering 429 (0: unlimited)')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with a 429')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for latency and error draws')
+
+    args = parser.parse_args()
+
+    server = StandInServer((args.host, args.port), latency_ms=args.latency_ms,
+                           latency_distribution=args.latency_distribution, latency_spread=args.latency_spread,
+                           token_delay_ms=args.token_delay_ms, error_rate=args.error_rate,
+                           rate_limit_rps=args.rate_limit_rps, retry_after=args.retry_after, seed=args.seed)
+    logger.info(f"OpenAI stand-in listening on http://{args.host}:{server.server_address[1]}/v1")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("OpenAI stand-in stopped by user")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+InnoStart Prompt Builder
+Compact chat completion prompts: static instructions compiled once, context
+serialized without whitespace and filtered to the keys that matter, local token
+counting, and trimming to an input token budget
+"""
+
+import os
+import re
+import json
+import logging
+import textwrap
+from typing import Any, Dict, Optional, Sequence
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Prompt tokens allowed per request (system + user messages) unless the caller sets a budget
+DEFAULT_INPUT_BUDGET = int(os.getenv('INNOSTART_PROMPT_TOKEN_BUDGET', '800'))
+DEFAULT_MODEL = 'gpt-3.5-turbo'
+
+# Per-message framing tokens of the chat format, and the reply primer
+MESSAGE_OVERHEAD = 4
+REPLY_OVERHEAD = 3
+
+# Words, numbers, and single punctuation marks: roughly what a BPE vocabulary splits into
+_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+_encoding = None
+
+
+def _tiktoken_encoding():
+    """cl100k_base when tiktoken is installed, else False; looked up once"""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding('cl100k_base')
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Tokens in text: exact with tiktoken, else a local estimate
+
+    The estimate counts a token per short word, digit group or punctuation mark and
+    splits long words every 6 letters, which tracks cl100k_base on English prose far
+    better than characters / 4 (and over- rather than under-counts JSON).
+    """
+    if not text:
+        return 0
+    encoding = _tiktoken_encoding()
+    if encoding:
+        return len(encoding.encode(text))
+    return sum(1 + (len(piece) - 1) // 6 for piece in _PIECES.findall(text))
+
+
+def count_message_tokens(messages: Sequence[Dict]) -> int:
+    """Prompt tokens of a chat completion's messages, including the chat format's framing"""
+    return sum(MESSAGE_OVERHEAD + count_tokens(message.get('content') or '') for message in messages) + REPLY_OVERHEAD
+
+
+def compact_context(context: Optional[Dict], keys: Optional[Sequence[str]] = None,
+                    max_value_chars: int = 200) -> Dict:
+    """Context reduced to keys (in that order) with empty values dropped and long strings cut"""
+    if not context:
+        return {}
+    compacted = {}
+    for key in keys if keys is not None else context:
+        value = context.get(key)
+        if value is None or value == '' or value == [] or value == {}:
+            continue
+        if isinstance(value, str) and len(value) > max_value_chars:
+            value = value[:max_value_chars].rstrip() + '…'
+        compacted[key] = value
+    return compacted
+
+
+def dumps_compact(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def _truncate_words(text: str, tokens: int) -> str:
+    """Longest word prefix of text within tokens (by count_tokens), marked with an ellipsis"""
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(' '.join(words[:middle]) + '…') <= tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return ' '.join(words[:low]) + '…' if low < len(words) else text
+
+
+class PromptTemplate:
+    """A chat completion whose system message and instructions are fixed
+
+    The user message is one "Label: value" line per field, then the compact context,
+    then the instructions. When the prompt exceeds its input budget, context keys go
+    first (least relevant, i.e. last in context_keys, first), then the trimmable
+    fields are cut down word by word in order.
+    """
+
+    def __init__(self, system: str, instructions: str, fields: Sequence[str],
+                 context_keys: Optional[Sequence[str]] = None, context_label: str = 'Context',
+                 trimmable: Sequence[str] = (), max_tokens: int = 400, temperature: float = 0.7,
+                 model: str = DEFAULT_MODEL):
+        self.system = ' '.join(system.split())
+        self.instructions = textwrap.dedent(instructions).strip()
+        self.fields = tuple(fields)
+        self.context_keys = tuple(context_keys) if context_keys is not None else None
+        self.trimmable = tuple(trimmable)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.model = model
+
+        self._labels = {field: field.replace('_', ' ').capitalize() + ': ' for field in self.fields}
+        self._context_prefix = context_label + ': '
+        # Tokens that never change, counted once
+        self.static_tokens = (2 * MESSAGE_OVERHEAD + REPLY_OVERHEAD + count_tokens(self.system)
+                              + count_tokens(self.instructions))
+
+    def _head(self, values: Dict[str, str], context: Dict) -> str:
+        lines = [self._labels[field] + values[field] for field in self.fields if field in values]
+        if context:
+            lines.append(self._context_prefix + dumps_compact(context))
+        return '\n'.join(lines)
+
+    def render(self, values: Dict[str, Any], context: Optional[Dict] = None,
+               budget: Optional[int] = None) -> str:
+        """User message for values and context, trimmed to budget prompt tokens in all"""
+        budget = DEFAULT_INPUT_BUDGET if budget is None else budget
+        values = {field: str(values[field]) for field in self.fields if values.get(field) not in (None, '')}
+        context = compact_context(context, self.context_keys)
+
+        # Only the variable head is counted; the instructions' tokens are in static_tokens
+        head = self._head(values, context)
+        used = self.static_tokens + count_tokens(head)
+        while used > budget and context:
+            context.pop(next(reversed(context)))
+            head = self._head(values, context)
+            used = self.static_tokens + count_tokens(head)
+
+        for field in self.trimmable:
+            if used <= budget:
+                break
+            if field in values:
+                values[field] = _truncate_words(values[field], max(0, count_tokens(values[field]) - (used - budget)))
+                head = self._head(values, context)
+                used = self.static_tokens + count_tokens(head)
+
+        if used > budget:
+            logger.warning(f"Prompt needs {used} tokens, over its {budget}-token budget after trimming")
+        return head + '\n' + self.instructions if head else self.instructions
+
+    def request(self, values: Dict[str, Any], context: Optional[Dict] = None, budget: Optional[int] = None,
+                stream: bool = False) -> Dict:
+        """Chat completion payload for values and context"""
+        data = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system},
+                {"role": "user", "content": self.render(values, context, budget)}
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+        if stream:
+            data["stream"] = True
+        return data
+
+
+def usage_tokens(payload: Dict, result: Optional[Dict]) -> Dict[str, int]:
+    """Input and output tokens of a completion: the API's usage block, else counted locally"""
+    usage = (result or {}).get('usage') or {}
+    if 'prompt_tokens' in usage:
+        return {'input_tokens': usage['prompt_tokens'], 'output_tokens': usage.get('completion_tokens', 0)}
+    output = ''
+    for choice in (result or {}).get('choices') or []:
+        output += (choice.get('message') or {}).get('content') or ''
+    return {'input_tokens': count_message_tokens(payload.get('messages') or []),
+            'output_tokens': count_tokens(output)}
+
+
+def log_usage(name: str, payload: Dict, result: Optional[Dict]) -> Dict[str, int]:
+    """Log a completion's token counts next to its output cap, warning when it hit the cap; returns the counts"""
+    tokens = usage_tokens(payload, result)
+    logger.info(f"{name}: {tokens['input_tokens']} input tokens, {tokens['output_tokens']} output tokens "
+                f"(max_tokens {payload.get('max_tokens')})")
+    if any(choice.get('finish_reason') == 'length' for choice in (result or {}).get('choices') or []):
+        # A cut-off answer is often unparseable JSON that quietly turns into a fallback
+        logger.warning(f"{name} truncated at max_tokens {payload.get('max_tokens')}")
+    return tokens
+
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+InnoStart Rate Limiter
+Client-side scheduler for OpenAI calls: paces requests to requests-per-minute and
+tokens-per-minute buckets, serves interactive callers before batch jobs, and retries
+429s after Retry-After (or jittered exponential backoff) within the caller's deadline
+"""
+
+import os
+import time
+import heapq
+import random
+import itertools
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from prompt_builder import count_message_tokens
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+DEFAULT_REQUESTS_PER_MINUTE = 3500.0
+DEFAULT_TOKENS_PER_MINUTE = 90000.0
+
+# Upper edges of the stats() histograms
+WAIT_BINS_MS = (1, 10, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+DEPTH_BINS = (1, 2, 5, 10, 20, 50, 100, float('inf'))
+
+
+class RateLimitTimeout(TimeoutError):
+    """No request slot could be had before the caller's deadline"""
+
+
+def estimate_tokens(payload: Dict) -> int:
+    """Tokens a chat completion may consume: its prompt tokens, counted locally, plus max_tokens"""
+    return count_message_tokens(payload.get('messages') or []) + int(payload.get('max_tokens') or 16)
+
+
+class _Bucket:
+    """Token bucket refilled continuously at per_minute / 60 per second; 0 means unlimited"""
+
+    def __init__(self, per_minute: float, burst_seconds: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float, now: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        # A request larger than the whole bucket goes once the bucket is full, leaving it in debt
+        return max(0.0, (min(amount, self.capacity) - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        if self.rate > 0:
+            self.level -= amount
+
+
+def _histogram(bins, counts) -> Dict[str, int]:
+    lower = 0
+    histogram = {}
+    for upper, count in zip(bins, counts):
+        histogram[f"{lower}-{upper}" if upper != float('inf') else f"{lower}+"] = count
+        lower = upper
+    return histogram
+
+
+class RateLimitScheduler:
+    """Admits requests in priority order (lower first, FIFO within a priority) as both buckets allow.
+
+    The buckets hold burst_seconds worth of their per-minute limit, since the API enforces
+    limits over windows much shorter than a minute. A 429 pauses every caller until its
+    Retry-After has passed, because the limit it reports is shared by all of them.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE, burst_seconds: float = 1.0,
+                 max_retries: int = 4, base_backoff: float = 0.5, max_backoff: float = 20.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._requests = _Bucket(requests_per_minute, burst_seconds)
+        self._tokens = _Bucket(tokens_per_minute, burst_seconds)
+        self._paused_until = 0.0
+        self._waiters = []  # heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+        self.admitted = 0
+        self.throttled = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.max_queue_depth = 0
+        self._wait_counts = [0] * len(WAIT_BINS_MS)
+        self._depth_counts = [0] * len(DEPTH_BINS)
+
+    def acquire(self, tokens: int, deadline: Optional[float] = None,
+                priority: int = PRIORITY_INTERACTIVE) -> float:
+        """Block until the request may go; returns the seconds waited.
+
+        deadline is a time.monotonic() value; raises RateLimitTimeout once it is clear
+        the slot would come too late.
+        """
+        started = time.monotonic()
+        entry = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiters, entry)
+            self._record(DEPTH_BINS, self._depth_counts, len(self._waiters))
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None  # callers behind the head wait for it to leave
+                    if self._waiters[0] == entry:
+                        wait = max(self._paused_until - now, self._requests.wait_time(1, now),
+                                   self._tokens.wait_time(tokens, now))
+                        if wait <= 0:
+                            self._requests.take(1)
+                            self._tokens.take(tokens)
+                            self.admitted += 1
+                            break
+                    if deadline is not None:
+                        if now + (wait or 0.0) > deadline:
+                            self.timeouts += 1
+                            raise RateLimitTimeout(f"No OpenAI request slot within {deadline - started:.2f}s")
+                        wait = deadline - now if wait is None else wait
+                    self._condition.wait(wait)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+            waited = time.monotonic() - started
+            self._record(WAIT_BINS_MS, self._wait_counts, waited * 1000)
+        return waited
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for seconds, e.g. after a 429"""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    def call(self, send: Callable[[Optional[float]], Any], tokens: int, deadline: Optional[float] = None,
+             priority: int = PRIORITY_INTERACTIVE):
+        """Run send(timeout) for a requests-style response once admitted, retrying 429s while the deadline allows
+
+        The last 429 response is returned when no retry fits before the deadline.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, deadline, priority)
+            remaining = None if deadline is None else max(0.001, deadline - time.monotonic())
+            response = send(remaining)
+            if response.status_code != 429:
+                return response
+
+            with self._condition:
+                self.throttled += 1
+            delay = self._retry_delay(response, attempt)
+            if attempt == self.max_retries or (deadline is not None and time.monotonic() + delay >= deadline):
+                return response
+            response.close()
+            self.pause(delay)
+            with self._condition:
+                self.retries += 1
+        return response
+
+    def _retry_delay(self, response, attempt: int) -> float:
+        """Retry-After when the server sent one (plus a little jitter), else full-jitter exponential backoff"""
+        retry_after = response.headers.get('Retry-After')
+        try:
+            seconds = float(retry_after)
+        except (TypeError, ValueError):
+            return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+        return seconds + random.uniform(0, 0.1 * seconds)
+
+    @staticmethod
+    def _record(bins, counts, value: float) -> None:
+        for i, upper in enumerate(bins):
+            if value <= upper:
+                counts[i] += 1
+                return
+
+    def stats(self) -> Dict:
+        """Admission and 429 counters, current queue depth, and queue depth / wait time histograms"""
+        with self._condition:
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'queue_depth': len(self._waiters),
+                'max_queue_depth': self.max_queue_depth,
+                'admitted': self.admitted,
+                'throttled': self.throttled,
+                'retries': self.retries,
+                'timeouts': self.timeouts,
+                'queue_depth_histogram': _histogram(DEPTH_BINS, self._depth_counts),
+                'wait_ms_histogram': _histogram(WAIT_BINS_MS, self._wait_counts)
+            }
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(base_url: str, api_key: Optional[str] = None) -> RateLimitScheduler:
+    """Process-wide scheduler for (base_url, api_key), since the limits belong to the key
+
+    Limits come from INNOSTART_OPENAI_RPM / INNOSTART_OPENAI_TPM; 0 lifts a limit.
+    """
+    key = (base_url.rstrip('/'), api_key)
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        with _schedulers_lock:
+            scheduler = _schedulers.get(key)
+            if scheduler is None:
+                scheduler = _schedulers[key] = RateLimitScheduler(
+                    float(os.getenv('INNOSTART_OPENAI_RPM', DEFAULT_REQUESTS_PER_MINUTE)),
+                    float(os.getenv('INNOSTART_OPENAI_TPM', DEFAULT_TOKENS_PER_MINUTE))
+                )
+    return scheduler
+
+
+def _reset_after_fork() -> None:
+    # A parent thread may have held a scheduler lock at fork time
+    global _schedulers_lock
+    _schedulers.clear()
+    _schedulers_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
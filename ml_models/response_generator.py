@@ -6,21 +6,24 @@ Generates tailored business responses based on user input using trained ML model
 
 import os
 import json
-import pickle
 import logging
 from typing import Dict, List, Tuple, Optional
 import re
 import random
 from datetime import datetime
+from ttl_cache import LRUTTLCache, canonical_hash
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+STOP_WORDS = {'how', 'do', 'i', 'what', 'is', 'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'my', 'me', 'we', 'you', 'your'}
+
 class BusinessResponseGenerator:
     """Generates tailored business responses based on user input"""
     
-    def __init__(self, model_path: str = "ml_models/business_response_model.pkl"):
+    def __init__(self, model_path: str = "ml_models/business_response_model",
+                 deterministic: bool = False, cache: Optional[LRUTTLCache] = None):
         self.model = None
         self.vectorizer = None
         self.label_encoder = None
@@ -28,6 +31,11 @@ class BusinessResponseGenerator:
         self.model_path = model_path
         self.response_templates = {}
         
+        # Deterministic mode seeds template choices per (question, context), so identical
+        # requests produce identical answers and can be served from the cache
+        self.deterministic = deterministic
+        self.cache = cache
+        
         # Load model if it exists
         if os.path.exists(model_path):
             self.load_model()
@@ -35,11 +43,15 @@ class BusinessResponseGenerator:
         else:
             logger.warning(f"Model not found at {model_path}. Please train the model first.")
     
-    def load_model(self) -> None:
-        """Load the trained model"""
+    def load_model(self, model_path: Optional[str] = None) -> None:
+        """Load the trained model from an artifact directory (or a legacy pickle)"""
+        from model_artifact import load_model_data
+        
+        if model_path is not None:
+            self.model_path = model_path
         try:
-            with open(self.model_path, 'rb') as f:
-                model_data = pickle.load(f)
+            # Artifact arrays are memory-mapped, so workers share one copy of the weights
+            model_data = load_model_data(self.model_path)
             
             self.model = model_data['model']
             self.vectorizer = model_data['vectorizer']
@@ -172,34 +184,52 @@ class BusinessResponseGenerator:
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text"""
         keywords = re.findall(r'\b\w+\b', text.lower())
-        stop_words = {'how', 'do', 'i', 'what', 'is', 'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'my', 'me', 'we', 'you', 'your'}
-        keywords = [word for word in keywords if word not in stop_words and len(word) > 2]
+        keywords = [word for word in keywords if word not in STOP_WORDS and len(word) > 2]
         return keywords
     
+    def _extract_keywords_batch(self, questions: List[str]) -> List[List[str]]:
+        """Extract keywords from many questions with vectorized string operations"""
+        import pandas as pd
+        
+        words = pd.Series(questions, dtype=object).str.lower().str.findall(r'\b\w+\b').explode()
+        words = words[(words.str.len() > 2) & ~words.isin(STOP_WORDS)]
+        keywords = words.groupby(level=0).agg(list)
+        return [keywords.get(i, []) for i in range(len(questions))]
+    
     def predict_category(self, question: str) -> Tuple[str, float]:
         """Predict the category for a given question"""
+        return self.predict_categories([question], [self._extract_keywords(question)])[0]
+    
+    def vectorize(self, questions: List[str], keywords: Optional[List[List[str]]] = None):
+        """TF-IDF rows the classifier sees for each question (question text plus its keywords)"""
+        if keywords is None:
+            keywords = self._extract_keywords_batch(questions)
+        combined_texts = [question + ' ' + ' '.join(words) for question, words in zip(questions, keywords)]
+        return self.vectorizer.transform(combined_texts)
+    
+    def predict_categories(self, questions: List[str],
+                           keywords: Optional[List[List[str]]] = None) -> List[Tuple[str, float]]:
+        """Predict categories for many questions with one vectorizer pass and one model call"""
         if self.model is None:
             # Fallback to rule-based classification
-            return self._fallback_classification(question)
+            return [self._fallback_classification(question) for question in questions]
         
         try:
-            # Preprocess question
-            keywords = self._extract_keywords(question)
-            combined_text = question + ' ' + ' '.join(keywords)
-            
-            # Vectorize
-            X = self.vectorizer.transform([combined_text])
+            # Preprocess questions
+            X = self.vectorize(questions, keywords)
             
-            # Predict
-            prediction = self.model.predict(X)[0]
-            probability = self.model.predict_proba(X)[0].max()
+            # Predict once; the label is the most probable class
+            probabilities = self.model.predict_proba(X)
+            best = probabilities.argmax(axis=1)
+            predictions = self.model.classes_[best]
+            confidences = probabilities[range(len(best)), best]
             
-            category = self.label_encoder.inverse_transform([prediction])[0]
+            categories = self.label_encoder.inverse_transform(predictions)
             
-            return category, probability
+            return [(str(category), float(confidence)) for category, confidence in zip(categories, confidences)]
         except Exception as e:
             logger.error(f"Error in prediction: {e}")
-            return self._fallback_classification(question)
+            return [self._fallback_classification(question) for question in questions]
     
     def _fallback_classification(self, question: str) -> Tuple[str, float]:
         """Fallback classification using keyword matching"""
@@ -237,17 +267,86 @@ class BusinessResponseGenerator:
                 'timestamp': datetime.now().isoformat()
             }
         
+        cache_key = self._cache_key(question, context) if self.cache is not None else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return self._stamp(cached)
+        
         # Predict category
         category, confidence = self.predict_category(question)
         
+        result = self._assemble_response(question, category, confidence, context, self._extract_keywords(question))
+        if cache_key is not None:
+            self.cache.set(cache_key, result)
+        return self._stamp(result)
+    
+    def generate_responses(self, questions: List[str], contexts: Optional[List[Optional[Dict]]] = None) -> List[Dict]:
+        """Generate responses for a batch of questions, classified together and returned in order"""
+        if contexts is None:
+            contexts = [None] * len(questions)
+        
+        # Blank questions and cache hits are answered directly; the rest is classified in one batch
+        results = [None] * len(questions)
+        pending = []
+        cache_keys = {}
+        for i, question in enumerate(questions):
+            if not question.strip():
+                results[i] = self.generate_response(question, contexts[i])
+                continue
+            if self.cache is not None:
+                cache_keys[i] = self._cache_key(question, contexts[i])
+                cached = self.cache.get(cache_keys[i])
+                if cached is not None:
+                    results[i] = self._stamp(cached)
+                    continue
+            pending.append(i)
+        
+        batch = [questions[i] for i in pending]
+        keywords = self._extract_keywords_batch(batch) if batch else []
+        predictions = self.predict_categories(batch, keywords) if batch else []
+        
+        for i, words, (category, confidence) in zip(pending, keywords, predictions):
+            result = self._assemble_response(questions[i], category, confidence, contexts[i], words)
+            if i in cache_keys:
+                self.cache.set(cache_keys[i], result)
+            results[i] = self._stamp(result)
+        
+        return results
+    
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """Case, punctuation and spacing do not change the classifier's input features"""
+        return ' '.join(re.findall(r'\w+', question.lower()))
+    
+    def _cache_key(self, question: str, context: Optional[Dict]) -> Tuple[str, str]:
+        return self._normalize_question(question), canonical_hash(context or {})
+    
+    def _rng(self, question: str, context: Optional[Dict]):
+        """Source of template choices: seeded per request in deterministic mode"""
+        if not self.deterministic:
+            return random
+        seed = canonical_hash([self._normalize_question(question), context or {}])
+        return random.Random(int(seed, 16))
+    
+    @staticmethod
+    def _stamp(result: Dict) -> Dict:
+        """Copy of a (possibly cached) response with a fresh timestamp"""
+        return dict(result, keywords=list(result['keywords']), timestamp=datetime.now().isoformat())
+    
+    def _assemble_response(self, question: str, category: str, confidence: float,
+                           context: Optional[Dict], keywords: List[str]) -> Dict:
+        """Build the response payload (without timestamp) from a predicted category"""
+        rng = self._rng(question, context)
+        
         # Generate response
         if category in self.response_templates:
             templates = self.response_templates[category]
             
             # Select random greeting and response
-            greeting = random.choice(templates['greeting'])
-            main_response = random.choice(templates['responses'])
-            tip = random.choice(templates['tips'])
+            greeting = rng.choice(templates['greeting'])
+            main_response = rng.choice(templates['responses'])
+            tip = rng.choice(templates['tips'])
             
             # Combine into full response
             full_response = f"{greeting}\n\n{main_response}\n\nPro Tip: {tip}"
@@ -259,14 +358,13 @@ class BusinessResponseGenerator:
                     full_response += f"\n\n{context_info}"
         else:
             # Generic response for unknown categories
-            full_response = self._generate_generic_response(question)
+            full_response = self._generate_generic_response(question, rng)
         
         return {
             'response': full_response,
             'category': category,
             'confidence': confidence,
-            'timestamp': datetime.now().isoformat(),
-            'keywords': self._extract_keywords(question)
+            'keywords': keywords
         }
     
     def _add_context_info(self, category: str, context: Dict) -> str:
@@ -291,7 +389,7 @@ class BusinessResponseGenerator:
         
         return context_info
     
-    def _generate_generic_response(self, question: str) -> str:
+    def _generate_generic_response(self, question: str, rng=random) -> str:
         """Generate a generic response for unknown categories"""
         generic_responses = [
             "That's a great question! Starting a business involves many considerations. I'd recommend focusing on understanding your market, building a strong foundation, and seeking advice from experienced entrepreneurs.",
@@ -300,7 +398,7 @@ class BusinessResponseGenerator:
             "Great question! The answer often depends on your specific business model and target market. Could you share more details about your business concept?"
         ]
         
-        return random.choice(generic_responses)
+        return rng.choice(generic_responses)
     
     def get_category_info(self, category: str) -> Dict:
         """Get information about a specific category"""
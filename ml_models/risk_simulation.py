@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+InnoStart Risk Simulation
+Monte Carlo counterpart of the financial projections: paths of revenue, growth
+and failure drawn from distributions fitted to the Musanze dataset, simulated
+in fixed-size chunks so memory does not grow with the number of paths, and
+summarized as cumulative profit percentile bands, break-even probability by
+month and value at risk
+
+Usage: python risk_simulation.py "Eco-lodges" [--location Kinigi] [--paths 100000] [--seed 1] [--workers 2]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import concurrent.futures
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from financial_projections import PARAMETER_DEFAULTS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Anchored to this file so callers outside ml_models (python/ai_integration.py) find it
+DATASET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'datasets', 'musanze_dataset.csv')
+
+DEFAULT_PATHS = 100_000
+DEFAULT_MONTHS = 60
+# Paths simulated at once; a chunk's arrays are chunk_size x months float64 each
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+DEFAULT_VAR_LEVELS = (0.95, 0.99)
+# Histogram bins per month; percentiles are read from these, so their error is about a bin width
+DEFAULT_BINS = 4096
+
+# Assumptions the dataset has no column for
+DEFAULT_ASSUMPTIONS = {
+    'growth_mean': PARAMETER_DEFAULTS['growth_rate'],  # mean monthly revenue growth, as in the projections
+    'growth_std': 0.02,      # spread of that growth rate between paths
+    'volatility': 0.15,      # month-to-month revenue noise (std of log revenue changes)
+    'expense_ratio': 0.6,    # monthly fixed costs, as a share of the business's median starting revenue
+    'monthly_expenses': None  # fixed monthly costs in RWF; overrides expense_ratio when set
+}
+# success_probability is read as the chance of still operating after this many months
+SUCCESS_HORIZON_MONTHS = 60
+
+
+def fit_distribution(revenue_potential: np.ndarray, startup_costs: np.ndarray,
+                     success_probability: np.ndarray) -> Dict:
+    """Lognormal revenue and startup costs, Beta success probability (method of moments) for dataset rows"""
+    log_revenue = np.log(np.asarray(revenue_potential, dtype=np.float64))
+    log_costs = np.log(np.asarray(startup_costs, dtype=np.float64))
+    success = np.clip(np.asarray(success_probability, dtype=np.float64), 1e-6, 1 - 1e-6)
+
+    mean, variance = float(success.mean()), float(success.var())
+    # Beta concentration alpha + beta; a constant column gets a near point mass
+    concentration = mean * (1 - mean) / variance - 1 if variance > 0 else 1e6
+    concentration = max(concentration, 1e-3)
+    return {
+        'rows': int(len(log_revenue)),
+        'revenue_log_mean': float(log_revenue.mean()),
+        'revenue_log_std': float(log_revenue.std()),
+        'revenue_median': float(np.exp(np.median(log_revenue))),
+        'startup_costs_log_mean': float(log_costs.mean()),
+        'startup_costs_log_std': float(log_costs.std()),
+        'success_alpha': mean * concentration,
+        'success_beta': (1 - mean) * concentration
+    }
+
+
+def business_distribution(business_type: str, location: Optional[str] = None,
+                          csv_path: str = DATASET_PATH) -> Dict:
+    """fit_distribution() over the dataset rows of business_type, and of location when given"""
+    from musanze_dataset_store import get_store
+
+    store = get_store(csv_path)
+    rows = store.type_rows.get(business_type)
+    if rows is None:
+        raise ValueError(f"Unknown business type: {business_type}")
+    if location is not None:
+        if location not in store.categories['location']:
+            raise ValueError(f"Unknown location: {location}")
+        code = store.categories['location'].index(location)
+        rows = rows[store.codes['location'][rows] == code]
+        if not len(rows):
+            raise ValueError(f"No {business_type} rows in {location}")
+    return fit_distribution(store.revenue_potential[rows], store.startup_costs[rows], store.success_probability[rows])
+
+
+def simulate_paths(distribution: Dict, assumptions: Dict, paths: int, months: int,
+                   rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """(cumulative profit, paths x months; failure month per path, 0 if it survives) for one chunk
+
+    Month 1 revenue is drawn from the revenue distribution; each later month grows
+    by the path's growth rate plus noise. A failed business stops earning and
+    spending from its failure month on, so its cumulative profit stays where it was.
+    """
+    revenue0 = np.exp(rng.normal(distribution['revenue_log_mean'], distribution['revenue_log_std'], paths))
+    investment = np.exp(rng.normal(distribution['startup_costs_log_mean'], distribution['startup_costs_log_std'],
+                                   paths))
+    growth = np.maximum(rng.normal(assumptions['growth_mean'], assumptions['growth_std'], paths), -0.99)
+    success = rng.beta(distribution['success_alpha'], distribution['success_beta'], paths)
+
+    # Constant monthly hazard that leaves success_probability alive after SUCCESS_HORIZON_MONTHS
+    hazard = 1 - success ** (1 / SUCCESS_HORIZON_MONTHS)
+    with np.errstate(divide='ignore'):
+        failure_month = np.floor(np.log(rng.random(paths)) / np.log1p(-hazard)) + 1
+    failure_month = np.where(failure_month <= months, failure_month, 0).astype(np.int64)
+
+    volatility = assumptions['volatility']
+    log_steps = rng.standard_normal((paths, months))
+    log_steps *= volatility
+    log_steps -= volatility ** 2 / 2
+    log_steps[:, 1:] += np.log1p(growth)[:, None]
+    revenue = np.exp(np.cumsum(log_steps, axis=1, out=log_steps), out=log_steps)
+    revenue *= revenue0[:, None]
+
+    expenses = assumptions['monthly_expenses']
+    if expenses is None:
+        expenses = assumptions['expense_ratio'] * distribution['revenue_median']
+    revenue -= expenses
+    month = np.arange(1, months + 1)
+    revenue[(failure_month[:, None] > 0) & (month >= failure_month[:, None])] = 0.0
+    cumulative_profit = np.cumsum(revenue, axis=1, out=revenue)
+    cumulative_profit -= investment[:, None]
+    return cumulative_profit, failure_month
+
+
+def histogram_edges(cumulative_profit: np.ndarray, margin: float = 0.5) -> np.ndarray:
+    """Per-month (low, high) histogram range from a pilot chunk, widened by margin x its span on both sides"""
+    low = cumulative_profit.min(axis=0)
+    high = cumulative_profit.max(axis=0)
+    span = np.maximum(high - low, 1.0)
+    return np.stack([low - margin * span, high + margin * span], axis=1)
+
+
+def accumulate(cumulative_profit: np.ndarray, failure_month: np.ndarray, edges: np.ndarray, bins: int) -> Dict:
+    """Fixed-size summary of a chunk; summaries of chunks merge by adding them up"""
+    paths, months = cumulative_profit.shape
+    width = (edges[:, 1] - edges[:, 0]) / bins
+    # Values outside a month's range land in its first or last bin
+    index = ((cumulative_profit - edges[:, 0]) / width).astype(np.int64)
+    np.clip(index, 0, bins - 1, out=index)
+    index += np.arange(months) * bins
+    broke_even = np.logical_or.accumulate(cumulative_profit >= 0, axis=1)
+    return {
+        'paths': paths,
+        'histogram': np.bincount(index.ravel(), minlength=months * bins).reshape(months, bins),
+        'profit_sum': cumulative_profit.sum(axis=0),
+        'broke_even': broke_even.sum(axis=0),
+        'failed': int(np.count_nonzero(failure_month))
+    }
+
+
+def merge(total: Dict, summary: Dict) -> Dict:
+    """Add a chunk's summary into total, in place"""
+    for key in total:
+        total[key] += summary[key]
+    return total
+
+
+def histogram_quantiles(histogram: np.ndarray, edges: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """len(quantiles) x months quantiles of per-month histograms, interpolated within the bin"""
+    months, bins = histogram.shape
+    width = (edges[:, 1] - edges[:, 0]) / bins
+    cumulative = np.cumsum(histogram, axis=1)
+    total = cumulative[:, -1:]
+    rows = np.arange(months)
+    result = np.empty((len(quantiles), months))
+    for i, quantile in enumerate(quantiles):
+        target = quantile * total
+        index = np.minimum((cumulative < target).sum(axis=1), bins - 1)
+        inside = histogram[rows, index]
+        before = cumulative[rows, index] - inside
+        fraction = np.where(inside > 0, (target[:, 0] - before) / np.maximum(inside, 1), 0.5)
+        result[i] = edges[:, 0] + (index + fraction) * width
+    return result
+
+
+def expected_shortfall(counts: np.ndarray, low: float, high: float, tail_share: float) -> float:
+    """Mean of the lowest tail_share of a histogram's values, taking values as spread evenly within a bin"""
+    width = (high - low) / len(counts)
+    tail = tail_share * counts.sum()
+    cumulative = np.cumsum(counts)
+    full = int(np.searchsorted(cumulative, tail, side='right'))
+    centers = low + (np.arange(full) + 0.5) * width
+    total = float((centers * counts[:full]).sum())
+    remaining = tail - (cumulative[full - 1] if full else 0)
+    if remaining > 0 and full < len(counts):
+        # The lowest remaining values of the bin the tail ends in
+        total += remaining * (low + (full + remaining / counts[full] / 2) * width)
+    return total / tail
+
+
+def _simulate_chunk(distribution: Dict, assumptions: Dict, paths: int, months: int, seed: np.random.SeedSequence,
+                    edges: np.ndarray, bins: int) -> Dict:
+    """One chunk from its own seed; module-level so process pool workers can run it"""
+    cumulative_profit, failure_month = simulate_paths(distribution, assumptions, paths, months,
+                                                      np.random.default_rng(seed))
+    return accumulate(cumulative_profit, failure_month, edges, bins)
+
+
+class RiskSimulation:
+    """Monte Carlo simulation of one business's cumulative profit over months
+
+    Paths are simulated chunk_size at a time. Every chunk has its own child of the
+    run's SeedSequence, so a seeded run gives the same result serially and across
+    any number of worker processes. Percentiles come from per-month histograms
+    whose range is set by the first chunk.
+    """
+
+    def __init__(self, distribution: Dict, months: int = DEFAULT_MONTHS, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 bins: int = DEFAULT_BINS, **assumptions):
+        unknown = set(assumptions) - set(DEFAULT_ASSUMPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown assumptions: {', '.join(sorted(unknown))}")
+        self.distribution = distribution
+        self.assumptions = dict(DEFAULT_ASSUMPTIONS, **assumptions)
+        self.months = months
+        self.chunk_size = chunk_size
+        self.bins = bins
+
+    def run(self, paths: int = DEFAULT_PATHS, seed: Optional[int] = None, workers: int = 1,
+            percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+            var_levels: Sequence[float] = DEFAULT_VAR_LEVELS) -> Dict:
+        """Simulate paths and summarize them
+
+        seed=None draws fresh entropy, reported as 'seed' so the run can be repeated.
+        workers > 1 spreads the chunks over that many processes.
+        """
+        if paths < 1:
+            raise ValueError("paths must be at least 1")
+        started = time.perf_counter()
+        seed_sequence = np.random.SeedSequence(seed)
+        sizes = [min(self.chunk_size, paths - start) for start in range(0, paths, self.chunk_size)]
+        seeds = seed_sequence.spawn(len(sizes))
+
+        # The first chunk sets the histogram range, then counts like every other chunk
+        cumulative_profit, failure_month = simulate_paths(self.distribution, self.assumptions, sizes[0],
+                                                          self.months, np.random.default_rng(seeds[0]))
+        edges = histogram_edges(cumulative_profit)
+        summary = accumulate(cumulative_profit, failure_month, edges, self.bins)
+        del cumulative_profit, failure_month
+
+        tasks = [(self.distribution, self.assumptions, size, self.months, chunk_seed, edges, self.bins)
+                 for size, chunk_seed in zip(sizes[1:], seeds[1:])]
+        # Chunk summaries are folded in as they arrive, so memory stays at a few chunks whatever paths is
+        if workers > 1 and tasks:
+            with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+                for chunk in executor.map(_simulate_chunk, *zip(*tasks)):
+                    merge(summary, chunk)
+        else:
+            for task in tasks:
+                merge(summary, _simulate_chunk(*task))
+        elapsed = time.perf_counter() - started
+
+        bands = histogram_quantiles(summary['histogram'], edges, [p / 100 for p in percentiles])
+        tails = histogram_quantiles(summary['histogram'][-1:], edges[-1:], [1 - level for level in var_levels])[:, 0]
+        return {
+            'paths': paths,
+            'months': self.months,
+            'seed': seed_sequence.entropy,
+            'distribution': self.distribution,
+            'assumptions': self.assumptions,
+            'cumulative_profit_bands': {f'p{p:g}': band.tolist() for p, band in zip(percentiles, bands)},
+            'mean_cumulative_profit': (summary['profit_sum'] / paths).tolist(),
+            'break_even_probability': (summary['broke_even'] / paths).tolist(),
+            'failure_probability': summary['failed'] / paths,
+            # Loss at the horizon not exceeded with the given confidence, negative when even that tail is a
+            # profit; expected_shortfall is the mean loss beyond it
+            'value_at_risk': {f'{level:g}': float(-tail) for level, tail in zip(var_levels, tails)},
+            'expected_shortfall': {
+                f'{level:g}': -float(expected_shortfall(summary['histogram'][-1], *edges[-1], 1 - level))
+                for level in var_levels
+            },
+            'elapsed_s': elapsed,
+            'paths_per_s': paths / elapsed
+        }
+
+
+def break_even_probability(result: Dict, month: int) -> float:
+    """Probability of having broken even by month (1-based) in a RiskSimulation.run() result"""
+    return result['break_even_probability'][min(month, result['months']) - 1]
+
+
+def simulate_business(business_type: str, location: Optional[str] = None, paths: int = DEFAULT_PATHS,
+                      months: int = DEFAULT_MONTHS, seed: Optional[int] = None, workers: int = 1,
+                      csv_path: str = DATASET_PATH, **assumptions) -> Dict:
+    """RiskSimulation of a dataset business type (optionally in one location)"""
+    distribution = business_distribution(business_type, location, csv_path)
+    result = RiskSimulation(distribution, months, **assumptions).run(paths, seed, workers)
+    result.update(business_type=business_type, location=location)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo risk simulation of a Musanze business')
+    parser.add_argument('business_type', help='Business type from the dataset, e.g. "Eco-lodges"')
+    parser.add_argument('--location', default=None, help='Only fit to rows from this location')
+    parser.add_argument('--paths', type=int, default=DEFAULT_PATHS, help='Paths to simulate')
+    parser.add_argument('--months', type=int, default=DEFAULT_MONTHS, help='Horizon in months')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for a reproducible run')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes')
+    parser.add_argument('--dataset', default=DATASET_PATH, help='Dataset CSV')
+    for name, default in DEFAULT_ASSUMPTIONS.items():
+        parser.add_argument('--' + name.replace('_', '-'), type=float, default=default)
+
+    args = parser.parse_args()
+    assumptions = {name: getattr(args, name) for name in DEFAULT_ASSUMPTIONS}
+    try:
+        result = simulate_business(args.business_type, args.location, args.paths, args.months, args.seed,
+                                   args.workers, args.dataset, **assumptions)
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    every_year = range(11, args.months, 12)
+    print(json.dumps({
+        'business_type': result['business_type'],
+        'location': result['location'],
+        'paths': result['paths'],
+        'seed': result['seed'],
+        'break_even_probability_by_year': {f'month {m + 1}': result['break_even_probability'][m] for m in every_year},
+        'final_cumulative_profit_bands': {name: band[-1] for name, band in result['cumulative_profit_bands'].items()},
+        'failure_probability': result['failure_probability'],
+        'value_at_risk': result['value_at_risk'],
+        'expected_shortfall': result['expected_shortfall'],
+        'paths_per_s': round(result['paths_per_s'])
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+InnoStart Routing Policy
+Decides per question whether the local answer is good enough or the remote
+model is worth its latency: menu intents and confidently classified questions
+stay local, ambiguous ones go upstream
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+
+LOCAL = 'local'
+REMOTE = 'remote'
+
+# Intents of the structured menu flow (see classifyUserIntent in api/chat.php), answered from templates
+MENU_INTENTS = frozenset({'greeting', 'help', 'export_request', 'business_opportunities', 'sector_inquiry'})
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+# Categories where a wrong stock answer costs more get a higher bar
+DEFAULT_CATEGORY_THRESHOLDS = {'legal': 0.9, 'financial': 0.85}
+
+
+def _median(values) -> float:
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2] if ordered else 0.0
+
+
+class RoutingPolicy:
+    """Routes a question LOCAL when its intent is allowlisted or the classifier is confident enough
+
+    thresholds maps a category to the confidence needed to answer it locally; other
+    categories use default_threshold. The intent is read from context['intent'].
+    With enabled=False every question goes REMOTE, as before routing existed.
+    """
+
+    def __init__(self, thresholds: Optional[Dict[str, float]] = None,
+                 default_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+                 local_intents: Iterable[str] = MENU_INTENTS, enabled: bool = True, window: int = 1000):
+        self.thresholds = dict(DEFAULT_CATEGORY_THRESHOLDS if thresholds is None else thresholds)
+        self.default_threshold = default_threshold
+        self.local_intents = frozenset(local_intents)
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self.routed = {'menu_intent': 0, 'confident': 0, 'ambiguous': 0}
+        # Recent answer latencies (seconds) per route, to estimate what local routing saves
+        self._latencies = {LOCAL: deque(maxlen=window), REMOTE: deque(maxlen=window)}
+        self._local_answered = 0
+
+    def threshold(self, category: str) -> float:
+        return self.thresholds.get(category, self.default_threshold)
+
+    def route(self, ml_response: Dict, context: Optional[Dict] = None) -> Tuple[str, str]:
+        """(LOCAL or REMOTE, reason) for the local model's answer; counts the decision"""
+        if not self.enabled:
+            return REMOTE, 'disabled'
+        intent = (context or {}).get('intent')
+        if intent in self.local_intents:
+            reason = 'menu_intent'
+        elif ml_response['confidence'] >= self.threshold(ml_response['category']):
+            reason = 'confident'
+        else:
+            reason = 'ambiguous'
+        with self._lock:
+            self.routed[reason] += 1
+        return (REMOTE if reason == 'ambiguous' else LOCAL), reason
+
+    def record(self, route: str, latency: float) -> None:
+        """Report how long an answer sent down route took"""
+        with self._lock:
+            self._latencies[route].append(latency)
+            if route == LOCAL:
+                self._local_answered += 1
+
+    def stats(self) -> Dict:
+        """Routing counts and shares, median latency per route and the estimated time saved
+
+        latency_saved_s assumes each locally answered question would have taken the
+        median remote latency instead of its local one.
+        """
+        with self._lock:
+            local = self.routed['menu_intent'] + self.routed['confident']
+            total = local + self.routed['ambiguous']
+            local_p50 = _median(self._latencies[LOCAL])
+            remote_p50 = _median(self._latencies[REMOTE])
+            saved = self._local_answered * max(0.0, remote_p50 - local_p50) if self._latencies[REMOTE] else 0.0
+            return {
+                'enabled': self.enabled,
+                'routed': dict(self.routed),
+                'local_share': local / total if total else 0.0,
+                'remote_share': self.routed['ambiguous'] / total if total else 0.0,
+                'local_p50_ms': local_p50 * 1000,
+                'remote_p50_ms': remote_p50 * 1000,
+                'latency_saved_s': saved
+            }
+
+
+def parse_thresholds(specs: Iterable[str]) -> Tuple[Optional[float], Dict[str, float]]:
+    """(default threshold or None, per-category thresholds) from "0.8" / "legal=0.9" strings"""
+    default = None
+    thresholds = {}
+    for spec in specs:
+        category, _, value = spec.rpartition('=')
+        if category:
+            thresholds[category] = float(value)
+        else:
+            default = float(value)
+    return default, thresholds
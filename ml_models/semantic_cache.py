@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+InnoStart Semantic Cache
+Near-duplicate answer cache: questions are matched by cosine similarity of their
+TF-IDF vectors within the same (category, context), using random-projection LSH
+so a lookup only compares against a handful of candidates
+"""
+
+import time
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ttl_cache import canonical_hash
+
+# Upper edges of the best-match similarity histogram reported by stats()
+SIMILARITY_BINS = (0.5, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99, 1.0)
+
+
+class SemanticCache:
+    """LRU cache of answers keyed by (TF-IDF vector, category, context), matched approximately
+
+    Each entry is hashed into n_tables buckets by the sign pattern of its vector against
+    n_bits random hyperplanes per table; similar vectors share a bucket in at least one
+    table with high probability. A lookup scores the union of its buckets' entries
+    (at most max_candidates) and returns the best one at or above threshold.
+    """
+
+    def __init__(self, dimensions: int, threshold: float = 0.9, n_tables: int = 8, n_bits: int = 14,
+                 maxsize: int = 100000, ttl: Optional[float] = 86400.0, max_candidates: int = 64,
+                 seed: int = 42):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_candidates = max_candidates
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((n_tables * n_bits, dimensions)).astype(np.float32)
+        self._bit_weights = 1 << np.arange(n_bits, dtype=np.int64)
+
+        self._entries = OrderedDict()  # id -> (vector dict, bucket keys, value, expires_at, partition key)
+        self._buckets = {}             # packed (partition, table, signature) -> set of ids
+        # (category, context hash) -> [partition id, live entries]; dropped with its last entry,
+        # so per-session contexts do not pile up. Ids are never reused.
+        self._partitions = {}
+        self._next_id = 0
+        self._next_partition = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.candidates_scanned = 0
+        self._similarity_counts = [0] * len(SIMILARITY_BINS)
+
+    def _normalize(self, vector) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(indices, unit-length values) of a sparse row or dense 1-D vector; None if all zero"""
+        if hasattr(vector, 'tocsr'):
+            row = vector.tocsr()
+            indices, values = row.indices, row.data
+        else:
+            dense = np.ravel(np.asarray(vector))
+            indices = np.flatnonzero(dense)
+            values = dense[indices]
+        norm = float(np.sqrt(np.dot(values, values)))
+        if norm == 0.0:
+            return None
+        return indices.astype(np.int64), (values / norm).astype(np.float32)
+
+    def _bucket_keys(self, partition: int, indices, values) -> Tuple[int, ...]:
+        projections = self._planes[:, indices] @ values
+        signatures = (projections > 0).reshape(self.n_tables, self.n_bits) @ self._bit_weights
+        # One int per table keeps a million entries' keys compact
+        base = (partition * self.n_tables) << self.n_bits
+        return tuple(base + (table << self.n_bits) + int(signature) for table, signature in enumerate(signatures))
+
+    def _acquire_partition(self, key: Tuple[str, str]) -> int:
+        """Partition id for key, counting one more entry in it; call with the lock held"""
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = self._partitions[key] = [self._next_partition, 0]
+            self._next_partition += 1
+        partition[1] += 1
+        return partition[0]
+
+    def _release_partition(self, key: Tuple[str, str]) -> None:
+        partition = self._partitions[key]
+        partition[1] -= 1
+        if not partition[1]:
+            del self._partitions[key]
+
+    def get(self, vector, category: str, context: Optional[Dict] = None) -> Optional[Tuple[Any, float]]:
+        """(value, similarity) of the closest entry at or above threshold, or None"""
+        normalized = self._normalize(vector)
+        if normalized is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        indices, values = normalized
+        # A lookup never creates a partition: with no entries in it, it is a plain miss
+        partition = self._partitions.get((category, canonical_hash(context or {})))
+        if partition is None:
+            with self._lock:
+                self._record_similarity(0.0)
+                self.misses += 1
+            return None
+        query = dict(zip(indices.tolist(), values.tolist()))
+        # A partition removed meanwhile leaves keys that match no bucket, since ids are not reused
+        keys = self._bucket_keys(partition[0], indices, values)
+        now = time.monotonic()
+
+        with self._lock:
+            # Entries colliding in more tables are likelier to be close; score those first
+            collisions = Counter()
+            for key in keys:
+                collisions.update(self._buckets.get(key, ()))
+            candidates = [entry_id for entry_id, _ in collisions.most_common(self.max_candidates)]
+
+            best_id, best_similarity = None, 0.0
+            for entry_id in candidates:
+                entry = self._entries.get(entry_id)
+                if entry is None:
+                    continue
+                if entry[3] is not None and entry[3] <= now:
+                    self._remove(entry_id)
+                    continue
+                similarity = sum(query.get(i, 0.0) * v for i, v in entry[0].items())
+                if similarity > best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            self.candidates_scanned += len(candidates)
+
+            self._record_similarity(best_similarity)
+            # float32 rounding can put an identical vector a hair under 1.0
+            if best_id is None or best_similarity < self.threshold - 1e-6:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_id)
+            return self._entries[best_id][2], min(best_similarity, 1.0)
+
+    def set(self, vector, category: str, value: Any, context: Optional[Dict] = None,
+            ttl: Optional[float] = None) -> bool:
+        """Cache value for this vector; returns False for vectors with no known terms"""
+        normalized = self._normalize(vector)
+        if normalized is None:
+            return False
+        indices, values = normalized
+        partition_key = (category, canonical_hash(context or {}))
+        # Counted before the entry exists, so the partition cannot be dropped in between
+        with self._lock:
+            partition = self._acquire_partition(partition_key)
+        keys = self._bucket_keys(partition, indices, values)
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (dict(zip(indices.tolist(), values.tolist())), keys, value, expires_at,
+                                       partition_key)
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(entry_id)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def _remove(self, entry_id) -> None:
+        _, keys, _, _, partition_key = self._entries.pop(entry_id)
+        for key in keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+        self._release_partition(partition_key)
+
+    def _record_similarity(self, similarity: float) -> None:
+        for i, upper in enumerate(SIMILARITY_BINS):
+            if similarity <= upper or i == len(SIMILARITY_BINS) - 1:
+                self._similarity_counts[i] += 1
+                return
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._partitions.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Hit rate, candidate counts and the distribution of best-match similarities"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            lower = 0.0
+            distribution = {}
+            for upper, count in zip(SIMILARITY_BINS, self._similarity_counts):
+                distribution[f"{lower:.2f}-{upper:.2f}"] = count
+                lower = upper
+            return {
+                'size': len(self._entries),
+                'partitions': len(self._partitions),
+                'maxsize': self.maxsize,
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'avg_candidates': self.candidates_scanned / lookups if lookups else 0.0,
+                'similarity_distribution': distribution
+            }
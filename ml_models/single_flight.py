@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+InnoStart Single Flight
+Coalesces concurrent identical calls: the first caller for a key runs the call and
+every caller arriving while it is in flight waits on the same future. Works for
+threads and asyncio tasks alike, since both wait on a concurrent.futures.Future.
+"""
+
+import time
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlightTimeout(TimeoutError):
+    """A waiter gave up on the in-flight call for its key"""
+
+
+class _Flight:
+    __slots__ = ('future', 'started')
+
+    def __init__(self):
+        self.future = concurrent.futures.Future()
+        self.started = time.monotonic()
+
+
+class SingleFlight:
+    """Deduplicates in-flight calls by key, with a per-key timeout.
+
+    A waiter gives up after timeout seconds, and a flight older than timeout no longer
+    absorbs new callers: the next caller becomes a fresh leader, so one stuck call
+    cannot block a key indefinitely.
+    """
+
+    def __init__(self, timeout: Optional[float] = 30.0):
+        self.timeout = timeout
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def _join(self, key: Hashable, timeout: Optional[float]):
+        """(flight, is_leader) for key, starting a new flight when none is usable"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and (timeout is None or time.monotonic() - flight.started < timeout):
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            self.leaders += 1
+            return flight, True
+
+    def _land(self, key: Hashable, flight: _Flight) -> None:
+        with self._lock:
+            # A stale flight may already have been replaced by a newer leader
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def do(self, key: Hashable, func: Callable[[], Any], timeout: Optional[float] = None) -> Any:
+        """Run func() once for all concurrent callers with this key and return its result"""
+        timeout = self.timeout if timeout is None else timeout
+        flight, leader = self._join(key, timeout)
+        if not leader:
+            try:
+                return flight.future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                self._count_timeout()
+                raise SingleFlightTimeout(f"In-flight call for {key!r} exceeded {timeout}s") from None
+
+        try:
+            result = func()
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    def submit(self, key: Hashable, func: Callable[[], Any],
+               executor: concurrent.futures.Executor) -> Tuple[concurrent.futures.Future, bool]:
+        """(shared future, is_leader): the first caller for key starts func() on executor, later ones join it
+
+        Lets a caller bound its own wait (future.result(timeout)) without holding up the call itself.
+        """
+        flight, leader = self._join(key, self.timeout)
+        if leader:
+            def run():
+                try:
+                    result = func()
+                except BaseException as e:
+                    flight.future.set_exception(e)
+                else:
+                    flight.future.set_result(result)
+                finally:
+                    self._land(key, flight)
+            executor.submit(run)
+        return flight.future, leader
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[Any]],
+                       timeout: Optional[float] = None) -> Any:
+        """Async do(): awaits func() once for all concurrent callers, threaded ones included"""
+        timeout = self.timeout if timeout is None else timeout
+        flight, leader = self._join(key, timeout)
+        if not leader:
+            try:
+                # shield: a waiter timing out must not cancel the leader's shared future
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(flight.future)), timeout)
+            except asyncio.TimeoutError:
+                self._count_timeout()
+                raise SingleFlightTimeout(f"In-flight call for {key!r} exceeded {timeout}s") from None
+
+        try:
+            result = await func()
+        except BaseException as e:
+            flight.future.set_exception(e)
+            raise
+        else:
+            flight.future.set_result(result)
+            return result
+        finally:
+            self._land(key, flight)
+
+    def _count_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'in_flight': len(self._flights),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'timeouts': self.timeouts
+            }
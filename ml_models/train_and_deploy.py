@@ -42,7 +42,7 @@ class InnoStartMLPipeline:
         
         # Training configuration
         self.config = {
-            'model_path': 'ml_models/business_response_model.pkl',
+            'model_path': 'ml_models/business_response_model',
             'training_data_path': 'training_data/combined_training_data.csv',
             'kaggle_data_path': 'training_data/kaggle_training_data.csv',
             'deployment_path': '../api/enhanced_chat.php'
@@ -8,7 +8,6 @@ import os
 import json
 import pandas as pd
 import numpy as np
-import pickle
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
@@ -20,6 +19,7 @@ import re
 import logging
 from typing import Dict, List, Tuple
 import warnings
+from model_artifact import load_model_data, save_artifact
 warnings.filterwarnings('ignore')
 
 # Configure logging
@@ -300,40 +300,19 @@ class BusinessResponseTrainer:
         logger.info(classification_report(y_test, y_pred, 
                                         target_names=self.label_encoder.classes_))
     
-    def save_model(self, model_path: str = "ml_models/business_response_model.pkl") -> None:
-        """Save the trained model and components"""
+    def save_model(self, model_path: str = "ml_models/business_response_model") -> None:
+        """Save the trained model and components as a memory-mappable artifact directory"""
         logger.info(f"Saving model to {model_path}")
         
-        model_data = {
-            'model': self.model,
-            'vectorizer': self.vectorizer,
-            'label_encoder': self.label_encoder,
-            'response_categories': self.response_categories
-        }
-        
-        with open(model_path, 'wb') as f:
-            pickle.dump(model_data, f)
-        
-        # Also save as JSON for easy access
-        json_data = {
-            'response_categories': self.response_categories,
-            'model_info': {
-                'type': type(self.model).__name__,
-                'features': self.vectorizer.get_feature_names_out().tolist()[:100]  # First 100 features
-            }
-        }
-        
-        with open(model_path.replace('.pkl', '.json'), 'w') as f:
-            json.dump(json_data, f, indent=2)
+        save_artifact(model_path, self.model, self.vectorizer, self.label_encoder, self.response_categories)
         
         logger.info("Model saved successfully!")
     
-    def load_model(self, model_path: str = "ml_models/business_response_model.pkl") -> None:
+    def load_model(self, model_path: str = "ml_models/business_response_model") -> None:
         """Load a trained model"""
         logger.info(f"Loading model from {model_path}")
         
-        with open(model_path, 'rb') as f:
-            model_data = pickle.load(f)
+        model_data = load_model_data(model_path)
         
         self.model = model_data['model']
         self.vectorizer = model_data['vectorizer']
@@ -5,30 +5,134 @@ Advanced AI functionality for business idea generation and analysis
 """
 
 import json
-import requests
 import os
-from typing import List, Dict, Any
+import sys
+import time
+import asyncio
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 
+# The shared HTTP client lives next to the ML models
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ml_models'))
+from disk_cache import DiskCache, get_disk_cache, request_key
+from http_client import DEFAULT_OPENAI_BASE_URL, PooledHTTPClient, get_client
+from prompt_builder import PromptTemplate, dumps_compact, log_usage
+from rate_limiter import PRIORITY_INTERACTIVE, RateLimitScheduler, estimate_tokens, get_scheduler
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+IDEAS_PROMPT = PromptTemplate(
+    system="You are a business consultant AI that generates innovative, feasible business ideas for entrepreneurs.",
+    instructions="""
+    Generate 5 innovative business ideas for this entrepreneur: feasible for the budget, relevant to the
+    location, aligned with the interests, and with market potential.
+    Return only a JSON array of objects with keys title, description (2-3 sentences), category,
+    budget (Low/Medium/High), difficulty (Easy/Medium/Hard), success_factors (list), challenges (list).
+    """,
+    fields=('location', 'interests', 'budget', 'market_data'),
+    trimmable=('market_data', 'interests'),
+    max_tokens=1500
+)
+
+MARKET_PROMPT = PromptTemplate(
+    system="You are a market research analyst AI that provides detailed market analysis for business ideas.",
+    instructions="""
+    Analyze the market opportunity of this business idea: market size and potential, target customer
+    segments, competitive landscape, trends and opportunities, potential challenges, and success probability (1-10).
+    Return only a JSON object with keys market_size, target_customers, competition, trends, challenges,
+    success_probability.
+    """,
+    fields=('business_idea', 'location'),
+    trimmable=('business_idea',),
+    max_tokens=1000,
+    temperature=0.5
+)
+
+ADVICE_PROMPT = PromptTemplate(
+    system="You are an experienced business consultant AI that provides practical, actionable advice for entrepreneurs.",
+    instructions="Give practical, actionable advice specific to the situation. Be concise but comprehensive.",
+    fields=('question',),
+    context_keys=('business_type', 'location', 'budget', 'stage', 'experience', 'industry', 'target_market'),
+    context_label='Business context',
+    trimmable=('question',),
+    max_tokens=400
+)
+
 class InnoStartAI:
     """Main AI integration class for InnoStart"""
     
-    def __init__(self, openai_api_key: str = None):
+    def __init__(self, openai_api_key: str = None, http_client: Optional[PooledHTTPClient] = None,
+                 timeout: float = 30.0, result_cache: Optional[DiskCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None, priority: int = PRIORITY_INTERACTIVE,
+                 base_url: Optional[str] = None, prompt_budget: Optional[int] = None):
         """
         Initialize the AI integration
         
         Args:
             openai_api_key: OpenAI API key for advanced AI features
+            http_client: Pooled client to use; defaults to the process-wide one for base_url
+            timeout: Read timeout in seconds for each OpenAI call
+            result_cache: Cross-process completion cache; defaults to the host-wide disk cache
+            scheduler: Rate-limit scheduler; defaults to the process-wide one for base_url and key
+            priority: Scheduling priority; batch jobs use PRIORITY_BATCH to yield to chat
+            base_url: OpenAI-compatible API root; defaults to OPENAI_BASE_URL, then the public API
+            prompt_budget: Prompt tokens per request; defaults to INNOSTART_PROMPT_TOKEN_BUDGET
         """
         self.openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
-        self.base_url = "https://api.openai.com/v1"
+        self.base_url = (base_url or DEFAULT_OPENAI_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self.prompt_budget = prompt_budget
+        self._http_client = http_client
+        self._result_cache = result_cache
+        self._scheduler = scheduler
+        self.priority = priority
+    
+    @property
+    def http_client(self) -> PooledHTTPClient:
+        """Keep-alive client for the OpenAI API, shared across instances and threads"""
+        if self._http_client is None:
+            self._http_client = get_client(self.base_url, self.openai_api_key)
+        return self._http_client
+    
+    @property
+    def scheduler(self) -> RateLimitScheduler:
+        """Paces calls to the account's request and token limits and retries 429s"""
+        if self._scheduler is None:
+            self._scheduler = get_scheduler(self.base_url, self.openai_api_key)
+        return self._scheduler
+    
+    @property
+    def result_cache(self) -> Optional[DiskCache]:
+        """Completions shared with other processes and restarts, opened on first use"""
+        if self._result_cache is None:
+            self._result_cache = get_disk_cache()
+        return self._result_cache
+    
+    def _post_chat(self, data: Dict, timeout: Optional[float] = None) -> Tuple[int, Optional[Dict]]:
+        """POST a chat completion, reusing an identical request's cached result; returns (status code, body)"""
+        key = request_key(data) if self.result_cache is not None else None
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return 200, cached
+        
+        response = self.scheduler.call(
+            lambda remaining: self.http_client.post_json("/chat/completions", data, timeout=remaining),
+            estimate_tokens(data), time.monotonic() + (timeout or self.timeout), self.priority
+        )
+        if response.status_code != 200:
+            return response.status_code, None
+        
+        result = response.json()
+        log_usage('OpenAI completion', data, result)
+        if key is not None:
+            self.result_cache.set(key, result)
+        return response.status_code, result
         
     def generate_business_ideas(self, location: str, interests: List[str], 
-                              budget: str, market_data: Dict = None) -> List[Dict]:
+                              budget: str, market_data: Dict = None, timeout: Optional[float] = None) -> List[Dict]:
         """
         Generate business ideas using AI
         
@@ -37,13 +141,14 @@ class InnoStartAI:
             interests: List of user interests
             budget: Budget range
             market_data: Optional market data
+            timeout: Per-call timeout in seconds, overriding self.timeout
             
         Returns:
             List of generated business ideas
         """
         try:
             if self.openai_api_key:
-                return self._generate_with_openai(location, interests, budget, market_data)
+                return self._generate_with_openai(location, interests, budget, market_data, timeout)
             else:
                 return self._generate_fallback_ideas(location, interests, budget)
         except Exception as e:
@@ -51,64 +156,19 @@ class InnoStartAI:
             return self._generate_fallback_ideas(location, interests, budget)
     
     def _generate_with_openai(self, location: str, interests: List[str], 
-                            budget: str, market_data: Dict = None) -> List[Dict]:
+                            budget: str, market_data: Dict = None, timeout: Optional[float] = None) -> List[Dict]:
         """Generate ideas using OpenAI API"""
         
-        interests_str = ", ".join(interests)
-        market_context = ""
-        if market_data:
-            market_context = f"Market data: {json.dumps(market_data)}"
-        
-        prompt = f"""
-        Generate 5 innovative business ideas for an entrepreneur with the following profile:
-        
-        Location: {location}
-        Interests: {interests_str}
-        Budget: {budget}
-        {market_context}
-        
-        For each idea, provide:
-        1. A compelling title
-        2. A detailed description (2-3 sentences)
-        3. Business category
-        4. Required budget level (Low/Medium/High)
-        5. Difficulty level (Easy/Medium/Hard)
-        6. Key success factors
-        7. Potential challenges
-        
-        Focus on ideas that are:
-        - Feasible for the given budget
-        - Relevant to the location
-        - Aligned with the user's interests
-        - Have market potential
-        
-        Return the response as a JSON array of objects.
-        """
-        
-        headers = {
-            "Authorization": f"Bearer {self.openai_api_key}",
-            "Content-Type": "application/json"
-        }
+        data = IDEAS_PROMPT.request({
+            'location': location,
+            'interests': ", ".join(interests),
+            'budget': budget,
+            'market_data': dumps_compact(market_data) if market_data else None
+        }, budget=self.prompt_budget)
         
-        data = {
-            "model": "gpt-3.5-turbo",
-            "messages": [
-                {"role": "system", "content": "You are a business consultant AI that generates innovative, feasible business ideas for entrepreneurs."},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 1500,
-            "temperature": 0.7
-        }
+        status_code, result = self._post_chat(data, timeout)
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=data,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
+        if status_code == 200:
             content = result['choices'][0]['message']['content']
             
             # Try to parse JSON from the response
@@ -117,9 +177,10 @@ class InnoStartAI:
                 return self._format_ideas(ideas)
             except json.JSONDecodeError:
                 # If JSON parsing fails, extract ideas from text
+                logger.warning("Business ideas were not valid JSON; extracting them from text")
                 return self._extract_ideas_from_text(content)
         else:
-            logger.error(f"OpenAI API error: {response.status_code}")
+            logger.error(f"OpenAI API error: {status_code}")
             return self._generate_fallback_ideas(location, interests, budget)
     
     def _generate_fallback_ideas(self, location: str, interests: List[str], 
@@ -285,72 +346,42 @@ class InnoStartAI:
         
         return self._format_ideas(ideas)
     
-    def analyze_market_opportunity(self, business_idea: str, location: str) -> Dict:
+    def analyze_market_opportunity(self, business_idea: str, location: str, timeout: Optional[float] = None) -> Dict:
         """
         Analyze market opportunity for a business idea
         
         Args:
             business_idea: The business idea to analyze
             location: Target location
+            timeout: Per-call timeout in seconds, overriding self.timeout
             
         Returns:
             Market analysis results
         """
         try:
             if self.openai_api_key:
-                return self._analyze_with_openai(business_idea, location)
+                return self._analyze_with_openai(business_idea, location, timeout)
             else:
                 return self._analyze_fallback(business_idea, location)
         except Exception as e:
             logger.error(f"Error analyzing market: {e}")
             return self._analyze_fallback(business_idea, location)
     
-    def _analyze_with_openai(self, business_idea: str, location: str) -> Dict:
+    def _analyze_with_openai(self, business_idea: str, location: str, timeout: Optional[float] = None) -> Dict:
         """Analyze market using OpenAI API"""
         
-        prompt = f"""
-        Analyze the market opportunity for this business idea: "{business_idea}" in {location}.
-        
-        Provide analysis on:
-        1. Market size and potential
-        2. Target customer segments
-        3. Competitive landscape
-        4. Market trends and opportunities
-        5. Potential challenges
-        6. Success probability (1-10)
-        
-        Return as JSON with these fields: market_size, target_customers, competition, trends, challenges, success_probability.
-        """
-        
-        headers = {
-            "Authorization": f"Bearer {self.openai_api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": "gpt-3.5-turbo",
-            "messages": [
-                {"role": "system", "content": "You are a market research analyst AI that provides detailed market analysis for business ideas."},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 1000,
-            "temperature": 0.5
-        }
+        data = MARKET_PROMPT.request({'business_idea': business_idea, 'location': location},
+                                     budget=self.prompt_budget)
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=data,
-            timeout=30
-        )
+        status_code, result = self._post_chat(data, timeout)
         
-        if response.status_code == 200:
-            result = response.json()
+        if status_code == 200:
             content = result['choices'][0]['message']['content']
             
             try:
                 return json.loads(content)
             except json.JSONDecodeError:
+                logger.warning("Market analysis was not valid JSON; using the fallback analysis")
                 return self._analyze_fallback(business_idea, location)
         else:
             return self._analyze_fallback(business_idea, location)
@@ -366,132 +397,102 @@ class InnoStartAI:
             'success_probability': 7
         }
     
-    def generate_financial_projections(self, business_data: Dict) -> Dict:
+    def generate_financial_projections(self, business_data: Dict, monthly_data: bool = True) -> Dict:
         """
         Generate financial projections for a business
         
         Args:
             business_data: Business information and parameters
+            monthly_data: Include the month-by-month breakdown
             
         Returns:
             Financial projections
         """
         try:
-            # Basic financial calculations
-            monthly_revenue = business_data.get('monthly_revenue', 0)
-            growth_rate = business_data.get('growth_rate', 0.05)
-            monthly_expenses = business_data.get('monthly_expenses', 0)
-            initial_investment = business_data.get('initial_investment', 0)
-            projection_months = business_data.get('projection_months', 12)
-            
-            projections = {
-                'monthly_data': [],
-                'total_revenue': 0,
-                'total_expenses': 0,
-                'net_profit': 0,
-                'break_even_month': None,
-                'roi': 0
-            }
-            
-            current_revenue = monthly_revenue
-            cumulative_profit = -initial_investment
+            # numpy is only loaded by callers that project
+            from financial_projections import monthly_view, project_records
+            return monthly_view(project_records([business_data]), monthly_data=monthly_data)
             
-            for month in range(1, projection_months + 1):
-                monthly_revenue_amount = current_revenue
-                monthly_expense_amount = monthly_expenses
-                monthly_profit = monthly_revenue_amount - monthly_expense_amount
-                
-                cumulative_profit += monthly_profit
-                
-                projections['monthly_data'].append({
-                    'month': month,
-                    'revenue': monthly_revenue_amount,
-                    'expenses': monthly_expense_amount,
-                    'profit': monthly_profit,
-                    'cumulative_profit': cumulative_profit
-                })
-                
-                projections['total_revenue'] += monthly_revenue_amount
-                projections['total_expenses'] += monthly_expense_amount
-                
-                # Check for break-even
-                if projections['break_even_month'] is None and cumulative_profit >= 0:
-                    projections['break_even_month'] = month
-                
-                # Apply growth rate
-                current_revenue *= (1 + growth_rate)
-            
-            projections['net_profit'] = projections['total_revenue'] - projections['total_expenses'] - initial_investment
+        except Exception as e:
+            logger.error(f"Error generating financial projections: {e}")
+            return {}
+    
+    def generate_financial_projections_batch(self, business_data: List[Dict], as_dicts: bool = False,
+                                             monthly_data: bool = True):
+        """
+        Generate financial projections for many businesses at once
+        
+        Args:
+            business_data: Business information and parameters, one dict per business
+            as_dicts: Return one generate_financial_projections dict per business
+                      instead of arrays with one row per business
+            monthly_data: Include the month-by-month breakdown in the dicts
             
-            if initial_investment > 0:
-                projections['roi'] = (projections['net_profit'] / initial_investment) * 100
+        Returns:
+            Projection arrays (see financial_projections.project), or a list of dicts
+        """
+        from financial_projections import monthly_views, project_records
+        projection = project_records(business_data)
+        return monthly_views(projection, monthly_data) if as_dicts else projection
+    
+    def simulate_financial_risk(self, business_type: str, location: Optional[str] = None,
+                                paths: Optional[int] = None, months: Optional[int] = None, seed: Optional[int] = None,
+                                workers: int = 1, **assumptions) -> Dict:
+        """
+        Monte Carlo simulation of a dataset business type's cumulative profit
+        
+        Args:
+            business_type: Business type from the Musanze dataset
+            location: Fit the distributions to this location's rows only
+            paths: Number of simulated paths (default risk_simulation.DEFAULT_PATHS)
+            months: Horizon in months (default risk_simulation.DEFAULT_MONTHS)
+            seed: Seed for a reproducible run (None draws one, returned as 'seed')
+            workers: Worker processes to spread the paths over
+            **assumptions: Overrides of risk_simulation.DEFAULT_ASSUMPTIONS
             
-            return projections
+        Returns:
+            Cumulative profit percentile bands, break-even probability by month,
+            failure probability, value at risk and expected shortfall
+        """
+        try:
+            # numpy, pandas and the dataset store are only loaded by callers that simulate
+            from risk_simulation import DEFAULT_MONTHS, DEFAULT_PATHS, simulate_business
+            return simulate_business(business_type, location, DEFAULT_PATHS if paths is None else paths,
+                                     DEFAULT_MONTHS if months is None else months, seed, workers, **assumptions)
             
         except Exception as e:
-            logger.error(f"Error generating financial projections: {e}")
+            logger.error(f"Error simulating financial risk: {e}")
             return {}
     
-    def get_business_advice(self, question: str, context: Dict = None) -> str:
+    def get_business_advice(self, question: str, context: Dict = None, timeout: Optional[float] = None) -> str:
         """
         Get business advice using AI
         
         Args:
             question: User's question
             context: Additional context about the business
+            timeout: Per-call timeout in seconds, overriding self.timeout
             
         Returns:
             AI-generated advice
         """
         try:
             if self.openai_api_key:
-                return self._get_advice_with_openai(question, context)
+                return self._get_advice_with_openai(question, context, timeout)
             else:
                 return self._get_advice_fallback(question)
         except Exception as e:
             logger.error(f"Error getting business advice: {e}")
             return self._get_advice_fallback(question)
     
-    def _get_advice_with_openai(self, question: str, context: Dict = None) -> str:
+    def _get_advice_with_openai(self, question: str, context: Dict = None, timeout: Optional[float] = None) -> str:
         """Get advice using OpenAI API"""
         
-        context_str = ""
-        if context:
-            context_str = f"Business context: {json.dumps(context)}"
-        
-        prompt = f"""
-        As a business consultant AI, provide helpful advice for this question: "{question}"
+        data = ADVICE_PROMPT.request({'question': question}, context, self.prompt_budget)
         
-        {context_str}
-        
-        Provide practical, actionable advice that is specific and relevant to the situation.
-        Keep the response concise but comprehensive.
-        """
-        
-        headers = {
-            "Authorization": f"Bearer {self.openai_api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "model": "gpt-3.5-turbo",
-            "messages": [
-                {"role": "system", "content": "You are an experienced business consultant AI that provides practical, actionable advice for entrepreneurs."},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 500,
-            "temperature": 0.7
-        }
-        
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=data,
-            timeout=30
-        )
+        status_code, result = self._post_chat(data, timeout)
         
-        if response.status_code == 200:
-            result = response.json()
+        if status_code == 200:
             return result['choices'][0]['message']['content']
         else:
             return self._get_advice_fallback(question)
@@ -514,6 +515,74 @@ class InnoStartAI:
             return "Hire people who share your vision and bring complementary skills. Start with essential roles and expand as you grow. Consider contractors or freelancers for specialized tasks initially."
         
         return "Focus on understanding your customers' needs, delivering value, and building strong relationships. Start small, test your assumptions, and iterate based on feedback. Success comes from persistence and continuous improvement."
+    
+    async def generate_business_ideas_async(self, location: str, interests: List[str], budget: str,
+                                            market_data: Dict = None, timeout: Optional[float] = None) -> List[Dict]:
+        """generate_business_ideas without blocking the event loop (the HTTP call runs in a worker thread)"""
+        return await asyncio.to_thread(self.generate_business_ideas, location, interests, budget, market_data, timeout)
+    
+    async def analyze_market_opportunity_async(self, business_idea: str, location: str,
+                                               timeout: Optional[float] = None) -> Dict:
+        """analyze_market_opportunity without blocking the event loop"""
+        return await asyncio.to_thread(self.analyze_market_opportunity, business_idea, location, timeout)
+    
+    async def get_business_advice_async(self, question: str, context: Dict = None,
+                                        timeout: Optional[float] = None) -> str:
+        """get_business_advice without blocking the event loop"""
+        return await asyncio.to_thread(self.get_business_advice, question, context, timeout)
+    
+    async def analyze_all(self, location: str, interests: List[str], budget: str, business_idea: str,
+                          question: str, context: Dict = None, market_data: Dict = None,
+                          deadline: float = 10.0) -> Dict:
+        """
+        Business ideas, market analysis and advice for one user, fetched concurrently
+        
+        Args:
+            location, interests, budget, market_data: As for generate_business_ideas
+            business_idea: Idea passed to analyze_market_opportunity
+            question, context: As for get_business_advice
+            deadline: Global deadline in seconds for all three calls
+            
+        Returns:
+            Dict with business_ideas, market_analysis and business_advice; any call that
+            missed the deadline (or failed) is replaced by its fallback and listed in fallbacks
+        """
+        started = time.monotonic()
+        calls = {
+            'business_ideas': (
+                self.generate_business_ideas_async(location, interests, budget, market_data, timeout=deadline),
+                lambda: self._generate_fallback_ideas(location, interests, budget)
+            ),
+            'market_analysis': (
+                self.analyze_market_opportunity_async(business_idea, location, timeout=deadline),
+                lambda: self._analyze_fallback(business_idea, location)
+            ),
+            'business_advice': (
+                self.get_business_advice_async(question, context, timeout=deadline),
+                lambda: self._get_advice_fallback(question)
+            ),
+        }
+        
+        tasks = {name: asyncio.create_task(coroutine) for name, (coroutine, _) in calls.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        # Late worker threads still finish on their own (bounded by the per-call timeout); their results are dropped
+        for task in pending:
+            task.cancel()
+        
+        results = {'fallbacks': []}
+        for name, task in tasks.items():
+            if task in done and task.exception() is None:
+                results[name] = task.result()
+            else:
+                if task in done:
+                    logger.error(f"{name} failed: {task.exception()}")
+                else:
+                    logger.warning(f"{name} missed the {deadline}s deadline, using fallback")
+                results[name] = calls[name][1]()
+                results['fallbacks'].append(name)
+        
+        results['elapsed'] = time.monotonic() - started
+        return results
 
 
 def main():
@@ -559,6 +628,18 @@ def main():
     print("Testing business advice...")
     advice = ai.get_business_advice("How can I get funding for my startup?")
     print(f"Business advice: {advice}")
+    print()
+    
+    # Test the combined dashboard analysis
+    print("Testing combined analysis...")
+    combined = asyncio.run(ai.analyze_all(
+        location="New York City",
+        interests=["technology", "food"],
+        budget="1000-5000",
+        business_idea="Food delivery service",
+        question="How can I get funding for my startup?"
+    ))
+    print(f"Combined analysis in {combined['elapsed']:.2f}s, fallbacks: {combined['fallbacks']}")
 
 
 if __name__ == "__main__":
@@ -34,7 +34,7 @@ class InnoStartRunner:
         self.config = {
             'server_port': 8000,
             'python_path': sys.executable,
-            'ml_model_path': 'ml_models/business_response_model.pkl',
+            'ml_model_path': 'ml_models/business_response_model',
             'training_data_path': 'training_data/business_training_data.csv'
         }
     